@@ -0,0 +1,76 @@
+"""stats counters
+
+Revision ID: 3f2a9c1d4e5b
+Revises: 7b17c974177e
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f2a9c1d4e5b'
+down_revision: Union[str, None] = '7b17c974177e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('user_review_counters',
+    sa.Column('user_id', sa.String(length=255), nullable=False, comment='ID пользователя'),
+    sa.Column('total_reviews', sa.Integer(), nullable=False, comment='Всего назначенных ревью'),
+    sa.Column('open_reviews', sa.Integer(), nullable=False, comment='Ревью открытых PR'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.user_id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id'),
+    comment='Счётчики ревью пользователей'
+    )
+    op.create_table('pr_stats_counters',
+    sa.Column('name', sa.String(length=50), nullable=False, comment='Название счётчика'),
+    sa.Column('shard', sa.Integer(), nullable=False, comment='Номер шарда счётчика'),
+    sa.Column('value', sa.Integer(), nullable=False, comment='Значение'),
+    sa.PrimaryKeyConstraint('name', 'shard'),
+    comment='Глобальные счётчики PR'
+    )
+
+    # Заполнение счётчиков по существующим данным (то же, что make rebuild-counters)
+    op.execute(
+        """
+        INSERT INTO user_review_counters (user_id, total_reviews, open_reviews)
+        SELECT r.reviewer_id,
+               COUNT(*),
+               SUM(CASE WHEN p.status = 'OPEN' THEN 1 ELSE 0 END)
+        FROM pr_reviewers r
+        JOIN pull_requests p ON p.pull_request_id = r.pr_id
+        GROUP BY r.reviewer_id
+        """
+    )
+    op.execute(
+        """
+        WITH reviewer_counts AS (
+            SELECT p.pull_request_id, p.status, COUNT(r.reviewer_id) AS reviewers
+            FROM pull_requests p
+            LEFT JOIN pr_reviewers r ON r.pr_id = p.pull_request_id
+            GROUP BY p.pull_request_id, p.status
+        )
+        INSERT INTO pr_stats_counters (name, shard, value)
+        SELECT 'total_prs', 0, COUNT(*) FROM reviewer_counts
+        UNION ALL
+        SELECT 'open_prs', 0, COUNT(*) FROM reviewer_counts WHERE status = 'OPEN'
+        UNION ALL
+        SELECT 'merged_prs', 0, COUNT(*) FROM reviewer_counts WHERE status = 'MERGED'
+        UNION ALL
+        SELECT 'prs_with_0_reviewers', 0, COUNT(*) FROM reviewer_counts WHERE reviewers = 0
+        UNION ALL
+        SELECT 'prs_with_1_reviewer', 0, COUNT(*) FROM reviewer_counts WHERE reviewers = 1
+        UNION ALL
+        SELECT 'prs_with_2_reviewers', 0, COUNT(*) FROM reviewer_counts WHERE reviewers = 2
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('pr_stats_counters')
+    op.drop_table('user_review_counters')
@@ -0,0 +1,42 @@
+"""users open reviews
+
+Revision ID: 5d2f8e3b9a61
+Revises: 8c4e1b7a2d90
+Create Date: 2026-10-17 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d2f8e3b9a61'
+down_revision: Union[str, None] = '8c4e1b7a2d90'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('users', sa.Column('open_reviews', sa.Integer(), server_default='0', nullable=False, comment='Открытых ревью (денормализовано из user_review_counters для выбора ревьювера)'))
+
+    # Заполнение из счётчиков (то же делает make rebuild-counters)
+    op.execute(
+        """
+        UPDATE users
+        SET open_reviews = COALESCE(
+            (SELECT c.open_reviews FROM user_review_counters c WHERE c.user_id = users.user_id),
+            0
+        )
+        """
+    )
+
+    op.create_index('idx_users_team_active_load', 'users', ['team_name', 'is_active', 'open_reviews'], unique=False)
+    op.drop_index('idx_users_team_active', table_name='users')
+
+
+def downgrade() -> None:
+    op.create_index('idx_users_team_active', 'users', ['team_name', 'is_active'], unique=False)
+    op.drop_index('idx_users_team_active_load', table_name='users')
+    op.drop_column('users', 'open_reviews')
@@ -0,0 +1,60 @@
+"""review daily rollups
+
+Revision ID: 8c4e1b7a2d90
+Revises: 3f2a9c1d4e5b
+Create Date: 2026-10-17 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c4e1b7a2d90'
+down_revision: Union[str, None] = '3f2a9c1d4e5b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('review_daily_rollups',
+    sa.Column('team_name', sa.String(length=255), nullable=False, comment='Название команды'),
+    sa.Column('day', sa.Date(), nullable=False, comment='День (UTC)'),
+    sa.Column('reviewer_id', sa.String(length=255), nullable=False, comment='ID ревьювера'),
+    sa.Column('assigned', sa.Integer(), nullable=False, comment='Назначено ревью'),
+    sa.Column('merged', sa.Integer(), nullable=False, comment='Влито PR на ревью'),
+    sa.Column('open_delta', sa.Integer(), nullable=False, comment='Изменение открытых ревью'),
+    sa.ForeignKeyConstraint(['team_name'], ['teams.team_name'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['reviewer_id'], ['users.user_id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('team_name', 'day', 'reviewer_id'),
+    comment='Дневные агрегаты ревью'
+    )
+
+    # Заполнение по существующим данным (то же, что make rebuild-rollups):
+    # ревью считается назначенным в день создания PR, команда — текущая команда ревьювера
+    op.execute(
+        """
+        INSERT INTO review_daily_rollups
+            (team_name, day, reviewer_id, assigned, merged, open_delta)
+        SELECT u.team_name, e.day, e.reviewer_id, SUM(e.assigned), SUM(e.merged), SUM(e.open_delta)
+        FROM (
+            SELECT date(p.created_at) AS day, r.reviewer_id,
+                   1 AS assigned, 0 AS merged, 1 AS open_delta
+            FROM pr_reviewers r
+            JOIN pull_requests p ON p.pull_request_id = r.pr_id
+            UNION ALL
+            SELECT date(p.merged_at), r.reviewer_id, 0, 1, -1
+            FROM pr_reviewers r
+            JOIN pull_requests p ON p.pull_request_id = r.pr_id
+            WHERE p.status = 'MERGED' AND p.merged_at IS NOT NULL
+        ) e
+        JOIN users u ON u.user_id = e.reviewer_id
+        GROUP BY u.team_name, e.day, e.reviewer_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('review_daily_rollups')
@@ -0,0 +1,42 @@
+"""bulk deactivation jobs
+
+Revision ID: a4c7d2e9f130
+Revises: 5d2f8e3b9a61
+Create Date: 2026-10-17 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4c7d2e9f130'
+down_revision: Union[str, None] = '5d2f8e3b9a61'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('bulk_deactivation_jobs',
+    sa.Column('job_id', sa.String(length=36), nullable=False, comment='ID задачи'),
+    sa.Column('status', sa.String(length=20), nullable=False, comment='Статус: pending, running, done или failed'),
+    sa.Column('user_ids', sa.JSON(), nullable=False, comment='ID пользователей для деактивации'),
+    sa.Column('processed', sa.Integer(), nullable=False, comment='Обработано ID'),
+    sa.Column('deactivated_count', sa.Integer(), nullable=False, comment='Деактивировано'),
+    sa.Column('reassigned_prs_count', sa.Integer(), nullable=False, comment='Переназначено ревью'),
+    sa.Column('errors', sa.JSON(), nullable=False, comment='Ошибки обработки'),
+    sa.Column('locked_by', sa.String(length=255), nullable=True, comment='Воркер, арендовавший задачу'),
+    sa.Column('lease_until', sa.DateTime(), nullable=True, comment='Окончание аренды'),
+    sa.Column('created_at', sa.DateTime(), nullable=False, comment='Дата создания'),
+    sa.Column('finished_at', sa.DateTime(), nullable=True, comment='Дата завершения'),
+    sa.PrimaryKeyConstraint('job_id'),
+    comment='Задачи массовой деактивации'
+    )
+    op.create_index('idx_bulk_deactivation_jobs_status', 'bulk_deactivation_jobs', ['status', 'created_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('idx_bulk_deactivation_jobs_status', table_name='bulk_deactivation_jobs')
+    op.drop_table('bulk_deactivation_jobs')
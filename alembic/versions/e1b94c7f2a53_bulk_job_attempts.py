@@ -0,0 +1,26 @@
+"""bulk job attempts
+
+Revision ID: e1b94c7f2a53
+Revises: a4c7d2e9f130
+Create Date: 2026-10-17 20:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e1b94c7f2a53'
+down_revision: Union[str, None] = 'a4c7d2e9f130'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('bulk_deactivation_jobs', sa.Column('attempts', sa.Integer(), server_default='0', nullable=False, comment='Неудачных попыток пачки'))
+
+
+def downgrade() -> None:
+    op.drop_column('bulk_deactivation_jobs', 'attempts')
@@ -1,9 +1,28 @@
 """Зависимости для API."""
 
-from app.core.database import get_db
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.core.cache import CacheService, get_cache, get_local_cache
+from app.core.database import async_session_maker, get_db
+from app.domain.event_handlers import dispatch_events
 
 
 async def get_session():
-    """Получить сессию БД."""
+    """Получить сессию БД; доменные события обрабатываются после коммита."""
     async for session in get_db():
         yield session
+    await dispatch_events(session)
+
+
+def get_session_maker() -> async_sessionmaker:
+    """
+    Получить фабрику сессий БД.
+    Для потоковых ответов: сессия открывается внутри генератора тела ответа
+    и живёт, пока ответ отправляется клиенту.
+    """
+    return async_session_maker
+
+
+async def get_cache_service() -> CacheService:
+    """Получить сервис кеширования."""
+    return CacheService(await get_cache(), local_cache_instance=get_local_cache())
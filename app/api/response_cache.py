@@ -0,0 +1,42 @@
+"""Кеширование готовых JSON-ответов эндпоинтов."""
+
+from collections.abc import Awaitable, Callable, Sequence
+
+from fastapi import Response
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+from app.core.cache import CacheService
+from app.core.config import settings
+
+
+def render_json(response_model: type[BaseModel], data: dict) -> bytes:
+    """
+    Закодировать ответ так же, как FastAPI кодирует response_model:
+    валидация схемой, model_dump в режиме json и рендер JSONResponse.
+    """
+    content = response_model.model_validate(data).model_dump(mode="json")
+    return JSONResponse(content=content).body
+
+
+async def cached_json_response(
+    cache: CacheService,
+    key: str,
+    tags: Sequence[str],
+    compute: Callable[[], Awaitable[dict]],
+    response_model: type[BaseModel],
+    ttl: int | None = None,
+) -> Response:
+    """
+    Вернуть тело ответа из кеша без повторной валидации и сериализации.
+    При промахе ответ вычисляется, кодируется render_json и кешируется
+    вместе с тегами, которыми инвалидируются данные сервиса.
+    Без ttl тело живёт CACHE_SOFT_TTL — для данных без точной инвалидации.
+    """
+    cache_key = await cache.tagged_key(key, *tags)
+
+    async def render() -> bytes:
+        return render_json(response_model, await compute())
+
+    body = await cache.get_or_compute(cache_key, render, ttl=ttl or settings.CACHE_SOFT_TTL)
+    return Response(content=body, media_type="application/json")
@@ -1,6 +1,10 @@
 """Health check эндпоинт."""
 
-from fastapi import APIRouter
+from fastapi import APIRouter, status
+from fastapi.responses import JSONResponse
+
+from app.core import cache
+from app.domain.warmup import warmup_status
 
 router = APIRouter(tags=["Health"])
 
@@ -9,3 +13,27 @@ router = APIRouter(tags=["Health"])
 async def health():
     """Health check endpoint."""
     return {"status": "ok"}
+
+
+@router.get("/health/ready")
+async def health_ready():
+    """Готовность инстанса к трафику: 503, пока идёт прогрев кеша."""
+    if not warmup_status.ready:
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={"status": "warming_up", "warmup": warmup_status.snapshot()},
+        )
+    return {"status": "ready", "warmup": warmup_status.snapshot()}
+
+
+@router.get("/health/cache")
+async def health_cache():
+    """Состояние кеша: доступность Redis, circuit breaker и статистика L1-кеша."""
+    local = cache.get_local_cache()
+    return {
+        "redis": {
+            "connected": cache.redis_client is not None,
+            "breaker": cache.get_breaker_state(),
+        },
+        "local": local.stats() if local is not None else None,
+    }
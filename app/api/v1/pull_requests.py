@@ -6,6 +6,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.api.dependencies import get_session
 from app.domain.pull_requests.service import PullRequestService
 from app.schemas.pr import (
+    CreatePRBatchRequest,
+    CreatePRBatchResponse,
     CreatePRRequest,
     MergePRRequest,
     PullRequestResponse,
@@ -27,6 +29,20 @@ async def create_pr(
     )
 
 
+@router.post("/createBatch", response_model=CreatePRBatchResponse)
+async def create_pr_batch(
+    request: CreatePRBatchRequest,
+    session: AsyncSession = Depends(get_session),
+):
+    """
+    Создать пачку PR (до PR_BATCH_MAX_SIZE) одной транзакцией.
+    Результат — по каждому PR в порядке запроса, ошибки отдельных PR не прерывают пачку.
+    """
+    return await PullRequestService(session).create_prs(
+        [item.model_dump() for item in request.pull_requests]
+    )
+
+
 @router.post("/merge", response_model=PullRequestResponse)
 async def merge_pr(
     request: MergePRRequest,
@@ -1,11 +1,24 @@
 """API эндпоинты для статистики."""
 
-from fastapi import APIRouter, Depends
-from sqlalchemy.ext.asyncio import AsyncSession
+import json
+from datetime import date
 
-from app.api.dependencies import get_session
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.api.dependencies import get_cache_service, get_session, get_session_maker
+from app.api.response_cache import cached_json_response
+from app.core.cache import CacheService
+from app.core.config import settings
+from app.domain.cache_keys import STATS_RESPONSE_KEY, STATS_TAG
 from app.domain.stats.service import StatsService
-from app.schemas.stats import StatsResponse
+from app.schemas.stats import (
+    FairnessResponse,
+    StatsResponse,
+    TeamStatsResponse,
+    UserStatsPageResponse,
+)
 
 router = APIRouter(prefix="/stats", tags=["Stats"])
 
@@ -13,6 +26,58 @@ router = APIRouter(prefix="/stats", tags=["Stats"])
 @router.get("", response_model=StatsResponse)
 async def get_stats(
     session: AsyncSession = Depends(get_session),
+    cache: CacheService = Depends(get_cache_service),
 ) -> StatsResponse:
     """Получить статистику по пользователям и PR."""
-    return StatsResponse(**(await StatsService(session).get_stats()))
+    service = StatsService(session)
+    if settings.RESPONSE_CACHE_ENABLED:
+        return await cached_json_response(
+            cache, STATS_RESPONSE_KEY, (STATS_TAG,), service.get_stats, StatsResponse
+        )
+    return StatsResponse(**(await service.get_stats()))
+
+
+@router.get("/users", response_model=UserStatsPageResponse)
+async def get_user_stats_page(
+    after: str | None = None,
+    limit: int = Query(100, ge=1, le=1000),
+    session: AsyncSession = Depends(get_session),
+):
+    """Получить страницу статистики пользователей с user_id больше after."""
+    return await StatsService(session).get_user_stats_page(after, limit)
+
+
+@router.get("/users/stream")
+async def stream_user_stats(
+    session_maker: async_sessionmaker = Depends(get_session_maker),
+) -> StreamingResponse:
+    """Получить статистику всех пользователей в формате NDJSON: один объект на строку."""
+
+    async def body():
+        async with session_maker() as session:
+            async for batch in StatsService(session).stream_user_stats():
+                yield "".join(_ndjson_line(row) for row in batch).encode()
+
+    return StreamingResponse(body(), media_type="application/x-ndjson")
+
+
+@router.get("/team", response_model=TeamStatsResponse)
+async def get_team_stats(
+    team_name: str,
+    date_from: date = Query(alias="from"),
+    date_to: date = Query(alias="to"),
+    session: AsyncSession = Depends(get_session),
+):
+    """Получить нагрузку ревью команды по дням за интервал дат (включительно, UTC)."""
+    return await StatsService(session).get_team_stats(team_name, date_from, date_to)
+
+
+@router.get("/fairness", response_model=FairnessResponse)
+async def get_fairness(session: AsyncSession = Depends(get_session)):
+    """Получить метрики равномерности распределения ревью по командам."""
+    return await StatsService(session).get_fairness()
+
+
+def _ndjson_line(row: dict) -> str:
+    """Строка NDJSON в той же кодировке, что и JSONResponse."""
+    return json.dumps(row, ensure_ascii=False, allow_nan=False, separators=(",", ":")) + "\n"
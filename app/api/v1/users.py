@@ -1,14 +1,23 @@
 """API эндпоинты для пользователей."""
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.dependencies import get_session
+from app.api.dependencies import get_cache_service, get_session
+from app.api.response_cache import cached_json_response
+from app.core.cache import CacheService
+from app.core.config import settings
+from app.domain.cache_keys import reviews_response_key, user_tag
+from app.domain.users.jobs import BulkDeactivationJobService
 from app.domain.users.service import UserService
 from app.schemas.user import (
+    BulkDeactivateJobResponse,
+    BulkDeactivateJobStatusResponse,
+    BulkDeactivateRequest,
     BulkDeactivateResponse,
     GetReviewsResponse,
     SetIsActiveRequest,
+    TeamDeactivateResponse,
     UserDeactivationRequest,
     UserResponse,
 )
@@ -29,17 +38,56 @@ async def set_is_active(
 async def get_reviews(
     user_id: str,
     session: AsyncSession = Depends(get_session),
+    cache: CacheService = Depends(get_cache_service),
 ):
     """Получить PR'ы, где пользователь назначен ревьювером."""
-    return await UserService(session).get_reviews(user_id)
+    service = UserService(session)
+    if settings.RESPONSE_CACHE_ENABLED:
+        return await cached_json_response(
+            cache,
+            reviews_response_key(user_id),
+            (user_tag(user_id),),
+            lambda: service.get_reviews(user_id),
+            GetReviewsResponse,
+            ttl=settings.CACHE_REVIEWS_TTL,
+        )
+    return await service.get_reviews(user_id)
 
 
-@router.post("/bulkDeactivate", response_model=BulkDeactivateResponse)
+@router.post("/bulkDeactivate", response_model=BulkDeactivateResponse | BulkDeactivateJobResponse)
 async def bulk_deactivate(
     request: UserDeactivationRequest,
+    response: Response,
+    run_async: bool = Query(False, alias="async"),
     session: AsyncSession = Depends(get_session),
 ):
-    """Массово деактивировать пользователей команды и переназначить открытые PR."""
+    """
+    Массово деактивировать пользователей и переназначить открытые PR.
+    С async=true деактивация ставится в очередь и выполняется фоновым воркером.
+    """
+    if run_async:
+        response.status_code = status.HTTP_202_ACCEPTED
+        return BulkDeactivateJobResponse(
+            **(await BulkDeactivationJobService(session).create_job(request.user_ids))
+        )
     return BulkDeactivateResponse(
         **(await UserService(session).bulk_deactivate_users(request.user_ids))
     )
+
+
+@router.get("/bulkDeactivate/{job_id}", response_model=BulkDeactivateJobStatusResponse)
+async def get_bulk_deactivate_job(
+    job_id: str,
+    session: AsyncSession = Depends(get_session),
+):
+    """Получить прогресс задачи массовой деактивации."""
+    return await BulkDeactivationJobService(session).get_job(job_id)
+
+
+@router.post("/deactivateTeam", response_model=TeamDeactivateResponse)
+async def deactivate_team(
+    request: BulkDeactivateRequest,
+    session: AsyncSession = Depends(get_session),
+):
+    """Деактивировать всех участников команды и снять их с открытых PR."""
+    return await UserService(session).deactivate_team(request.team_name)
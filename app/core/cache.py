@@ -1,14 +1,138 @@
 """Настройка кеширования Redis."""
 
-import json
+import asyncio
+import fnmatch
+import logging
+import math
+import re
+import secrets
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Mapping, Sequence
+from typing import Any
 
 import redis.asyncio as redis
 from redis.asyncio import Redis
 
+from app.core.cache_codecs import CacheCorruptError, CacheDecodeError, CacheSerializer
+from app.core.circuit_breaker import CircuitBreaker
 from app.core.config import settings
 
+logger = logging.getLogger(__name__)
+
 redis_client: Redis | None = None
 
+_GENERATION_SUFFIX = re.compile(r":g\d+(\.\d+)*$")
+_SCAN_BATCH_SIZE = 500
+_LOCK_POLL_INTERVAL = 0.05
+_REPLACE_SETS_ATTEMPTS = 3
+_RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+_inflight: dict[str, asyncio.Future] = {}
+_background_tasks: set[asyncio.Task] = set()
+
+
+class LocalCache:
+    """
+    Процессный LRU-кеш с ограничением по размеру и TTL.
+    Используется как первый уровень (L1) перед Redis: горячие ключи
+    отдаются без сетевого запроса и без повторного декодирования.
+    Значения возвращаются по ссылке, вызывающий код не должен их изменять.
+    """
+
+    def __init__(
+        self, max_size: int = settings.LOCAL_CACHE_MAX_SIZE, ttl: int = settings.LOCAL_CACHE_TTL
+    ):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._data: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: str) -> Any | None:
+        """Получить значение. Просроченные записи удаляются при обращении."""
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            self.expirations += 1
+            self.misses += 1
+            return None
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: str, value: Any, ttl: int | None = None):
+        """
+        Записать значение. TTL записи не превышает TTL локального кеша,
+        чтобы ограничить рассинхронизацию между процессами.
+        """
+        ttl = min(ttl or self.ttl, self.ttl)
+        self._data[key] = (time.monotonic() + ttl, value)
+        self._data.move_to_end(key)
+
+        while len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def delete(self, key: str):
+        """Удалить значение."""
+        self._data.pop(key, None)
+
+    def delete_pattern(self, pattern: str):
+        """Удалить все ключи по glob-паттерну (синтаксис как у Redis KEYS)."""
+        for key in [k for k in self._data if fnmatch.fnmatchcase(k, pattern)]:
+            del self._data[key]
+
+    def clear(self):
+        """Очистить кеш и сбросить статистику."""
+        self._data.clear()
+        self.hits = self.misses = self.evictions = self.expirations = 0
+
+    def stats(self) -> dict:
+        """Статистика попаданий и вытеснений."""
+        return {
+            "size": len(self._data),
+            "max_size": self.max_size,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+
+local_cache: LocalCache | None = LocalCache() if settings.LOCAL_CACHE_ENABLED else None
+
+cache_serializer = CacheSerializer(
+    default_codec=settings.CACHE_CODEC,
+    namespace_codecs=settings.CACHE_NAMESPACE_CODECS,
+    compression=settings.CACHE_COMPRESSION,
+    compression_threshold=settings.CACHE_COMPRESSION_THRESHOLD,
+)
+
+redis_breaker = CircuitBreaker(
+    failure_threshold=settings.REDIS_BREAKER_FAILURE_THRESHOLD,
+    backoff=settings.REDIS_BREAKER_BACKOFF,
+    max_backoff=settings.REDIS_BREAKER_MAX_BACKOFF,
+)
+
 
 async def init_cache():
     """
@@ -24,15 +148,20 @@ async def init_cache():
         redis_client = await redis.from_url(
             settings.REDIS_URL,
             encoding="utf-8",
-            decode_responses=True,
+            decode_responses=False,
+            socket_connect_timeout=settings.REDIS_CONNECT_TIMEOUT,
+            socket_timeout=settings.REDIS_OP_TIMEOUT,
         )
 
-        await redis_client.ping()
+        await asyncio.wait_for(redis_client.ping(), timeout=settings.REDIS_CONNECT_TIMEOUT)
+        redis_breaker.record_success()
 
     except ConnectionError:
         redis_client = None
+        redis_breaker.record_failure()
     except Exception:
         redis_client = None
+        redis_breaker.record_failure()
 
 
 async def close_cache():
@@ -56,22 +185,49 @@ async def get_cache() -> Redis | None:
     Получить клиент Redis.
     Если клиент еще не инициализирован, попытается его инициализировать.
     Возвращает клиент Redis или None, если Redis недоступен.
+    Пока circuit breaker открыт, возвращает None без попыток подключения.
+    Пробный запрос в полуоткрытом состоянии здесь не занимается: его берёт
+    первая команда CacheService, либо подключение, если клиента ещё нет.
     """
+    if redis_breaker.is_open:
+        return None
     if redis_client is None:
+        if not redis_breaker.allow_request():
+            return None
         await init_cache()
     return redis_client
 
 
+def get_breaker_state() -> dict:
+    """Состояние circuit breaker Redis для мониторинга."""
+    return redis_breaker.snapshot()
+
+
+def get_local_cache() -> LocalCache | None:
+    """Получить процессный L1-кеш или None, если он отключён в настройках."""
+    return local_cache
+
+
 class CacheService:
     """
     Сервис для работы с кешем.
     Устойчив к сбоям Redis: операции с кешем будут пропущены,
     если Redis недоступен, без возникновения ошибок.
+    Если передан локальный кеш, он опрашивается перед Redis и
+    инвалидируется вместе с ним.
     """
 
-    def __init__(self, redis_client_instance: Redis | None, ttl: int = settings.REDIS_TTL):
+    def __init__(
+        self,
+        redis_client_instance: Redis | None,
+        ttl: int = settings.REDIS_TTL,
+        local_cache_instance: LocalCache | None = None,
+        serializer: CacheSerializer = cache_serializer,
+    ):
         self.redis = redis_client_instance
         self.ttl = ttl
+        self.local = local_cache_instance
+        self.serializer = serializer
 
         self._is_available = self.redis is not None
 
@@ -80,17 +236,59 @@ class CacheService:
         """Возвращает текущий статус доступности кеша."""
         return self._is_available
 
+    async def _call(self, command: Awaitable[Any]) -> Any:
+        """
+        Выполнить команду Redis с таймаутом операции.
+        Результат учитывается circuit breaker'ом; при открытом breaker
+        команда не отправляется, в полуоткрытом проходит только пробная.
+        """
+        if not redis_breaker.allow_request():
+            if asyncio.iscoroutine(command):
+                command.close()
+            raise ConnectionError("Redis circuit breaker is open")
+        try:
+            result = await asyncio.wait_for(command, timeout=settings.REDIS_OP_TIMEOUT)
+        except redis.WatchError:
+            # Redis ответил: транзакция отменена из-за изменения ключа, а не сбоя
+            redis_breaker.record_success()
+            raise
+        except Exception:
+            redis_breaker.record_failure()
+            raise
+        redis_breaker.record_success()
+        return result
+
     async def get(self, key: str) -> dict | None:
         """
         Получить значение из кеша.
+        Сначала проверяется локальный кеш, затем Redis.
         В случае ошибки Redis или его недоступности, возвращает None.
         """
+        entry = await self._get_entry(key)
+        return entry[0] if entry is not None else None
+
+    async def _get_entry(self, key: str) -> tuple[Any, float] | None:
+        """Получить значение вместе с моментом, до которого оно считается свежим."""
+        if self.local is not None:
+            entry = self.local.get(key)
+            if entry is not None:
+                return entry
+
         if not self._is_available:
             return None
         try:
-            value = await self.redis.get(key)
+            value = await self._call(self.redis.get(key))
             if value:
-                return json.loads(value)
+                entry = self.serializer.loads(value)
+                if self.local is not None:
+                    self.local.set(key, entry)
+                return entry
+        except CacheCorruptError:
+            logger.warning("Dropping corrupt cache entry %s", key)
+            await self.delete(key)
+            return None
+        except CacheDecodeError:
+            return None
         except ConnectionError:
 
             self._is_available = False
@@ -99,16 +297,23 @@ class CacheService:
             self._is_available = False
         return None
 
-    async def set(self, key: str, value: dict, ttl: int | None = None):
+    async def set(self, key: str, value: dict, ttl: int | None = None, soft_ttl: int | None = None):
         """
         Установить значение в кеш.
+        ttl — жёсткий TTL записи. Если задан soft_ttl, по его истечении значение
+        считается устаревшим: get_or_compute отдаёт его и обновляет в фоне.
         В случае ошибки Redis или его недоступности, пропускает запись.
         """
+        ttl = ttl or self.ttl
+        fresh_until = time.time() + soft_ttl if soft_ttl else math.inf
+        if self.local is not None:
+            self.local.set(key, (value, fresh_until), ttl)
+
         if not self._is_available:
             return
         try:
-            ttl = ttl or self.ttl
-            await self.redis.setex(key, ttl, json.dumps(value))
+            payload = self.serializer.dumps(key, value, fresh_until)
+            await self._call(self.redis.setex(key, ttl, payload))
         except ConnectionError:
 
             self._is_available = False
@@ -121,10 +326,13 @@ class CacheService:
         Удалить значение из кеша.
         В случае ошибки Redis или его недоступности, пропускает удаление.
         """
+        if self.local is not None:
+            self.local.delete(key)
+
         if not self._is_available:
             return
         try:
-            await self.redis.delete(key)
+            await self._call(self.redis.delete(key))
         except ConnectionError:
 
             self._is_available = False
@@ -132,18 +340,517 @@ class CacheService:
 
             self._is_available = False
 
+    async def get_many(self, keys: Sequence[str]) -> dict[str, Any]:
+        """
+        Получить несколько значений: промахи L1 читаются одним MGET.
+        Возвращает только найденные ключи.
+        """
+        found: dict[str, Any] = {}
+        missing = []
+        for key in keys:
+            entry = self.local.get(key) if self.local is not None else None
+            if entry is None:
+                missing.append(key)
+            else:
+                found[key] = entry[0]
+
+        if not missing or not self._is_available:
+            return found
+        try:
+            values = await self._call(self.redis.mget(missing))
+            corrupt = []
+            for key, value in zip(missing, values, strict=True):
+                if not value:
+                    continue
+                try:
+                    entry = self.serializer.loads(value)
+                except CacheCorruptError:
+                    corrupt.append(key)
+                    continue
+                except CacheDecodeError:
+                    continue
+                if self.local is not None:
+                    self.local.set(key, entry)
+                found[key] = entry[0]
+            if corrupt:
+                logger.warning("Dropping %d corrupt cache entries", len(corrupt))
+                await self._call(self.redis.delete(*corrupt))
+        except ConnectionError:
+            self._is_available = False
+        except Exception:
+            self._is_available = False
+        return found
+
+    async def set_many(
+        self, items: dict[str, Any], ttl: int | None = None, soft_ttl: int | None = None
+    ):
+        """Записать несколько значений за один pipeline-запрос."""
+        if not items:
+            return
+        ttl = ttl or self.ttl
+        fresh_until = time.time() + soft_ttl if soft_ttl else math.inf
+        if self.local is not None:
+            for key, value in items.items():
+                self.local.set(key, (value, fresh_until), ttl)
+
+        if not self._is_available:
+            return
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            for key, value in items.items():
+                pipe.setex(key, ttl, self.serializer.dumps(key, value, fresh_until))
+            await self._call(pipe.execute())
+        except ConnectionError:
+            self._is_available = False
+        except Exception:
+            self._is_available = False
+
     async def delete_pattern(self, pattern: str):
         """
         Удалить все ключи по паттерну.
+        Ключи перебираются через SCAN, чтобы не блокировать Redis, но стоимость
+        всё равно пропорциональна размеру keyspace. На горячих путях используйте
+        инвалидацию по тегам (invalidate_tags).
         В случае ошибки Redis или его недоступности, пропускает удаление.
         """
+        if self.local is not None:
+            self.local.delete_pattern(pattern)
+
+        await self._scan_and_delete(pattern)
+
+    async def purge_legacy_keys(self, patterns: Sequence[str]) -> int:
+        """
+        Удалить ключи старого формата (без суффикса поколения).
+        Используется однократно после перехода на теговую инвалидацию;
+        без вызова старые ключи просто истекут по TTL.
+        """
+        deleted = 0
+        for pattern in patterns:
+            deleted += await self._scan_and_delete(
+                pattern, keep=lambda key: _GENERATION_SUFFIX.search(_to_str(key)) is not None
+            )
+        return deleted
+
+    async def _scan_and_delete(self, pattern: str, keep=None) -> int:
+        """Удалить ключи по паттерну пачками через SCAN + UNLINK."""
         if not self._is_available:
+            return 0
+        deleted = 0
+        try:
+            cursor = None
+            while cursor != 0:
+                cursor, keys = await self._call(
+                    self.redis.scan(cursor or 0, match=pattern, count=_SCAN_BATCH_SIZE)
+                )
+                batch = [key for key in keys if keep is None or not keep(key)]
+                if batch:
+                    deleted += await self._call(self.redis.unlink(*batch))
+        except ConnectionError:
+            self._is_available = False
+        except Exception:
+            self._is_available = False
+        return deleted
+
+    async def tagged_key(self, base: str, *tags: str) -> str:
+        """
+        Построить ключ с номерами поколений тегов.
+        После invalidate_tags любого из тегов ключ меняется, а старые записи
+        больше не читаются и истекают по TTL.
+        """
+        generations = await self.get_generations(tags)
+        return f"{base}:g" + ".".join(str(generation) for generation in generations)
+
+    async def get_generations(self, tags: Sequence[str]) -> list[int]:
+        """
+        Получить текущие поколения тегов одним MGET.
+        Поколения кешируются в L1, поэтому горячие ключи не требуют
+        обращения к Redis; локальная инвалидация видна сразу.
+        """
+        generations: dict[str, int] = {}
+        missing = []
+        for tag in tags:
+            value = self.local.get(_generation_key(tag)) if self.local is not None else None
+            if value is None:
+                missing.append(tag)
+            else:
+                generations[tag] = value
+
+        if missing:
+            values = [None] * len(missing)
+            if self._is_available:
+                try:
+                    values = await self._call(
+                        self.redis.mget([_generation_key(tag) for tag in missing])
+                    )
+                except ConnectionError:
+                    self._is_available = False
+                except Exception:
+                    self._is_available = False
+
+            for tag, value in zip(missing, values, strict=True):
+                generations[tag] = int(value) if value else 0
+                if self.local is not None:
+                    self.local.set(_generation_key(tag), generations[tag])
+
+        return [generations[tag] for tag in tags]
+
+    async def invalidate_tags(self, *tags: str):
+        """
+        Инвалидировать все ключи, помеченные тегами, за O(число тегов).
+        Увеличивает счётчики поколений; keyspace не сканируется.
+        """
+        if not tags:
+            return
+
+        generations = [None] * len(tags)
+        if self._is_available:
+            try:
+                pipe = self.redis.pipeline(transaction=False)
+                for tag in tags:
+                    pipe.incr(_generation_key(tag))
+                generations = await self._call(pipe.execute())
+            except ConnectionError:
+                self._is_available = False
+            except Exception:
+                self._is_available = False
+
+        if self.local is not None:
+            for tag, generation in zip(tags, generations, strict=True):
+                if generation is None:
+                    generation = (self.local.get(_generation_key(tag)) or 0) + 1
+                self.local.set(_generation_key(tag), int(generation))
+
+    async def sample_set(self, key: str, count: int, ready_key: str) -> list[str] | None:
+        """
+        До count разных случайных элементов множества одной командой SRANDMEMBER.
+        Возвращает None, если Redis недоступен или множества ещё не заполнены
+        (нет ready_key): тогда данные нужно взять из БД.
+        """
+        if not self._is_available:
+            return None
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            pipe.exists(ready_key)
+            pipe.srandmember(key, count)
+            ready, members = await self._call(pipe.execute())
+        except ConnectionError:
+            self._is_available = False
+            return None
+        except Exception:
+            self._is_available = False
+            return None
+
+        if not ready:
+            return None
+        return [_to_str(member) for member in members]
+
+    async def update_sets(
+        self,
+        removed: Mapping[str, Sequence[str]],
+        added: Mapping[str, Sequence[str]],
+        version_key: str | None = None,
+    ):
+        """
+        Удалить (SREM) и затем добавить (SADD) элементы множеств одним пайплайном.
+        В той же транзакции увеличивается version_key, чтобы идущее параллельно
+        replace_sets не затёрло изменение снимком, прочитанным до него.
+        """
+        if not self._is_available or not (removed or added):
+            return
+        try:
+            pipe = self.redis.pipeline(transaction=True)
+            for key, members in removed.items():
+                pipe.srem(key, *members)
+            for key, members in added.items():
+                pipe.sadd(key, *members)
+            if version_key is not None:
+                pipe.incr(version_key)
+            await self._call(pipe.execute())
+        except ConnectionError:
+            self._is_available = False
+        except Exception:
+            self._is_available = False
+
+    async def replace_sets(
+        self,
+        pattern: str,
+        load: Callable[[], Awaitable[Mapping[str, Sequence[str]]]],
+        ready_key: str,
+        version_key: str,
+    ) -> bool:
+        """
+        Заменить все множества, подходящие под pattern, результатом load()
+        (отсутствующие в нём удаляются) и выставить ready_key. Запись идёт
+        одной транзакцией MULTI, поэтому читатели не видят промежуточного состояния.
+        version_key наблюдается (WATCH) с начала load(): если update_sets изменил
+        множества, пока читался снимок, транзакция отменяется и снимок читается
+        заново. Возвращает False, если замену выполнить не удалось.
+        """
+        for _ in range(_REPLACE_SETS_ATTEMPTS):
+            if not self._is_available:
+                return False
+            async with self.redis.pipeline(transaction=True) as pipe:
+                try:
+                    await self._call(pipe.watch(version_key))
+                except ConnectionError:
+                    self._is_available = False
+                    return False
+                except Exception:
+                    self._is_available = False
+                    return False
+
+                sets = await load()
+                try:
+                    existing = set()
+                    cursor = None
+                    while cursor != 0:
+                        cursor, keys = await self._call(
+                            self.redis.scan(cursor or 0, match=pattern, count=_SCAN_BATCH_SIZE)
+                        )
+                        existing.update(_to_str(key) for key in keys)
+
+                    pipe.multi()
+                    for key in existing - sets.keys():
+                        pipe.delete(key)
+                    for key, members in sets.items():
+                        pipe.delete(key)
+                        pipe.sadd(key, *members)
+                    pipe.set(ready_key, 1)
+                    await self._call(pipe.execute())
+                except redis.WatchError:
+                    continue
+                except ConnectionError:
+                    self._is_available = False
+                    return False
+                except Exception:
+                    self._is_available = False
+                    return False
+            return True
+
+        logger.warning("Sets %s changed during every rebuild attempt", pattern)
+        return False
+
+    async def acquire_lease(self, key: str, ttl: float) -> bool:
+        """
+        Захватить аренду key на ttl секунд (SET NX PX), чтобы периодическую
+        работу выполнял один процесс. Аренда не снимается, а истекает: до тех пор
+        остальные процессы работу пропускают. Без Redis возвращает False.
+        """
+        if not self._is_available:
+            return False
+        try:
+            return bool(
+                await self._call(
+                    self.redis.set(
+                        _lock_key(key), secrets.token_hex(8), nx=True, px=int(ttl * 1000)
+                    )
+                )
+            )
+        except ConnectionError:
+            self._is_available = False
+        except Exception:
+            self._is_available = False
+        return False
+
+    async def get_or_compute(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[Any]],
+        ttl: int | None = None,
+        fallback_key: str | None = None,
+        soft_ttl: int | None = None,
+        refresh: Callable[[], Awaitable[Any]] | None = None,
+    ) -> Any:
+        """
+        Получить значение из кеша или вычислить его, защищаясь от stampede.
+        В пределах процесса одновременные промахи по одному ключу ждут одно
+        вычисление. Между процессами пересчёт выполняет только владелец
+        короткой блокировки в Redis; остальные отдают последнее известное
+        значение из fallback_key или ждут, пока владелец запишет новое.
+
+        Stale-while-revalidate: если задан soft_ttl, после его истечения и до
+        жёсткого ttl устаревшее значение отдаётся сразу, а refresh обновляет
+        его в фоновой задаче. refresh не должен использовать ресурсы запроса
+        (например, его сессию БД), так как выполняется после ответа.
+        """
+        entry = await self._get_entry(key)
+        if entry is not None:
+            value, fresh_until = entry
+            if fresh_until > time.time():
+                return value
+            if refresh is not None:
+                self._schedule_refresh(key, refresh, ttl, soft_ttl, fallback_key)
+                return value
+
+        return await _single_flight(
+            key, lambda: self._compute_with_lock(key, compute, ttl, soft_ttl, fallback_key)
+        )
+
+    async def _compute_with_lock(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[Any]],
+        ttl: int | None,
+        soft_ttl: int | None,
+        fallback_key: str | None,
+    ) -> Any:
+        """Вычислить значение под распределённой блокировкой и записать в кеш."""
+        token = await self._acquire_lock(key)
+        if token is None:
+            if fallback_key is not None:
+                value = await self.get(fallback_key)
+                if value is not None:
+                    return value
+
+            value = await self._wait_for(key)
+            if value is not None:
+                return value
+
+        try:
+            value = await compute()
+            await self._store(key, value, ttl, soft_ttl, fallback_key)
+            return value
+        finally:
+            if token is not None:
+                await self._release_lock(key, token)
+
+    def _schedule_refresh(
+        self,
+        key: str,
+        refresh: Callable[[], Awaitable[Any]],
+        ttl: int | None,
+        soft_ttl: int | None,
+        fallback_key: str | None,
+    ):
+        """Запустить фоновое обновление ключа, если оно ещё не запущено."""
+        refresh_key = f"refresh:{key}"
+        if refresh_key in _inflight:
+            return
+        task = asyncio.create_task(
+            _single_flight(
+                refresh_key, lambda: self._refresh(key, refresh, ttl, soft_ttl, fallback_key)
+            )
+        )
+        _background_tasks.add(task)
+        task.add_done_callback(_background_tasks.discard)
+
+    async def _refresh(
+        self,
+        key: str,
+        refresh: Callable[[], Awaitable[Any]],
+        ttl: int | None,
+        soft_ttl: int | None,
+        fallback_key: str | None,
+    ):
+        """Обновить значение в фоне; если обновляет другой воркер, ничего не делать."""
+        token = await self._acquire_lock(key)
+        if token is None:
             return
         try:
-            keys = await self.redis.keys(pattern)
-            if keys:
-                await self.redis.delete(*keys)
+            value = await refresh()
+            await self._store(key, value, ttl, soft_ttl, fallback_key)
+        except Exception:
+            logger.warning("Background refresh of cache key %s failed", key, exc_info=True)
+        finally:
+            await self._release_lock(key, token)
+
+    async def _store(
+        self,
+        key: str,
+        value: Any,
+        ttl: int | None,
+        soft_ttl: int | None,
+        fallback_key: str | None,
+    ):
+        """Записать вычисленное значение и его резервную копию."""
+        await self.set(key, value, ttl, soft_ttl=soft_ttl)
+        if fallback_key is not None:
+            await self.set(fallback_key, value, (ttl or self.ttl) * 2)
+
+    async def _acquire_lock(self, key: str) -> str | None:
+        """
+        Захватить блокировку пересчёта ключа.
+        Возвращает токен владельца или None, если блокировка занята.
+        Без Redis блокировка считается захваченной: координировать некого.
+        """
+        token = secrets.token_hex(8)
+        if not self._is_available:
+            return token
+        try:
+            acquired = await self._call(
+                self.redis.set(_lock_key(key), token, nx=True, ex=settings.CACHE_LOCK_TTL)
+            )
+            return token if acquired else None
         except ConnectionError:
             self._is_available = False
         except Exception:
             self._is_available = False
+        return token
+
+    async def _release_lock(self, key: str, token: str):
+        """Освободить блокировку, только если она всё ещё принадлежит нам."""
+        if not self._is_available:
+            return
+        try:
+            await self._call(self.redis.eval(_RELEASE_LOCK_SCRIPT, 1, _lock_key(key), token))
+        except ConnectionError:
+            self._is_available = False
+        except Exception:
+            self._is_available = False
+
+    async def _wait_for(self, key: str) -> Any | None:
+        """Подождать, пока владелец блокировки запишет значение."""
+        deadline = time.monotonic() + settings.CACHE_LOCK_WAIT
+        while time.monotonic() < deadline:
+            await asyncio.sleep(_LOCK_POLL_INTERVAL)
+            value = await self.get(key)
+            if value is not None or not self._is_available:
+                return value
+        return None
+
+
+async def _single_flight(key: str, compute: Callable[[], Awaitable[Any]]) -> Any:
+    """
+    Выполнить compute один раз для всех одновременных вызовов с ключом key.
+    Если ведущий вызов отменён, ожидающие вычисляют значение сами.
+    """
+    future = _inflight.get(key)
+    if future is not None:
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            if not future.cancelled():
+                raise
+            return await compute()
+
+    future = asyncio.get_running_loop().create_future()
+    future.add_done_callback(lambda f: f.cancelled() or f.exception())
+    _inflight[key] = future
+    try:
+        value = await compute()
+    except Exception as exc:
+        future.set_exception(exc)
+        raise
+    except BaseException:
+        future.cancel()
+        raise
+    else:
+        future.set_result(value)
+        return value
+    finally:
+        _inflight.pop(key, None)
+
+
+def _to_str(value: bytes | str) -> str:
+    """Привести ответ Redis к строке (клиент работает без decode_responses)."""
+    return value.decode() if isinstance(value, bytes) else value
+
+
+def _lock_key(key: str) -> str:
+    """Ключ блокировки пересчёта."""
+    return f"cache:lock:{key}"
+
+
+def _generation_key(tag: str) -> str:
+    """Ключ счётчика поколения тега."""
+    return f"cache:gen:{tag}"
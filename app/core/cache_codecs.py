@@ -0,0 +1,268 @@
+"""Кодеки значений кеша."""
+
+import json
+import logging
+import math
+import struct
+import zlib
+from typing import Any
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import lz4.frame as lz4_frame
+except ImportError:
+    lz4_frame = None
+
+MAGIC = b"\x00"
+_HEADER = struct.Struct("!cBBd")
+_ENVELOPE_MARKER = "__swr__"
+
+logger = logging.getLogger(__name__)
+
+
+class CacheDecodeError(Exception):
+    """Запись кеша не может быть декодирована в этом процессе."""
+
+
+class CacheCorruptError(CacheDecodeError):
+    """
+    Запись кеша повреждена или обрезана: её не прочитает ни один процесс.
+    В отличие от записи кодеком, недоступным в этом процессе, её можно удалить.
+    """
+
+
+class Codec:
+    """Базовый кодек значения."""
+
+    codec_id: int
+    name: str
+
+    def dumps(self, value: Any) -> bytes:
+        raise NotImplementedError
+
+    def loads(self, data: bytes) -> Any:
+        raise NotImplementedError
+
+
+class JsonCodec(Codec):
+    """Стандартный json."""
+
+    codec_id = 1
+    name = "json"
+
+    def dumps(self, value: Any) -> bytes:
+        return json.dumps(value, separators=(",", ":")).encode()
+
+    def loads(self, data: bytes) -> Any:
+        return json.loads(data)
+
+
+class OrjsonCodec(Codec):
+    """Быстрый JSON на orjson."""
+
+    codec_id = 2
+    name = "orjson"
+
+    def dumps(self, value: Any) -> bytes:
+        return orjson.dumps(value)
+
+    def loads(self, data: bytes) -> Any:
+        return orjson.loads(data)
+
+
+class MsgpackCodec(Codec):
+    """Бинарный MessagePack."""
+
+    codec_id = 3
+    name = "msgpack"
+
+    def dumps(self, value: Any) -> bytes:
+        return msgpack.packb(value, use_bin_type=True)
+
+    def loads(self, data: bytes) -> Any:
+        return msgpack.unpackb(data, raw=False)
+
+
+class RawCodec(Codec):
+    """Готовые байты (например, закодированное тело HTTP-ответа) без преобразований."""
+
+    codec_id = 4
+    name = "raw"
+
+    def dumps(self, value: bytes) -> bytes:
+        return bytes(value)
+
+    def loads(self, data: bytes) -> bytes:
+        return bytes(data)
+
+
+class Compressor:
+    """Базовый алгоритм сжатия."""
+
+    compression_id: int
+    name: str
+
+    def compress(self, data: bytes) -> bytes:
+        raise NotImplementedError
+
+    def decompress(self, data: bytes) -> bytes:
+        raise NotImplementedError
+
+
+class NoCompression(Compressor):
+    """Без сжатия."""
+
+    compression_id = 0
+    name = "none"
+
+    def compress(self, data: bytes) -> bytes:
+        return data
+
+    def decompress(self, data: bytes) -> bytes:
+        return data
+
+
+class ZlibCompression(Compressor):
+    """zlib с минимальным уровнем сжатия: выигрыш в размере при малой цене по CPU."""
+
+    compression_id = 1
+    name = "zlib"
+
+    def compress(self, data: bytes) -> bytes:
+        return zlib.compress(data, 1)
+
+    def decompress(self, data: bytes) -> bytes:
+        return zlib.decompress(data)
+
+
+class Lz4Compression(Compressor):
+    """LZ4 frame."""
+
+    compression_id = 2
+    name = "lz4"
+
+    def compress(self, data: bytes) -> bytes:
+        return lz4_frame.compress(data)
+
+    def decompress(self, data: bytes) -> bytes:
+        return lz4_frame.decompress(data)
+
+
+CODECS: dict[str, Codec] = {
+    codec.name: codec
+    for codec, available in (
+        (JsonCodec(), True),
+        (OrjsonCodec(), orjson is not None),
+        (MsgpackCodec(), msgpack is not None),
+    )
+    if available
+}
+
+COMPRESSORS: dict[str, Compressor] = {
+    compressor.name: compressor
+    for compressor, available in (
+        (NoCompression(), True),
+        (ZlibCompression(), True),
+        (Lz4Compression(), lz4_frame is not None),
+    )
+    if available
+}
+
+RAW_CODEC = RawCodec()
+
+_CODECS_BY_ID = {codec.codec_id: codec for codec in (*CODECS.values(), RAW_CODEC)}
+_COMPRESSORS_BY_ID = {c.compression_id: c for c in COMPRESSORS.values()}
+
+
+class CacheSerializer:
+    """
+    Сериализация записей кеша.
+
+    Формат записи: MAGIC | id кодека | id сжатия | fresh_until (double) | данные.
+    Кодек выбирается по пространству имён ключа (часть до первого ":"),
+    значения bytes всегда сохраняются кодеком raw, сжатие применяется, только если закодированные данные больше порога.
+    Записи без MAGIC — JSON-текст прежнего формата — читаются как раньше.
+    Недоступные в окружении кодеки заменяются на json и zlib с предупреждением в логе.
+    """
+
+    def __init__(
+        self,
+        default_codec: str = "json",
+        namespace_codecs: dict[str, str] | None = None,
+        compression: str = "none",
+        compression_threshold: int = 0,
+    ):
+        self.default_codec = _resolve(CODECS, default_codec, "json")
+        self.namespace_codecs = {
+            namespace: _resolve(CODECS, name, "json")
+            for namespace, name in (namespace_codecs or {}).items()
+        }
+        self.compressor = _resolve(COMPRESSORS, compression, "zlib")
+        self.compression_threshold = compression_threshold
+
+    def codec_for(self, key: str) -> Codec:
+        """Кодек для ключа по его пространству имён."""
+        return self.namespace_codecs.get(key.split(":", 1)[0], self.default_codec)
+
+    def dumps(self, key: str, value: Any, fresh_until: float = math.inf) -> bytes:
+        """Закодировать значение ключа."""
+        codec = RAW_CODEC if isinstance(value, bytes) else self.codec_for(key)
+        data = codec.dumps(value)
+        compressor = COMPRESSORS["none"]
+        if self.compression_threshold and len(data) >= self.compression_threshold:
+            compressor = self.compressor
+            data = compressor.compress(data)
+        header = _HEADER.pack(MAGIC, codec.codec_id, compressor.compression_id, fresh_until)
+        return header + data
+
+    def loads(self, data: bytes | str) -> tuple[Any, float]:
+        """Декодировать запись в пару (значение, свежо до)."""
+        if isinstance(data, str):
+            data = data.encode()
+        if not data.startswith(MAGIC):
+            try:
+                return _unpack_legacy(json.loads(data))
+            except Exception as exc:
+                raise CacheCorruptError(str(exc)) from exc
+
+        try:
+            _, codec_id, compression_id, fresh_until = _HEADER.unpack_from(data)
+        except struct.error as exc:
+            raise CacheCorruptError(str(exc)) from exc
+        try:
+            codec = _CODECS_BY_ID[codec_id]
+            compressor = _COMPRESSORS_BY_ID[compression_id]
+        except KeyError as exc:
+            raise CacheDecodeError(str(exc)) from exc
+        try:
+            # zlib.error, ошибки кадра lz4 и разбора orjson/msgpack — разных типов
+            return codec.loads(compressor.decompress(data[_HEADER.size :])), fresh_until
+        except Exception as exc:
+            raise CacheCorruptError(str(exc)) from exc
+
+
+def _resolve(registry: dict, name: str, fallback: str):
+    """Найти реализацию по имени, заменяя недоступную на fallback."""
+    if name in registry:
+        return registry[name]
+    logger.warning("Cache codec %r is not available, falling back to %r", name, fallback)
+    return registry[fallback]
+
+
+def _unpack_legacy(payload: Any) -> tuple[Any, float]:
+    """
+    Разобрать JSON-запись прежнего формата.
+    Записи с soft TTL хранились в конверте {"__swr__": 1, ...}, остальные — как есть.
+    """
+    if isinstance(payload, dict) and payload.get(_ENVELOPE_MARKER) == 1:
+        return payload["value"], payload["fresh_until"]
+    return payload, math.inf
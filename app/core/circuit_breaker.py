@@ -0,0 +1,105 @@
+"""Circuit breaker для внешних зависимостей."""
+
+import random
+import time
+
+
+class CircuitBreaker:
+    """
+    Процессный circuit breaker с экспоненциальной задержкой и джиттером.
+
+    closed    — запросы проходят, ошибки подсчитываются;
+    open      — запросы отклоняются без обращения к зависимости до истечения задержки;
+    half_open — пропускается один пробный запрос: успех закрывает breaker,
+                ошибка снова открывает его с удвоенной задержкой.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        failure_threshold: int = 3,
+        backoff: float = 1.0,
+        max_backoff: float = 30.0,
+        probe_timeout: float = 5.0,
+    ):
+        self.failure_threshold = failure_threshold
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.probe_timeout = probe_timeout
+
+        self._state = self.CLOSED
+        self._failures = 0
+        self._consecutive_opens = 0
+        self._retry_at = 0.0
+        self._probe_deadline = 0.0
+        self._opened_total = 0
+
+    @property
+    def state(self) -> str:
+        """Текущее состояние."""
+        return self._state
+
+    @property
+    def is_open(self) -> bool:
+        """Открыт ли breaker (запросы к зависимости запрещены)."""
+        return self._state == self.OPEN and time.monotonic() < self._retry_at
+
+    def allow_request(self) -> bool:
+        """
+        Можно ли обратиться к зависимости.
+        По истечении задержки первый вызвавший становится пробным запросом.
+        """
+        now = time.monotonic()
+        if self._state == self.CLOSED:
+            return True
+        if self._state == self.OPEN and now >= self._retry_at:
+            self._state = self.HALF_OPEN
+            self._probe_deadline = now + self.probe_timeout
+            return True
+        if self._state == self.HALF_OPEN and now >= self._probe_deadline:
+            self._probe_deadline = now + self.probe_timeout
+            return True
+        return False
+
+    def record_success(self):
+        """Зафиксировать успешный вызов."""
+        self._state = self.CLOSED
+        self._failures = 0
+        self._consecutive_opens = 0
+
+    def record_failure(self):
+        """Зафиксировать ошибку или таймаут вызова."""
+        self._failures += 1
+        if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+            self._open()
+
+    def reset(self):
+        """Вернуть breaker в исходное состояние."""
+        self.record_success()
+        self._retry_at = 0.0
+        self._opened_total = 0
+
+    def snapshot(self) -> dict:
+        """Состояние для мониторинга."""
+        return {
+            "state": self._state,
+            "failures": self._failures,
+            "opened_total": self._opened_total,
+            "retry_in": (
+                max(0.0, round(self._retry_at - time.monotonic(), 3))
+                if self._state == self.OPEN
+                else 0.0
+            ),
+        }
+
+    def _open(self):
+        """Открыть breaker со следующей задержкой (equal jitter)."""
+        delay = min(self.backoff * 2**self._consecutive_opens, self.max_backoff)
+        self._retry_at = time.monotonic() + delay / 2 + random.uniform(0, delay / 2)
+        self._state = self.OPEN
+        self._failures = 0
+        self._consecutive_opens += 1
+        self._opened_total += 1
@@ -11,6 +11,46 @@ class Settings(BaseSettings):
     DATABASE_ECHO: bool = False
     REDIS_URL: str = "redis://localhost:6379/0"
     REDIS_TTL: int = 300
+    REDIS_CONNECT_TIMEOUT: float = 0.5
+    REDIS_OP_TIMEOUT: float = 0.2
+    REDIS_BREAKER_FAILURE_THRESHOLD: int = 3
+    REDIS_BREAKER_BACKOFF: float = 1.0
+    REDIS_BREAKER_MAX_BACKOFF: float = 30.0
+    CACHE_SOFT_TTL: int = 60
+    CACHE_REVIEWS_TTL: int = 6 * 3600
+    CACHE_TEAMS_TTL: int = 6 * 3600
+    CACHE_CODEC: str = "orjson"
+    CACHE_NAMESPACE_CODECS: dict[str, str] = {}
+    CACHE_COMPRESSION: str = "lz4"
+    CACHE_COMPRESSION_THRESHOLD: int = 16384
+    RESPONSE_CACHE_ENABLED: bool = True
+    LOCAL_CACHE_ENABLED: bool = True
+    LOCAL_CACHE_MAX_SIZE: int = 1024
+    LOCAL_CACHE_TTL: int = 5
+    CACHE_LOCK_TTL: int = 10
+    CACHE_LOCK_WAIT: float = 2.0
+    STATS_COUNTER_SHARDS: int = 8
+    STATS_STREAM_BATCH_SIZE: int = 1000
+    STATS_TEAM_MAX_DAYS: int = 366
+    STATS_INVALIDATION_INTERVAL: float = 1.0
+    REVIEWER_ASSIGNMENT_STRATEGY: str = "random"
+    REVIEWER_LEAST_LOADED_WINDOW: int = 10
+    REVIEWER_CAPACITY: int = 5
+    REVIEWER_CAPACITY_OVERRIDES: dict[str, int] = {}
+    ROSTER_BACKEND: str = "memory"
+    ROSTER_INDEX_REFRESH_INTERVAL: float = 60.0
+    PR_BATCH_MAX_SIZE: int = 1000
+    BULK_JOB_WORKER_ENABLED: bool = True
+    BULK_JOB_CHUNK_SIZE: int = 500
+    BULK_JOB_LEASE_SECONDS: float = 60.0
+    BULK_JOB_POLL_INTERVAL: float = 1.0
+    BULK_JOB_MAX_ATTEMPTS: int = 5
+    BULK_JOB_RETRY_DELAY: float = 5.0
+    CACHE_WARMUP_ENABLED: bool = True
+    CACHE_WARMUP_TEAMS: int = 20
+    CACHE_WARMUP_REVIEWERS: int = 100
+    CACHE_WARMUP_CONCURRENCY: int = 4
+    CACHE_WARMUP_TIMEOUT: float = 30.0
     APP_HOST: str = "0.0.0.0"
     APP_PORT: int = 8080
     DEBUG: bool = False
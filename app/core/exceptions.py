@@ -61,6 +61,28 @@ class NoCandidateException(ServiceException):
         )
 
 
+class InvalidDateRangeException(ServiceException):
+    """Некорректный интервал дат."""
+
+    def __init__(self, max_days: int):
+        super().__init__(
+            "INVALID_RANGE",
+            f"from must not be after to and the range must not exceed {max_days} days",
+            status.HTTP_400_BAD_REQUEST,
+        )
+
+
+class BatchTooLargeException(ServiceException):
+    """В пакетном запросе слишком много элементов."""
+
+    def __init__(self, max_size: int):
+        super().__init__(
+            "BATCH_TOO_LARGE",
+            f"batch must contain at most {max_size} items",
+            status.HTTP_400_BAD_REQUEST,
+        )
+
+
 async def service_exception_handler(request: Request, exc: ServiceException) -> JSONResponse:
     """Обработчик исключений сервиса."""
     return JSONResponse(
@@ -0,0 +1,69 @@
+"""
+Служебные команды для обслуживания БД и кеша.
+
+Запуск: python -m app.db.commands <команда>
+"""
+
+import argparse
+import asyncio
+import logging
+
+from app.core.cache import CacheService, close_cache, get_cache
+from app.core.database import async_session_maker, close_db
+from app.db.repositories.stats_repository import StatsRepository
+from app.domain.cache_keys import LEGACY_KEY_PATTERNS
+
+logger = logging.getLogger(__name__)
+
+
+async def rebuild_counters():
+    """Пересчитать счётчики статистики с нуля."""
+    async with async_session_maker() as session:
+        pr_stats = await StatsRepository(session).rebuild()
+        await session.commit()
+    logger.info("Statistics counters rebuilt: %s", pr_stats)
+
+
+async def rebuild_rollups():
+    """Пересчитать дневные агрегаты ревью с нуля."""
+    async with async_session_maker() as session:
+        await StatsRepository(session).rebuild_rollups()
+        await session.commit()
+    logger.info("Review daily rollups rebuilt")
+
+
+async def purge_legacy_cache_keys():
+    """Удалить из Redis ключи формата до теговой инвалидации (без суффикса поколения)."""
+    cache_service = CacheService(await get_cache())
+    if not cache_service.is_available:
+        raise SystemExit("Redis is unavailable, legacy cache keys were not purged")
+    deleted = await cache_service.purge_legacy_keys(LEGACY_KEY_PATTERNS)
+    logger.info("Legacy cache keys purged: %d", deleted)
+
+
+COMMANDS = {
+    "rebuild-counters": rebuild_counters,
+    "rebuild-rollups": rebuild_rollups,
+    "purge-legacy-cache-keys": purge_legacy_cache_keys,
+}
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(prog="python -m app.db.commands")
+    parser.add_argument("command", choices=sorted(COMMANDS))
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
+
+    async def run():
+        try:
+            await COMMANDS[args.command]()
+        finally:
+            await close_db()
+            await close_cache()
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
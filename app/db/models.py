@@ -3,11 +3,14 @@
 from datetime import datetime
 
 from sqlalchemy import (
+    JSON,
     Boolean,
     Column,
+    Date,
     DateTime,
     ForeignKey,
     Index,
+    Integer,
     String,
     Table,
     UniqueConstraint,
@@ -53,7 +56,7 @@ class User(Base):
     __tablename__ = "users"
     __table_args__ = (
         UniqueConstraint("user_id", name="uq_users_user_id"),
-        Index("idx_users_team_active", "team_name", "is_active"),
+        Index("idx_users_team_active_load", "team_name", "is_active", "open_reviews"),
         {"comment": "Пользователи"},
     )
 
@@ -66,6 +69,13 @@ class User(Base):
         comment="Название команды",
     )
     is_active = Column(Boolean, default=True, nullable=False, comment="Флаг активности")
+    open_reviews = Column(
+        Integer,
+        default=0,
+        server_default="0",
+        nullable=False,
+        comment="Открытых ревью (денормализовано из user_review_counters для выбора ревьювера)",
+    )
 
     team = relationship("Team", back_populates="members")
     authored_prs = relationship(
@@ -98,3 +108,99 @@ class PullRequest(Base):
 
     author = relationship("User", back_populates="authored_prs", foreign_keys=[author_id])
     reviewers = relationship("User", secondary=pr_reviewers, back_populates="reviewed_prs")
+
+
+class UserReviewCounter(Base):
+    """Счётчики ревью пользователя, поддерживаемые при изменении PR."""
+
+    __tablename__ = "user_review_counters"
+    __table_args__ = ({"comment": "Счётчики ревью пользователей"},)
+
+    user_id = Column(
+        String(255),
+        ForeignKey("users.user_id", ondelete="CASCADE"),
+        primary_key=True,
+        comment="ID пользователя",
+    )
+    total_reviews = Column(Integer, default=0, nullable=False, comment="Всего назначенных ревью")
+    open_reviews = Column(Integer, default=0, nullable=False, comment="Ревью открытых PR")
+
+
+class PRStatsCounter(Base):
+    """
+    Глобальные счётчики PR.
+    Каждый счётчик разбит на несколько строк (shard), чтобы параллельные
+    транзакции не блокировали одну и ту же строку; значение — сумма по shard.
+    """
+
+    __tablename__ = "pr_stats_counters"
+    __table_args__ = ({"comment": "Глобальные счётчики PR"},)
+
+    name = Column(String(50), primary_key=True, comment="Название счётчика")
+    shard = Column(Integer, primary_key=True, default=0, comment="Номер шарда счётчика")
+    value = Column(Integer, default=0, nullable=False, comment="Значение")
+
+
+class ReviewDailyRollup(Base):
+    """
+    Дневные агрегаты ревью по команде и ревьюверу.
+    Команда — команда ревьювера на момент события; open_delta — изменение числа
+    открытых ревью за день, число открытых на конец дня — накопленная сумма open_delta.
+    """
+
+    __tablename__ = "review_daily_rollups"
+    __table_args__ = ({"comment": "Дневные агрегаты ревью"},)
+
+    team_name = Column(
+        String(255),
+        ForeignKey("teams.team_name", ondelete="CASCADE"),
+        primary_key=True,
+        comment="Название команды",
+    )
+    day = Column(Date, primary_key=True, comment="День (UTC)")
+    reviewer_id = Column(
+        String(255),
+        ForeignKey("users.user_id", ondelete="CASCADE"),
+        primary_key=True,
+        comment="ID ревьювера",
+    )
+    assigned = Column(Integer, default=0, nullable=False, comment="Назначено ревью")
+    merged = Column(Integer, default=0, nullable=False, comment="Влито PR на ревью")
+    open_delta = Column(Integer, default=0, nullable=False, comment="Изменение открытых ревью")
+
+
+class BulkDeactivationJob(Base):
+    """
+    Задача фоновой массовой деактивации.
+    Пользователи обрабатываются пачками с отдельным коммитом каждой; processed —
+    сколько ID из user_ids уже обработано, поэтому после падения воркера задача
+    продолжается со следующей пачки, когда истекает аренда lease_until.
+    attempts — сколько раз подряд пачка откатилась с ошибкой; после
+    BULK_JOB_MAX_ATTEMPTS задача завершается со статусом failed.
+    """
+
+    __tablename__ = "bulk_deactivation_jobs"
+    __table_args__ = (
+        Index("idx_bulk_deactivation_jobs_status", "status", "created_at"),
+        {"comment": "Задачи массовой деактивации"},
+    )
+
+    job_id = Column(String(36), primary_key=True, comment="ID задачи")
+    status = Column(
+        String(20),
+        default="pending",
+        nullable=False,
+        comment="Статус: pending, running, done или failed",
+    )
+    user_ids = Column(JSON, nullable=False, comment="ID пользователей для деактивации")
+    processed = Column(Integer, default=0, nullable=False, comment="Обработано ID")
+    deactivated_count = Column(Integer, default=0, nullable=False, comment="Деактивировано")
+    reassigned_prs_count = Column(Integer, default=0, nullable=False, comment="Переназначено ревью")
+    errors = Column(JSON, default=list, nullable=False, comment="Ошибки обработки")
+    attempts = Column(
+        Integer, default=0, server_default="0", nullable=False, comment="Неудачных попыток пачки"
+    )
+    locked_by = Column(String(255), nullable=True, comment="Воркер, арендовавший задачу")
+    lease_until = Column(DateTime, nullable=True, comment="Окончание аренды")
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False, comment="Дата создания")
+    finished_at = Column(DateTime, nullable=True, comment="Дата завершения")
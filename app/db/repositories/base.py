@@ -1,14 +1,27 @@
 """Базовый репозиторий."""
 
+from collections.abc import Iterable
 from typing import Generic, TypeVar
 
-from sqlalchemy import select
+from sqlalchemy import ColumnElement, any_, bindparam, select
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import Base
 
 ModelType = TypeVar("ModelType", bound=Base)
 
+# Размер куска списка ID для IN там, где нет параметров-массивов: SQLite
+# допускает не больше 32766 параметров в запросе
+ID_CHUNK_SIZE = 10000
+
+_UPSERT_INSERTS = {
+    "postgresql": postgresql_insert,
+    "sqlite": sqlite_insert,
+}
+
 
 class BaseRepository(Generic[ModelType]):
     """Базовый репозиторий для работы с БД."""
@@ -17,6 +30,31 @@ class BaseRepository(Generic[ModelType]):
         self.model = model
         self.session = session
 
+    def _id_filters(self, column, ids: Iterable[str]) -> list[ColumnElement[bool]]:
+        """
+        Условия «column входит в ids», по запросу на каждое.
+        На PostgreSQL — одно условие column = ANY(:ids): весь список передаётся
+        одним параметром-массивом, поэтому текст запроса не зависит от длины
+        списка и кешируется, а лимит в 32767 параметров не достигается.
+        На остальных СУБД — IN по кускам из ID_CHUNK_SIZE ID.
+        """
+        ids = list(ids)
+        if not ids:
+            return []
+        if self._dialect() == "postgresql":
+            return [column == any_(bindparam(None, ids, type_=ARRAY(column.type)))]
+        return [
+            column.in_(ids[start : start + ID_CHUNK_SIZE])
+            for start in range(0, len(ids), ID_CHUNK_SIZE)
+        ]
+
+    def _upsert_insert(self, table):
+        """INSERT с поддержкой ON CONFLICT для СУБД сессии."""
+        return _UPSERT_INSERTS[self._dialect()](table)
+
+    def _dialect(self) -> str:
+        return self.session.get_bind().dialect.name
+
     async def get_by_id(self, id: str) -> ModelType | None:
         """Получить по ID (переопределяется в дочерних классах)."""
         raise NotImplementedError("Subclasses must implement get_by_id")
@@ -0,0 +1,160 @@
+"""Репозиторий для задач массовой деактивации."""
+
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import case, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models import BulkDeactivationJob
+from app.db.repositories.base import BaseRepository
+
+_ACTIVE_STATUSES = ("pending", "running")
+
+
+class BulkJobRepository(BaseRepository[BulkDeactivationJob]):
+    """Репозиторий задач массовой деактивации."""
+
+    def __init__(self, session: AsyncSession):
+        super().__init__(BulkDeactivationJob, session)
+
+    async def get_by_id(self, job_id: str) -> BulkDeactivationJob | None:
+        """Получить задачу по ID."""
+        result = await self.session.execute(
+            select(BulkDeactivationJob).where(BulkDeactivationJob.job_id == job_id)
+        )
+        return result.scalar_one_or_none()
+
+    async def create(self, user_ids: list[str]) -> BulkDeactivationJob:
+        """Создать задачу в статусе pending."""
+        job = BulkDeactivationJob(
+            job_id=str(uuid.uuid4()),
+            status="pending",
+            user_ids=list(user_ids),
+            processed=0,
+            deactivated_count=0,
+            reassigned_prs_count=0,
+            errors=[],
+            attempts=0,
+            created_at=datetime.utcnow(),
+        )
+        self.session.add(job)
+        await self.session.flush()
+        return job
+
+    async def claim_next(self, worker_id: str, lease: float) -> str | None:
+        """
+        Арендовать самую старую незавершённую задачу без действующей аренды:
+        новую или брошенную упавшим воркером. Аренда выставляется условным
+        UPDATE, поэтому одну задачу не захватят два воркера.
+        """
+        now = datetime.utcnow()
+        claimable = (
+            BulkDeactivationJob.status.in_(_ACTIVE_STATUSES),
+            or_(BulkDeactivationJob.lease_until.is_(None), BulkDeactivationJob.lease_until < now),
+        )
+        job_id = (
+            await self.session.execute(
+                select(BulkDeactivationJob.job_id)
+                .where(*claimable)
+                .order_by(BulkDeactivationJob.created_at)
+                .limit(1)
+            )
+        ).scalar_one_or_none()
+        if job_id is None:
+            return None
+
+        result = await self.session.execute(
+            update(BulkDeactivationJob)
+            .where(BulkDeactivationJob.job_id == job_id, *claimable)
+            .values(
+                status="running",
+                locked_by=worker_id,
+                lease_until=now + timedelta(seconds=lease),
+            )
+        )
+        return job_id if result.rowcount == 1 else None
+
+    async def advance(
+        self,
+        job_id: str,
+        worker_id: str,
+        processed_before: int,
+        processed: int,
+        deactivated: int,
+        reassigned: int,
+        errors: list[dict],
+        lease: float,
+    ) -> bool:
+        """
+        Зафиксировать обработанную пачку и продлить аренду.
+        Возвращает False, если аренду перехватил другой воркер или пачку уже
+        учли: тогда транзакцию с пачкой нужно откатить.
+        """
+        result = await self.session.execute(
+            update(BulkDeactivationJob)
+            .where(
+                BulkDeactivationJob.job_id == job_id,
+                BulkDeactivationJob.locked_by == worker_id,
+                BulkDeactivationJob.processed == processed_before,
+            )
+            .values(
+                processed=processed,
+                deactivated_count=BulkDeactivationJob.deactivated_count + deactivated,
+                reassigned_prs_count=BulkDeactivationJob.reassigned_prs_count + reassigned,
+                errors=errors,
+                attempts=0,
+                lease_until=datetime.utcnow() + timedelta(seconds=lease),
+            )
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount == 1
+
+    async def finish(self, job_id: str, worker_id: str, status: str, errors: list[dict]):
+        """Завершить задачу со статусом done или failed и снять аренду."""
+        await self.session.execute(
+            update(BulkDeactivationJob)
+            .where(
+                BulkDeactivationJob.job_id == job_id,
+                BulkDeactivationJob.locked_by == worker_id,
+            )
+            .values(
+                status=status,
+                errors=errors,
+                locked_by=None,
+                lease_until=None,
+                finished_at=datetime.utcnow(),
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+    async def retry_later(
+        self, job_id: str, worker_id: str, errors: list[dict], delay: float, max_attempts: int
+    ) -> str | None:
+        """
+        Учесть неудачную попытку пачки и снять аренду: задача вернётся в очередь
+        через delay секунд, а после max_attempts попыток подряд завершится
+        со статусом failed. Возвращает новый статус или None, если аренду
+        перехватил другой воркер.
+        """
+        now = datetime.utcnow()
+        exhausted = BulkDeactivationJob.attempts + 1 >= max_attempts
+        return (
+            await self.session.execute(
+                update(BulkDeactivationJob)
+                .where(
+                    BulkDeactivationJob.job_id == job_id,
+                    BulkDeactivationJob.locked_by == worker_id,
+                )
+                .values(
+                    status=case((exhausted, "failed"), else_="pending"),
+                    attempts=BulkDeactivationJob.attempts + 1,
+                    errors=errors,
+                    locked_by=None,
+                    lease_until=case((exhausted, None), else_=now + timedelta(seconds=delay)),
+                    finished_at=case((exhausted, now), else_=None),
+                )
+                .returning(BulkDeactivationJob.status)
+                .execution_options(synchronize_session=False)
+            )
+        ).scalar_one_or_none()
@@ -2,12 +2,13 @@
 
 from datetime import datetime
 
-from sqlalchemy import select
+from sqlalchemy import bindparam, delete, insert, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from app.db.models import PullRequest, User, pr_reviewers
 from app.db.repositories.base import BaseRepository
+from app.db.repositories.stats_repository import StatsRepository
 
 
 class PRRepository(BaseRepository[PullRequest]):
@@ -15,25 +16,51 @@ class PRRepository(BaseRepository[PullRequest]):
 
     def __init__(self, session: AsyncSession):
         super().__init__(PullRequest, session)
+        self.stats_repo = StatsRepository(session)
 
     async def get_by_id(
-        self, pr_id: str, load_author: bool = False, load_reviewers: bool = False
+        self,
+        pr_id: str,
+        load_author: bool = False,
+        load_reviewers: bool = False,
+        for_update: bool = False,
     ) -> PullRequest | None:
-        """Получить PR по ID."""
+        """
+        Получить PR по ID. for_update — заблокировать строку PR до конца
+        транзакции (SELECT ... FOR UPDATE) и перечитать PR и его ревьюверов,
+        даже если они уже загружены в сессию: изменения состава ревьюверов
+        одного PR выполняются по очереди и видят актуальные статус и ревьюверов.
+        """
         query = select(PullRequest).where(PullRequest.pull_request_id == pr_id)
         if load_author:
             query = query.options(selectinload(PullRequest.author))
         if load_reviewers:
             query = query.options(selectinload(PullRequest.reviewers))
+        if for_update:
+            query = query.with_for_update(of=PullRequest).execution_options(populate_existing=True)
         result = await self.session.execute(query)
         return result.scalar_one_or_none()
 
-    async def exists(self, pr_id: str) -> bool:
-        """Проверить существование PR."""
-        result = await self.session.execute(
-            select(PullRequest.pull_request_id).where(PullRequest.pull_request_id == pr_id)
-        )
-        return result.scalar_one_or_none() is not None
+    async def get_author_context(self, pr_id: str, author_id: str) -> tuple[bool, str | None]:
+        """
+        Одним запросом: есть ли уже PR с таким ID и команда автора
+        (None, если автора нет).
+        """
+        row = (
+            await self.session.execute(
+                select(
+                    select(PullRequest.pull_request_id)
+                    .where(PullRequest.pull_request_id == pr_id)
+                    .exists()
+                    .label("pr_exists"),
+                    select(User.team_name)
+                    .where(User.user_id == author_id)
+                    .scalar_subquery()
+                    .label("team_name"),
+                )
+            )
+        ).one()
+        return bool(row.pr_exists), row.team_name
 
     async def create_with_reviewers(
         self,
@@ -41,65 +68,147 @@ class PRRepository(BaseRepository[PullRequest]):
         pr_name: str,
         author_id: str,
         reviewer_ids: list[str],
-    ) -> PullRequest:
-        """Создать PR с ревьюверами."""
-        pr = PullRequest(
-            pull_request_id=pr_id,
-            pull_request_name=pr_name,
-            author_id=author_id,
-            status="OPEN",
-            created_at=datetime.utcnow(),
+        reviewers_team: str | None = None,
+    ) -> datetime | None:
+        """
+        Создать открытый PR с ревьюверами без чтения обратно: INSERT ... ON CONFLICT
+        DO NOTHING RETURNING и одна вставка ревьюверов. Возвращает дату создания
+        или None, если PR с таким ID уже есть. reviewers_team — команда
+        ревьюверов, если известна: тогда она не читается для дневных агрегатов.
+        """
+        created_at = datetime.utcnow()
+        inserted = await self.session.execute(
+            self._upsert_insert(PullRequest)
+            .values(
+                pull_request_id=pr_id,
+                pull_request_name=pr_name,
+                author_id=author_id,
+                status="OPEN",
+                created_at=created_at,
+            )
+            .on_conflict_do_nothing(index_elements=[PullRequest.pull_request_id])
+            .returning(PullRequest.pull_request_id)
         )
-        self.session.add(pr)
-        await self.session.flush()
+        if inserted.scalar_one_or_none() is None:
+            return None
 
         if reviewer_ids:
-            from sqlalchemy import insert
+            await self.session.execute(
+                insert(pr_reviewers).values(
+                    [{"pr_id": pr_id, "reviewer_id": reviewer_id} for reviewer_id in reviewer_ids]
+                )
+            )
 
-            values = [{"pr_id": pr_id, "reviewer_id": reviewer_id} for reviewer_id in reviewer_ids]
-            await self.session.execute(insert(pr_reviewers).values(values))
-            await self.session.flush()
+        await self.stats_repo.pr_created(reviewer_ids, reviewers_team)
+        return created_at
 
-            await self.session.refresh(pr, ["reviewers"])
+    async def get_existing_ids(self, pr_ids: list[str]) -> set[str]:
+        """ID из pr_ids, для которых PR уже есть."""
+        existing: set[str] = set()
+        for ids_filter in self._id_filters(PullRequest.pull_request_id, pr_ids):
+            result = await self.session.execute(
+                select(PullRequest.pull_request_id).where(ids_filter)
+            )
+            existing.update(result.scalars().all())
+        return existing
 
-        return pr
+    async def create_many(
+        self, prs: list[tuple[str, str, str, list[str]]], reviewer_teams: dict[str, str]
+    ) -> dict[str, datetime]:
+        """
+        Создать пачку открытых PR: INSERT ... ON CONFLICT DO NOTHING RETURNING
+        executemany (SQLAlchemy сам собирает из строк многострочные VALUES в
+        пределах лимита параметров драйвера), одна вставка ревьюверов и по
+        одному обновлению каждой группы счётчиков. prs — четвёрки (pr_id,
+        pr_name, author_id, reviewer_ids), reviewer_teams — команды ревьюверов.
+        Возвращает даты создания вставленных PR; PR, уже существующие в БД,
+        пропускаются.
+        """
+        if not prs:
+            return {}
 
-    async def merge(self, pr_id: str) -> PullRequest | None:
-        """Пометить PR как MERGED (идемпотентная операция)."""
-        pr = await self.get_by_id(pr_id, load_author=True, load_reviewers=True)
-        if not pr:
-            return None
+        created_at = datetime.utcnow()
+        result = await self.session.execute(
+            self._upsert_insert(PullRequest.__table__)
+            .on_conflict_do_nothing(index_elements=["pull_request_id"])
+            .returning(PullRequest.__table__.c.pull_request_id),
+            [
+                {
+                    "pull_request_id": pr_id,
+                    "pull_request_name": pr_name,
+                    "author_id": author_id,
+                    "status": "OPEN",
+                    "created_at": created_at,
+                }
+                for pr_id, pr_name, author_id, _ in prs
+            ],
+        )
+        inserted = set(result.scalars().all())
+        created = [pr for pr in prs if pr[0] in inserted]
 
-        if pr.status == "MERGED":
-            return pr
+        reviewer_rows = [
+            {"pr_id": pr_id, "reviewer_id": reviewer_id}
+            for pr_id, _, _, reviewer_ids in created
+            for reviewer_id in reviewer_ids
+        ]
+        if reviewer_rows:
+            await self.session.execute(insert(pr_reviewers), reviewer_rows)
 
-        pr.status = "MERGED"
-        pr.merged_at = datetime.utcnow()
-        await self.session.flush()
+        await self.stats_repo.prs_created(
+            [reviewer_ids for *_, reviewer_ids in created], reviewer_teams
+        )
+        return dict.fromkeys(inserted, created_at)
+
+    async def merge(self, pr_id: str) -> PullRequest | None:
+        """
+        Пометить PR как MERGED (идемпотентная операция).
+        Статус меняется условным UPDATE ... WHERE status = 'OPEN': из параллельных
+        merge одного PR строку меняет только один, и только он обновляет счётчики.
+        """
+        result = await self.session.execute(
+            update(PullRequest)
+            .where(PullRequest.pull_request_id == pr_id, PullRequest.status == "OPEN")
+            .values(status="MERGED", merged_at=datetime.utcnow())
+            .returning(PullRequest.pull_request_id)
+            .execution_options(synchronize_session=False)
+        )
+        merged = result.scalar_one_or_none() is not None
 
+        pr = await self.get_by_id(pr_id, load_author=True, load_reviewers=True, for_update=True)
+        if pr and merged:
+            await self.stats_repo.pr_merged([r.user_id for r in pr.reviewers])
         return pr
 
     async def remove_reviewer(self, pr_id: str, reviewer_id: str) -> PullRequest | None:
         """
         Удалить ревьювера из PR.
         Возвращает обновлённый PR или None, если PR не найден.
+        Строка PR блокируется, поэтому счётчики меняются, только если ревьювер
+        действительно был назначен в момент удаления.
         """
-        pr = await self.get_by_id(pr_id, load_reviewers=True)
+        pr = await self.get_by_id(pr_id, load_reviewers=True, for_update=True)
         if not pr:
             return None
 
         reviewer = next((r for r in pr.reviewers if r.user_id == reviewer_id), None)
         if reviewer:
+            reviewers_before = len(pr.reviewers)
             pr.reviewers.remove(reviewer)
             await self.session.flush()
+            await self.stats_repo.reviewer_removed(
+                reviewer_id, reviewers_before, pr.status == "OPEN"
+            )
 
         return pr
 
     async def reassign_reviewer(
         self, pr_id: str, old_reviewer_id: str, new_reviewer_id: str
     ) -> PullRequest | None:
-        """Переназначить ревьювера."""
-        pr = await self.get_by_id(pr_id, load_reviewers=True)
+        """
+        Переназначить ревьювера. Строка PR блокируется, поэтому параллельные
+        переназначения и merge того же PR не учитываются в счётчиках дважды.
+        """
+        pr = await self.get_by_id(pr_id, load_reviewers=True, for_update=True)
         if not pr:
             return None
 
@@ -117,18 +226,140 @@ class PRRepository(BaseRepository[PullRequest]):
         pr.reviewers.remove(old_reviewer)
         pr.reviewers.append(new_reviewer)
         await self.session.flush()
+        await self.stats_repo.reviewer_replaced(
+            old_reviewer_id, new_reviewer_id, pr.status == "OPEN"
+        )
 
         return pr
 
-    async def get_all_open_prs_with_reviewers(self) -> list[PullRequest]:
-        """Получить все открытые PR с ревьюверами."""
-        query = (
-            select(PullRequest)
-            .where(PullRequest.status == "OPEN")
-            .options(selectinload(PullRequest.reviewers))
+    async def get_open_review_assignments(
+        self, reviewer_ids: list[str]
+    ) -> dict[str, tuple[str, list[str]]]:
+        """
+        Открытые PR, где ревьювером назначен кто-то из reviewer_ids, одним запросом
+        на кусок ID (см. _id_filters): {pr_id: (author_id, [reviewer_id, ...])}
+        со всеми ревьюверами PR.
+        Строки найденных PR блокируются до конца транзакции, как в get_by_id
+        с for_update: параллельные merge и замены ревьюверов этих PR ждут
+        применения плана. Ревьюверы читаются отдельным запросом уже после
+        блокировки, чтобы видеть изменения, закоммиченные до неё.
+        """
+        assignments: dict[str, tuple[str, list[str]]] = {}
+        for ids_filter in self._id_filters(pr_reviewers.c.reviewer_id, reviewer_ids):
+            affected = select(pr_reviewers.c.pr_id).where(ids_filter).scalar_subquery()
+            locked = set(
+                (
+                    await self.session.execute(
+                        select(PullRequest.pull_request_id)
+                        .where(
+                            PullRequest.status == "OPEN",
+                            PullRequest.pull_request_id.in_(affected),
+                        )
+                        .order_by(PullRequest.pull_request_id)
+                        .with_for_update(of=PullRequest)
+                    )
+                ).scalars()
+            )
+            if not locked:
+                continue
+            query = (
+                select(
+                    PullRequest.pull_request_id, PullRequest.author_id, pr_reviewers.c.reviewer_id
+                )
+                .join(pr_reviewers, pr_reviewers.c.pr_id == PullRequest.pull_request_id)
+                .where(PullRequest.status == "OPEN", PullRequest.pull_request_id.in_(affected))
+                .order_by(PullRequest.pull_request_id, pr_reviewers.c.reviewer_id)
+            )
+            chunk: dict[str, tuple[str, list[str]]] = {}
+            for pr_id, author_id, reviewer_id in (await self.session.execute(query)).all():
+                # PR, созданные после блокировки, в план не попадают
+                if pr_id not in locked:
+                    continue
+                chunk.setdefault(pr_id, (author_id, []))[1].append(reviewer_id)
+            # PR с ревьюверами из разных кусков приходит целиком в каждом из них
+            assignments.update(chunk)
+        return assignments
+
+    async def apply_reviewer_changes(
+        self, changes: list[tuple[str, str, str | None]], reviewers_before: dict[str, int]
+    ):
+        """
+        Применить пачку замен и снятий ревьюверов в открытых PR: одно удаление,
+        одна вставка и по одному обновлению счётчиков статистики.
+        changes — тройки (pr_id, old_reviewer_id, new_reviewer_id или None).
+        """
+        if not changes:
+            return
+
+        # executemany вместо IN по парам: не больше двух параметров на запрос
+        await self.session.execute(
+            delete(pr_reviewers).where(
+                pr_reviewers.c.pr_id == bindparam("old_pr_id"),
+                pr_reviewers.c.reviewer_id == bindparam("old_reviewer_id"),
+            ),
+            [{"old_pr_id": pr_id, "old_reviewer_id": old_id} for pr_id, old_id, _ in changes],
         )
-        result = await self.session.execute(query)
-        return list(result.scalars().all())
+        added = [
+            {"pr_id": pr_id, "reviewer_id": new_id}
+            for pr_id, _, new_id in changes
+            if new_id is not None
+        ]
+        if added:
+            await self.session.execute(insert(pr_reviewers), added)
+        await self.stats_repo.reviewers_changed(changes, reviewers_before)
+
+        # Загруженные в сессию коллекции ревьюверов этих PR устарели
+        changed = {pr_id for pr_id, _, _ in changes}
+        for obj in list(self.session.identity_map.values()):
+            if isinstance(obj, PullRequest) and obj.pull_request_id in changed:
+                self.session.expire(obj, ["reviewers"])
+
+    async def remove_team_reviews(self, team_name: str) -> int:
+        """
+        Снять участников команды со всех открытых PR одним удалением по команде
+        и обновить счётчики статистики. Возвращает число снятых ревью.
+        Открытые PR с ревьюверами команды сначала блокируются, как в
+        get_open_review_assignments, а счётчики считаются по строкам, которые
+        удаление действительно вернуло (DELETE ... RETURNING).
+        """
+        members = select(User.user_id).where(User.team_name == team_name)
+        # EXISTS, а не второй IN: иначе SQLite перебирает все пары двух списков
+        is_open = (
+            select(PullRequest.pull_request_id)
+            .where(
+                PullRequest.pull_request_id == pr_reviewers.c.pr_id,
+                PullRequest.status == "OPEN",
+            )
+            .exists()
+        )
+        await self.session.execute(
+            select(PullRequest.pull_request_id)
+            .where(
+                PullRequest.status == "OPEN",
+                select(pr_reviewers.c.pr_id)
+                .where(
+                    pr_reviewers.c.pr_id == PullRequest.pull_request_id,
+                    pr_reviewers.c.reviewer_id.in_(members),
+                )
+                .exists(),
+            )
+            .order_by(PullRequest.pull_request_id)
+            .with_for_update(of=PullRequest)
+        )
+        removed = (
+            await self.session.execute(
+                delete(pr_reviewers)
+                .where(pr_reviewers.c.reviewer_id.in_(members), is_open)
+                .returning(pr_reviewers.c.pr_id, pr_reviewers.c.reviewer_id)
+            )
+        ).all()
+        await self.stats_repo.team_reviews_removed(team_name, removed)
+
+        # Загруженные в сессию коллекции ревьюверов открытых PR могли устареть
+        for obj in list(self.session.identity_map.values()):
+            if isinstance(obj, PullRequest) and obj.status == "OPEN":
+                self.session.expire(obj, ["reviewers"])
+        return len(removed)
 
     async def get_stats(self) -> dict:
         """Получить статистику по PR."""
@@ -0,0 +1,555 @@
+"""Репозиторий счётчиков статистики."""
+
+import random
+from collections import Counter
+from collections.abc import AsyncIterator, Sequence
+from datetime import date, datetime
+
+from sqlalchemy import (
+    Select,
+    bindparam,
+    case,
+    delete,
+    func,
+    literal,
+    select,
+    text,
+    true,
+    union_all,
+    update,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.models import (
+    PRStatsCounter,
+    PullRequest,
+    ReviewDailyRollup,
+    User,
+    UserReviewCounter,
+    pr_reviewers,
+)
+from app.db.repositories.base import BaseRepository
+
+PR_COUNTERS = (
+    "total_prs",
+    "open_prs",
+    "merged_prs",
+    "prs_with_0_reviewers",
+    "prs_with_1_reviewer",
+    "prs_with_2_reviewers",
+)
+
+_REVIEWER_BUCKETS = {
+    0: "prs_with_0_reviewers",
+    1: "prs_with_1_reviewer",
+    2: "prs_with_2_reviewers",
+}
+
+
+class StatsRepository(BaseRepository[UserReviewCounter]):
+    """
+    Репозиторий счётчиков статистики.
+    Счётчики и дневные агрегаты обновляются в той же транзакции, что и PR,
+    методами pr_* / reviewer_*, которые вызывает PRRepository, а при переходе
+    ревьюверов в другую команду — reviewers_moved; rebuild и rebuild_rollups
+    пересчитывают их с нуля.
+    """
+
+    def __init__(self, session: AsyncSession):
+        super().__init__(UserReviewCounter, session)
+
+    async def pr_created(self, reviewer_ids: list[str], team_name: str | None = None):
+        """Учесть новый открытый PR; team_name — команда ревьюверов, если известна."""
+        await self._add_pr_counters(
+            {"total_prs": 1, "open_prs": 1, _REVIEWER_BUCKETS.get(len(reviewer_ids)): 1}
+        )
+        await self._add_user_counters({uid: (1, 1) for uid in reviewer_ids})
+        await self._add_rollups(
+            {uid: (1, 0, 1) for uid in reviewer_ids},
+            dict.fromkeys(reviewer_ids, team_name) if team_name else None,
+        )
+
+    async def prs_created(self, reviewers_by_pr: list[list[str]], teams: dict[str, str]):
+        """
+        Учесть пачку новых открытых PR одним обновлением каждой группы счётчиков.
+        reviewers_by_pr — ревьюверы каждого PR, teams — команды ревьюверов.
+        """
+        if not reviewers_by_pr:
+            return
+
+        pr_deltas: dict[str | None, int] = {
+            "total_prs": len(reviewers_by_pr),
+            "open_prs": len(reviewers_by_pr),
+        }
+        reviews: dict[str, int] = {}
+        for reviewer_ids in reviewers_by_pr:
+            bucket = _REVIEWER_BUCKETS.get(len(reviewer_ids))
+            pr_deltas[bucket] = pr_deltas.get(bucket, 0) + 1
+            for uid in reviewer_ids:
+                reviews[uid] = reviews.get(uid, 0) + 1
+
+        await self._add_pr_counters(pr_deltas)
+        await self._add_user_counters({uid: (n, n) for uid, n in reviews.items()})
+        await self._add_rollups({uid: (n, 0, n) for uid, n in reviews.items()}, teams)
+
+    async def pr_merged(self, reviewer_ids: list[str]):
+        """Учесть переход PR из OPEN в MERGED."""
+        await self._add_pr_counters({"open_prs": -1, "merged_prs": 1})
+        await self._add_user_counters({uid: (0, -1) for uid in reviewer_ids})
+        await self._add_rollups({uid: (0, 1, -1) for uid in reviewer_ids})
+
+    async def reviewer_replaced(self, old_reviewer_id: str, new_reviewer_id: str, is_open: bool):
+        """Учесть замену ревьювера; число ревьюверов PR не меняется."""
+        await self._add_user_counters(
+            {old_reviewer_id: (-1, -int(is_open)), new_reviewer_id: (1, int(is_open))}
+        )
+        await self._add_rollups(
+            {old_reviewer_id: (0, 0, -int(is_open)), new_reviewer_id: (1, 0, int(is_open))}
+        )
+
+    async def reviewer_removed(self, reviewer_id: str, reviewers_before: int, is_open: bool):
+        """Учесть снятие ревьювера без замены."""
+        await self._add_pr_counters(
+            {
+                _REVIEWER_BUCKETS.get(reviewers_before): -1,
+                _REVIEWER_BUCKETS.get(reviewers_before - 1): 1,
+            }
+        )
+        await self._add_user_counters({reviewer_id: (-1, -int(is_open))})
+        await self._add_rollups({reviewer_id: (0, 0, -int(is_open))})
+
+    async def reviewers_changed(
+        self, changes: list[tuple[str, str, str | None]], reviewers_before: dict[str, int]
+    ):
+        """
+        Учесть пачку замен и снятий ревьюверов в открытых PR одним обновлением
+        каждой группы счётчиков. changes — тройки (pr_id, old_reviewer_id,
+        new_reviewer_id или None), reviewers_before — число ревьюверов PR до пачки.
+        """
+        user_deltas: dict[str, tuple[int, int]] = {}
+        rollup_deltas: dict[str, tuple[int, int, int]] = {}
+        reviewers_after = dict(reviewers_before)
+
+        def add(deltas: dict, user_id: str, delta: tuple):
+            deltas[user_id] = tuple(
+                a + b for a, b in zip(deltas.get(user_id, (0,) * len(delta)), delta, strict=True)
+            )
+
+        for pr_id, old_reviewer_id, new_reviewer_id in changes:
+            add(user_deltas, old_reviewer_id, (-1, -1))
+            add(rollup_deltas, old_reviewer_id, (0, 0, -1))
+            if new_reviewer_id is None:
+                reviewers_after[pr_id] -= 1
+            else:
+                add(user_deltas, new_reviewer_id, (1, 1))
+                add(rollup_deltas, new_reviewer_id, (1, 0, 1))
+
+        bucket_deltas: dict[str | None, int] = {}
+        for pr_id, before in reviewers_before.items():
+            after = reviewers_after[pr_id]
+            if after != before:
+                for bucket, delta in ((before, -1), (after, 1)):
+                    name = _REVIEWER_BUCKETS.get(bucket)
+                    bucket_deltas[name] = bucket_deltas.get(name, 0) + delta
+
+        await self._add_pr_counters(bucket_deltas)
+        await self._add_user_counters(user_deltas)
+        await self._add_rollups(rollup_deltas)
+
+    async def team_reviews_removed(self, team_name: str, removed: Sequence[tuple[str, str]]):
+        """
+        Учесть снятие открытых ревью участников команды; вызывается после
+        удаления строк из pr_reviewers. removed — удалённые пары
+        (pr_id, reviewer_id), поэтому счётчики меняются ровно на снятые ревью.
+        Число оставшихся ревьюверов PR читается одним запросом на кусок ID.
+        """
+        if not removed:
+            return
+
+        per_reviewer = Counter(reviewer_id for _, reviewer_id in removed)
+        per_pr = Counter(pr_id for pr_id, _ in removed)
+        remaining: dict[str, int] = {}
+        for ids_filter in self._id_filters(pr_reviewers.c.pr_id, per_pr):
+            result = await self.session.execute(
+                select(pr_reviewers.c.pr_id, func.count())
+                .where(ids_filter)
+                .group_by(pr_reviewers.c.pr_id)
+            )
+            remaining.update(result.tuples().all())
+
+        bucket_deltas: dict[str | None, int] = {}
+        for pr_id, count in per_pr.items():
+            after = remaining.get(pr_id, 0)
+            for bucket, delta in ((after + count, -1), (after, 1)):
+                name = _REVIEWER_BUCKETS.get(bucket)
+                bucket_deltas[name] = bucket_deltas.get(name, 0) + delta
+
+        await self._add_pr_counters(bucket_deltas)
+        await self._add_user_counters({uid: (-n, -n) for uid, n in per_reviewer.items()})
+        await self._add_rollups(
+            {uid: (0, 0, -n) for uid, n in per_reviewer.items()},
+            teams=dict.fromkeys(per_reviewer, team_name),
+        )
+
+    async def reviewers_moved(self, moves: dict[str, tuple[str, str]]):
+        """
+        Перенести открытые ревью пользователей, перешедших в другую команду,
+        из агрегатов старой команды в агрегаты новой. Снятие ревью относится к
+        текущей команде ревьювера, поэтому без переноса старая команда навсегда
+        держала бы эти ревью открытыми, а новая уходила бы в минус.
+        moves — {user_id: (старая команда, новая команда)}.
+        """
+        open_reviews: dict[str, int] = {}
+        for ids_filter in self._id_filters(UserReviewCounter.user_id, list(moves)):
+            result = await self.session.execute(
+                select(UserReviewCounter.user_id, UserReviewCounter.open_reviews).where(
+                    ids_filter, UserReviewCounter.open_reviews != 0
+                )
+            )
+            open_reviews.update(result.tuples().all())
+
+        today = datetime.utcnow().date()
+        rows = [
+            {
+                "team_name": team_name,
+                "day": today,
+                "reviewer_id": uid,
+                "assigned": 0,
+                "merged": 0,
+                "open_delta": sign * count,
+            }
+            for uid, count in sorted(open_reviews.items())
+            for team_name, sign in zip(moves[uid], (-1, 1), strict=True)
+        ]
+        await self._upsert_rollups(rows)
+
+    async def get_stats(self) -> tuple[list[dict], dict]:
+        """
+        Статистика ревью по пользователям и глобальная статистика PR одним запросом.
+        Сводка PR считается в CTE из одной строки и присоединяется к каждому
+        пользователю, поэтому присутствует в результате даже без пользователей.
+        """
+        summary = select(
+            *(
+                func.coalesce(
+                    func.sum(case((PRStatsCounter.name == name, PRStatsCounter.value), else_=0)),
+                    0,
+                ).label(name)
+                for name in PR_COUNTERS
+            )
+        ).cte("pr_summary")
+
+        query = (
+            select(
+                summary,
+                User.user_id,
+                User.username,
+                func.coalesce(UserReviewCounter.total_reviews, 0).label("total_reviews"),
+                func.coalesce(UserReviewCounter.open_reviews, 0).label("open_reviews"),
+            )
+            .select_from(summary)
+            .outerjoin(User, true())
+            .outerjoin(UserReviewCounter, UserReviewCounter.user_id == User.user_id)
+            .order_by(User.user_id)
+        )
+        rows = (await self.session.execute(query)).all()
+
+        pr_stats = {name: int(getattr(rows[0], name)) for name in PR_COUNTERS}
+        user_stats = [_user_stats_row(row) for row in rows if row.user_id is not None]
+        return user_stats, pr_stats
+
+    async def get_active_review_counts(self) -> tuple[list[str], list[int], list[int]]:
+        """Команда, открытые и все ревью активных пользователей — тремя колонками."""
+        result = await self.session.execute(
+            select(
+                User.team_name,
+                func.coalesce(UserReviewCounter.open_reviews, 0),
+                func.coalesce(UserReviewCounter.total_reviews, 0),
+            )
+            .outerjoin(UserReviewCounter, UserReviewCounter.user_id == User.user_id)
+            .where(User.is_active == True)  # noqa: E712
+        )
+        rows = result.all()
+        if not rows:
+            return [], [], []
+        team_names, open_reviews, total_reviews = zip(*rows, strict=True)
+        return list(team_names), list(open_reviews), list(total_reviews)
+
+    async def get_user_stats_page(self, after: str | None, limit: int) -> list[dict]:
+        """Страница статистики пользователей по ключу: user_id > after в порядке user_id."""
+        query = self._user_stats_query().limit(limit)
+        if after is not None:
+            query = query.where(User.user_id > after)
+        result = await self.session.execute(query)
+        return [_user_stats_row(row) for row in result.all()]
+
+    async def stream_user_stats(self, batch_size: int) -> AsyncIterator[list[dict]]:
+        """
+        Статистика всех пользователей пачками по batch_size строк.
+        Строки читаются серверным курсором, в памяти держится только текущая пачка.
+        """
+        result = await self.session.stream(
+            self._user_stats_query().execution_options(yield_per=batch_size)
+        )
+        async for rows in result.partitions():
+            yield [_user_stats_row(row) for row in rows]
+
+    async def rebuild(self) -> dict:
+        """
+        Пересчитать все счётчики с нуля по pull_requests и pr_reviewers.
+        На PostgreSQL таблицы PR блокируются от записи до конца транзакции,
+        чтобы параллельные изменения не потерялись между пересчётом и вставкой.
+        """
+        from app.db.repositories.pr_repository import PRRepository
+
+        if self._dialect() == "postgresql":
+            await self.session.execute(text("LOCK TABLE pull_requests, pr_reviewers IN SHARE MODE"))
+
+        await self.session.execute(delete(UserReviewCounter))
+        await self.session.execute(delete(PRStatsCounter))
+
+        review_stats = (
+            select(
+                pr_reviewers.c.reviewer_id,
+                func.count(pr_reviewers.c.pr_id),
+                func.sum(case((PullRequest.status == "OPEN", 1), else_=0)),
+            )
+            .join(PullRequest, pr_reviewers.c.pr_id == PullRequest.pull_request_id)
+            .group_by(pr_reviewers.c.reviewer_id)
+        )
+        await self.session.execute(
+            UserReviewCounter.__table__.insert().from_select(
+                ["user_id", "total_reviews", "open_reviews"], review_stats
+            )
+        )
+
+        pr_stats = await PRRepository(self.session).get_stats()
+        await self.session.execute(
+            PRStatsCounter.__table__.insert(),
+            [{"name": name, "shard": 0, "value": value} for name, value in pr_stats.items()],
+        )
+        await self.session.execute(
+            update(User)
+            .values(
+                open_reviews=func.coalesce(
+                    select(UserReviewCounter.open_reviews)
+                    .where(UserReviewCounter.user_id == User.user_id)
+                    .scalar_subquery(),
+                    0,
+                )
+            )
+            .execution_options(synchronize_session=False)
+        )
+        await self.session.flush()
+        return pr_stats
+
+    async def get_team_rollups(
+        self, team_name: str, day_from: date, day_to: date
+    ) -> tuple[dict[str, int], list]:
+        """
+        Дневные агрегаты команды за интервал и число открытых ревью каждого
+        ревьювера на начало интервала. Читаются только строки агрегатов команды.
+        """
+        opening = await self.session.execute(
+            select(ReviewDailyRollup.reviewer_id, func.sum(ReviewDailyRollup.open_delta))
+            .where(ReviewDailyRollup.team_name == team_name, ReviewDailyRollup.day < day_from)
+            .group_by(ReviewDailyRollup.reviewer_id)
+        )
+        rows = await self.session.execute(
+            select(
+                ReviewDailyRollup.day,
+                ReviewDailyRollup.reviewer_id,
+                ReviewDailyRollup.assigned,
+                ReviewDailyRollup.merged,
+                ReviewDailyRollup.open_delta,
+            )
+            .where(
+                ReviewDailyRollup.team_name == team_name,
+                ReviewDailyRollup.day.between(day_from, day_to),
+            )
+            .order_by(ReviewDailyRollup.day, ReviewDailyRollup.reviewer_id)
+        )
+        return {uid: int(value) for uid, value in opening.all()}, list(rows.all())
+
+    async def rebuild_rollups(self):
+        """
+        Пересчитать дневные агрегаты по pull_requests и pr_reviewers.
+        История переназначений не хранится, поэтому ревью считается назначенным
+        в день создания PR, а команда — текущая команда ревьювера.
+        """
+        await self.session.execute(delete(ReviewDailyRollup))
+
+        events = union_all(
+            select(
+                func.date(PullRequest.created_at).label("day"),
+                pr_reviewers.c.reviewer_id.label("reviewer_id"),
+                literal(1).label("assigned"),
+                literal(0).label("merged"),
+                literal(1).label("open_delta"),
+            ).join(PullRequest, pr_reviewers.c.pr_id == PullRequest.pull_request_id),
+            select(
+                func.date(PullRequest.merged_at),
+                pr_reviewers.c.reviewer_id,
+                literal(0),
+                literal(1),
+                literal(-1),
+            )
+            .join(PullRequest, pr_reviewers.c.pr_id == PullRequest.pull_request_id)
+            .where(PullRequest.status == "MERGED", PullRequest.merged_at.is_not(None)),
+        ).subquery()
+
+        source = (
+            select(
+                User.team_name,
+                events.c.day,
+                events.c.reviewer_id,
+                func.sum(events.c.assigned),
+                func.sum(events.c.merged),
+                func.sum(events.c.open_delta),
+            )
+            .join(User, User.user_id == events.c.reviewer_id)
+            .group_by(User.team_name, events.c.day, events.c.reviewer_id)
+        )
+        await self.session.execute(
+            ReviewDailyRollup.__table__.insert().from_select(
+                ["team_name", "day", "reviewer_id", "assigned", "merged", "open_delta"], source
+            )
+        )
+        await self.session.flush()
+
+    async def _add_pr_counters(self, deltas: dict[str | None, int]):
+        """Прибавить значения к глобальным счётчикам в случайном шарде."""
+        shard = random.randrange(max(settings.STATS_COUNTER_SHARDS, 1))
+        rows = [
+            {"name": name, "shard": shard, "value": delta}
+            for name, delta in sorted(deltas.items(), key=lambda item: item[0] or "")
+            if name and delta
+        ]
+        if not rows:
+            return
+
+        stmt = self._upsert_insert(PRStatsCounter).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[PRStatsCounter.name, PRStatsCounter.shard],
+            set_={"value": PRStatsCounter.value + stmt.excluded.value},
+        )
+        await self.session.execute(stmt)
+
+    async def _add_user_counters(self, deltas: dict[str, tuple[int, int]]):
+        """
+        Прибавить (total, open) к счётчикам пользователей и open к users.open_reviews.
+        Строки обновляются в порядке user_id, чтобы транзакции не взаимоблокировались.
+        Оба запроса выполняются executemany со своими параметрами на каждую строку,
+        а не одним запросом с VALUES/CASE на всех: число параметров запроса и время
+        его разбора не растут с числом пользователей.
+        """
+        rows = [
+            {"user_id": uid, "total_reviews": total, "open_reviews": open_}
+            for uid, (total, open_) in sorted(deltas.items())
+            if total or open_
+        ]
+        if not rows:
+            return
+
+        stmt = self._upsert_insert(UserReviewCounter)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[UserReviewCounter.user_id],
+            set_={
+                "total_reviews": UserReviewCounter.total_reviews + stmt.excluded.total_reviews,
+                "open_reviews": UserReviewCounter.open_reviews + stmt.excluded.open_reviews,
+            },
+        )
+        await self.session.execute(stmt, rows)
+
+        open_rows = [
+            {"delta_user_id": row["user_id"], "delta": row["open_reviews"]}
+            for row in rows
+            if row["open_reviews"]
+        ]
+        if open_rows:
+            users = User.__table__
+            await self.session.execute(
+                update(users)
+                .where(users.c.user_id == bindparam("delta_user_id"))
+                .values(open_reviews=users.c.open_reviews + bindparam("delta")),
+                open_rows,
+            )
+
+    async def _add_rollups(
+        self, deltas: dict[str, tuple[int, int, int]], teams: dict[str, str] | None = None
+    ):
+        """
+        Прибавить (assigned, merged, open_delta) к агрегатам текущего дня.
+        Команды пользователей берутся из teams, если вызывающий их уже знает,
+        иначе читаются одним запросом на кусок ID; агрегаты обновляются executemany.
+        """
+        deltas = {uid: delta for uid, delta in sorted(deltas.items()) if any(delta)}
+        if not deltas:
+            return
+
+        if teams is None:
+            teams = {}
+            for ids_filter in self._id_filters(User.user_id, deltas):
+                result = await self.session.execute(
+                    select(User.user_id, User.team_name).where(ids_filter)
+                )
+                teams.update(result.tuples().all())
+
+        today = datetime.utcnow().date()
+        rows = [
+            {
+                "team_name": teams[uid],
+                "day": today,
+                "reviewer_id": uid,
+                "assigned": assigned,
+                "merged": merged,
+                "open_delta": open_delta,
+            }
+            for uid, (assigned, merged, open_delta) in deltas.items()
+            if uid in teams
+        ]
+        await self._upsert_rollups(rows)
+
+    async def _upsert_rollups(self, rows: list[dict]):
+        """Прибавить строки к агрегатам (team_name, day, reviewer_id) executemany."""
+        if not rows:
+            return
+
+        stmt = self._upsert_insert(ReviewDailyRollup)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[
+                ReviewDailyRollup.team_name,
+                ReviewDailyRollup.day,
+                ReviewDailyRollup.reviewer_id,
+            ],
+            set_={
+                "assigned": ReviewDailyRollup.assigned + stmt.excluded.assigned,
+                "merged": ReviewDailyRollup.merged + stmt.excluded.merged,
+                "open_delta": ReviewDailyRollup.open_delta + stmt.excluded.open_delta,
+            },
+        )
+        await self.session.execute(stmt, rows)
+
+    def _user_stats_query(self) -> Select:
+        return (
+            select(
+                User.user_id,
+                User.username,
+                func.coalesce(UserReviewCounter.total_reviews, 0).label("total_reviews"),
+                func.coalesce(UserReviewCounter.open_reviews, 0).label("open_reviews"),
+            )
+            .outerjoin(UserReviewCounter, UserReviewCounter.user_id == User.user_id)
+            .order_by(User.user_id)
+        )
+
+
+def _user_stats_row(row) -> dict:
+    """Строка статистики пользователя в формате UserStatsSchema."""
+    return {
+        "user_id": row.user_id,
+        "username": row.username,
+        "total_reviews": row.total_reviews,
+        "open_reviews": row.open_reviews,
+        "merged_reviews": row.total_reviews - row.open_reviews,
+    }
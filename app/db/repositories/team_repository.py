@@ -1,10 +1,10 @@
 """Репозиторий для работы с командами."""
 
-from sqlalchemy import select
+from sqlalchemy import and_, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
-from app.db.models import Team
+from app.db.models import PullRequest, Team, User
 from app.db.repositories.base import BaseRepository
 
 
@@ -28,3 +28,19 @@ class TeamRepository(BaseRepository[Team]):
             select(Team.team_name).where(Team.team_name == team_name)
         )
         return result.scalar_one_or_none() is not None
+
+    async def get_most_active_names(self, limit: int) -> list[str]:
+        """Названия команд с наибольшим числом открытых PR их участников."""
+        query = (
+            select(Team.team_name)
+            .outerjoin(User, User.team_name == Team.team_name)
+            .outerjoin(
+                PullRequest,
+                and_(PullRequest.author_id == User.user_id, PullRequest.status == "OPEN"),
+            )
+            .group_by(Team.team_name)
+            .order_by(func.count(PullRequest.pull_request_id).desc(), Team.team_name)
+            .limit(limit)
+        )
+        result = await self.session.execute(query)
+        return list(result.scalars().all())
@@ -1,6 +1,6 @@
 """Репозиторий для работы с пользователями."""
 
-from sqlalchemy import case, func, select, update
+from sqlalchemy import or_, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
@@ -22,21 +22,58 @@ class UserRepository(BaseRepository[User]):
         result = await self.session.execute(query)
         return result.scalar_one_or_none()
 
-    async def get_active_by_team(
-        self, team_name: str, exclude_user_id: str | None = None, limit: int = 2
-    ) -> list[User]:
-        """Получить активных пользователей команды, исключая указанного."""
-        query = select(User).where(
-            User.team_name == team_name,
-            User.is_active == True,  # noqa: E712
-        )
-        if exclude_user_id:
-            query = query.where(User.user_id != exclude_user_id)
+    async def get_active_loads_by_team(
+        self, team_name: str, least_loaded: int | None = None
+    ) -> list[tuple[str, int]]:
+        """
+        Активные пользователи команды парами (user_id, open_reviews) в порядке user_id.
+        С least_loaded — наименее загруженные в порядке возрастания нагрузки: первые
+        least_loaded и все, у кого нагрузка равна нагрузке последнего из них, чтобы
+        стратегия выбирала среди равных случайно, а не по порядку индекса. Порог
+        и выборка идут по индексу (team_name, is_active, open_reviews) без сортировки.
+        """
+        active = (User.team_name == team_name, User.is_active == True)  # noqa: E712
+        query = select(User.user_id, User.open_reviews).where(*active)
+        if least_loaded is None:
+            query = query.order_by(User.user_id)
+        else:
+            cutoff = (
+                select(User.open_reviews)
+                .where(*active)
+                .order_by(User.open_reviews)
+                .offset(least_loaded - 1)
+                .limit(1)
+                .scalar_subquery()
+            )
+            query = query.where(or_(cutoff.is_(None), User.open_reviews <= cutoff)).order_by(
+                User.open_reviews
+            )
 
-        query = query.order_by(func.random())
-        query = query.limit(limit)
         result = await self.session.execute(query)
-        return list(result.scalars().all())
+        return [(row.user_id, row.open_reviews) for row in result.all()]
+
+    async def get_active_loads_by_teams(
+        self, team_names: list[str]
+    ) -> dict[str, list[tuple[str, int]]]:
+        """Активные пользователи нескольких команд одним запросом: {team: [(user_id, open_reviews)]}."""
+        if not team_names:
+            return {}
+        result = await self.session.execute(
+            select(User.team_name, User.user_id, User.open_reviews)
+            .where(User.team_name.in_(team_names), User.is_active == True)  # noqa: E712
+            .order_by(User.team_name, User.user_id)
+        )
+        loads: dict[str, list[tuple[str, int]]] = {name: [] for name in team_names}
+        for row in result.all():
+            loads[row.team_name].append((row.user_id, row.open_reviews))
+        return loads
+
+    async def get_active_members(self) -> list[tuple[str, str]]:
+        """Все активные пользователи парами (team_name, user_id)."""
+        result = await self.session.execute(
+            select(User.team_name, User.user_id).where(User.is_active == True)  # noqa: E712
+        )
+        return [(row.team_name, row.user_id) for row in result.all()]
 
     async def update_active(self, user_id: str, is_active: bool) -> User | None:
         """Обновить флаг активности."""
@@ -48,7 +85,6 @@ class UserRepository(BaseRepository[User]):
 
     async def get_review_prs(self, user_id: str) -> list:
         """Получить PR'ы, где пользователь ревьювер."""
-        from app.db.models import PullRequest, pr_reviewers
 
         query = (
             select(PullRequest)
@@ -59,98 +95,63 @@ class UserRepository(BaseRepository[User]):
         result = await self.session.execute(query)
         return list(result.scalars().all())
 
-    async def get_all_with_stats(self) -> list[dict]:
-        """Получить всех пользователей со статистикой ревью."""
-
-        review_stats = (
-            select(
-                pr_reviewers.c.reviewer_id,
-                func.count(pr_reviewers.c.pr_id).label("total_reviews"),
-                func.sum(case((PullRequest.status == "OPEN", 1), else_=0)).label("open_reviews"),
-            )
-            .join(PullRequest, pr_reviewers.c.pr_id == PullRequest.pull_request_id)
-            .group_by(pr_reviewers.c.reviewer_id)
-            .subquery()
-        )
-
+    async def get_most_loaded_reviewer_ids(self, limit: int) -> list[str]:
+        """
+        ID ревьюверов с наибольшим числом открытых ревью.
+        Нагрузка берётся из денормализованного users.open_reviews, а не
+        агрегацией pr_reviewers по открытым PR.
+        """
         query = (
-            select(
-                User.user_id,
-                User.username,
-                func.coalesce(review_stats.c.total_reviews, 0).label("total_reviews"),
-                func.coalesce(review_stats.c.open_reviews, 0).label("open_reviews"),
-            )
-            .outerjoin(review_stats, User.user_id == review_stats.c.reviewer_id)
-            .order_by(User.user_id)
+            select(User.user_id)
+            .where(User.open_reviews > 0)
+            .order_by(User.open_reviews.desc(), User.user_id)
+            .limit(limit)
         )
-
         result = await self.session.execute(query)
-        return [
-            {
-                "user_id": row.user_id,
-                "username": row.username,
-                "total_reviews": int(row.total_reviews or 0),
-                "open_reviews": int(row.open_reviews or 0),
-                "merged_reviews": int((row.total_reviews or 0) - (row.open_reviews or 0)),
-            }
-            for row in result.all()
-        ]
+        return list(result.scalars().all())
 
     async def bulk_deactivate_by_ids(self, user_ids: list[str]) -> int:
         """Массово деактивировать пользователей по списку ID."""
-        if not user_ids:
-            return 0
+        deactivated = 0
+        for ids_filter in self._id_filters(User.user_id, user_ids):
+            result = await self.session.execute(
+                update(User)
+                .where(ids_filter, User.is_active == True)  # noqa E712
+                .values(is_active=False)
+                .execution_options(synchronize_session="fetch")
+            )
+            deactivated += result.rowcount or 0
+        await self.session.flush()
+        return deactivated
 
+    async def deactivate_team(self, team_name: str) -> list[str]:
+        """
+        Деактивировать всех активных участников команды одним UPDATE по индексу
+        (team_name, is_active). Возвращает ID деактивированных.
+        """
         result = await self.session.execute(
             update(User)
-            .where(User.user_id.in_(user_ids), User.is_active == True)  # noqa E712
+            .where(User.team_name == team_name, User.is_active == True)  # noqa: E712
             .values(is_active=False)
+            .returning(User.user_id)
             .execution_options(synchronize_session="fetch")
         )
-        await self.session.flush()
-        return result.rowcount or 0
+        return list(result.scalars().all())
 
     async def get_users_by_ids(self, user_ids: list[str]) -> list[User]:
         """Получить пользователей по списку ID."""
-        if not user_ids:
-            return []
-        result = await self.session.execute(select(User).where(User.user_id.in_(user_ids)))
-        return list(result.scalars().all())
-
-    async def get_active_candidates_for_pr(
-        self, excluded_user_ids: list[str], current_pr_reviewers_ids: list[str], limit: int = 100
-    ) -> list[User]:
-        """
-        Получить активных кандидатов для ревью PR, исключая заданных пользователей
-        и текущих ревьюверов. Ищет среди ВСЕХ активных пользователей.
-        """
-
-        query = select(User).where(
-            User.is_active == True,  # noqa E712
-            User.user_id.notin_(excluded_user_ids),
-            User.user_id.notin_(current_pr_reviewers_ids),
-        )
-
-        query = query.order_by(func.random())
-        query = query.limit(limit)
-        result = await self.session.execute(query)
-        return list(result.scalars().all())
-
-    async def get_prs_by_reviewer_ids(self, reviewer_ids: list[str]) -> list[PullRequest]:
-        """
-        Получить все открытые PR, где указанные ID являются ревьюверами,
-        и нетерпеливо загрузить их ревьюверов.
-        """
-        if not reviewer_ids:
-            return []
-
-        query = (
-            select(PullRequest)
-            .options(selectinload(PullRequest.reviewers))
-            .join(PullRequest.reviewers)
-            .where(User.user_id.in_(reviewer_ids), PullRequest.status != "MERGED")
-            .distinct()
-        )
-
-        result = await self.session.execute(query)
-        return list(result.scalars().unique().all())
+        users = []
+        for ids_filter in self._id_filters(User.user_id, user_ids):
+            result = await self.session.execute(select(User).where(ids_filter))
+            users += result.scalars().all()
+        return users
+
+    async def get_teams_by_ids(self, user_ids: list[str]) -> dict[str, str]:
+        """Команды пользователей по списку ID: {user_id: team_name}."""
+        teams: dict[str, str] = {}
+        for ids_filter in self._id_filters(User.user_id, user_ids):
+            result = await self.session.execute(
+                select(User.user_id, User.team_name).where(ids_filter)
+            )
+            teams.update(result.tuples().all())
+        return teams
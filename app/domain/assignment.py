@@ -0,0 +1,247 @@
+"""
+Назначение ревьюверов.
+
+Все места, где выбираются ревьюверы (создание PR, ручное переназначение,
+переназначение при деактивации), обращаются к ReviewerAssigner. Он получает
+снимок активных участников команды (Roster) из индекса в памяти или из БД и
+передаёт его стратегии из реестра STRATEGIES; сама стратегия работает только с кортежами в памяти и
+в БД не ходит. Стратегия выбирается настройкой REVIEWER_ASSIGNMENT_STRATEGY,
+новые регистрируются декоратором register_strategy.
+"""
+
+import heapq
+import random
+from bisect import bisect_right
+from collections.abc import Set
+from typing import ClassVar
+
+from app.core.config import settings
+from app.db.repositories.user_repository import UserRepository
+from app.domain.roster import Roster, roster_index, sample_candidate_pool
+
+
+class AssignmentStrategy:
+    """Стратегия выбора ревьюверов из снимка команды."""
+
+    name: ClassVar[str]
+    # Стратегии нужно число открытых ревью: снимок всегда читается из БД
+    needs_load: ClassVar[bool] = False
+    # Стратегии достаточно наименее загруженных участников: снимок читается
+    # окном по индексу (team_name, is_active, open_reviews), а не всей командой
+    by_load: ClassVar[bool] = False
+    # ID в снимке должны идти по возрастанию
+    ordered: ClassVar[bool] = False
+    # Стратегии достаточно случайной выборки из count + len(exclude) участников:
+    # при ROSTER_BACKEND=redis она берётся одной командой SRANDMEMBER
+    sample_only: ClassVar[bool] = False
+
+    def choose(self, roster: Roster, count: int, exclude: Set[str]) -> list[str]:
+        """Выбрать до count разных участников, не входящих в exclude."""
+        raise NotImplementedError
+
+
+STRATEGIES: dict[str, AssignmentStrategy] = {}
+
+
+def register_strategy(cls: type[AssignmentStrategy]) -> type[AssignmentStrategy]:
+    """Зарегистрировать стратегию под её именем."""
+    STRATEGIES[cls.name] = cls()
+    return cls
+
+
+def get_strategy(name: str | None = None) -> AssignmentStrategy:
+    """Стратегия по имени, по умолчанию — из REVIEWER_ASSIGNMENT_STRATEGY."""
+    name = name or settings.REVIEWER_ASSIGNMENT_STRATEGY
+    try:
+        return STRATEGIES[name]
+    except KeyError:
+        raise ValueError(f"Unknown reviewer assignment strategy: {name}") from None
+
+
+@register_strategy
+class RandomStrategy(AssignmentStrategy):
+    """Случайные участники команды."""
+
+    name = "random"
+    sample_only = True
+
+    def choose(self, roster: Roster, count: int, exclude: Set[str]) -> list[str]:
+        user_ids = roster.user_ids
+        # В выборке из count + len(exclude) позиций заведомо хватит не исключённых
+        positions = random.sample(range(len(user_ids)), min(len(user_ids), count + len(exclude)))
+        return [user_ids[i] for i in positions if user_ids[i] not in exclude][:count]
+
+
+@register_strategy
+class RoundRobinStrategy(AssignmentStrategy):
+    """
+    Участники по кругу в порядке user_id, отдельно для каждой команды.
+    Позиция хранится в памяти процесса: у каждого инстанса свой круг.
+    """
+
+    name = "round_robin"
+    ordered = True
+
+    def __init__(self):
+        self._last_assigned: dict[str, str] = {}
+
+    def choose(self, roster: Roster, count: int, exclude: Set[str]) -> list[str]:
+        user_ids = roster.user_ids
+        start = bisect_right(user_ids, self._last_assigned.get(roster.team_name, ""))
+        picked = []
+        for offset in range(len(user_ids)):
+            user_id = user_ids[(start + offset) % len(user_ids)]
+            if user_id in exclude:
+                continue
+            picked.append(user_id)
+            if len(picked) == count:
+                break
+
+        if picked:
+            self._last_assigned[roster.team_name] = picked[-1]
+        return picked
+
+
+@register_strategy
+class LeastLoadedStrategy(AssignmentStrategy):
+    """Участники с наименьшим числом открытых ревью, равные — в случайном порядке."""
+
+    name = "least_loaded"
+    needs_load = True
+    by_load = True
+
+    def choose(self, roster: Roster, count: int, exclude: Set[str]) -> list[str]:
+        candidates = [
+            (load, random.random(), user_id)
+            for user_id, load in zip(roster.user_ids, roster.open_reviews, strict=True)
+            if user_id not in exclude
+        ]
+        return [user_id for *_, user_id in heapq.nsmallest(count, candidates)]
+
+
+@register_strategy
+class WeightedStrategy(AssignmentStrategy):
+    """
+    Случайный выбор с весом, равным свободной ёмкости участника: REVIEWER_CAPACITY
+    (или значение из REVIEWER_CAPACITY_OVERRIDES) минус открытые ревью.
+    Участники без свободной ёмкости выбираются, только если остальных не хватило,
+    начиная с наименее загруженных.
+    """
+
+    name = "weighted"
+    needs_load = True
+
+    def choose(self, roster: Roster, count: int, exclude: Set[str]) -> list[str]:
+        capacity = settings.REVIEWER_CAPACITY
+        overrides = settings.REVIEWER_CAPACITY_OVERRIDES
+        weighted, overloaded = [], []
+        for user_id, load in zip(roster.user_ids, roster.open_reviews, strict=True):
+            if user_id in exclude:
+                continue
+            spare = overrides.get(user_id, capacity) - load
+            if spare > 0:
+                # Выборка без возвращения с весами (Efraimidis–Spirakis): ключ u^(1/w)
+                weighted.append((random.random() ** (1 / spare), user_id))
+            else:
+                overloaded.append((load, random.random(), user_id))
+
+        picked = [user_id for _, user_id in heapq.nlargest(count, weighted)]
+        if len(picked) < count:
+            picked += [user_id for *_, user_id in heapq.nsmallest(count - len(picked), overloaded)]
+        return picked
+
+
+class RosterBatch:
+    """
+    Снимки нескольких команд для серии назначений без обращений к БД.
+    После каждого выбора нагрузка выбранных в снимке увеличивается, чтобы
+    стратегии с нагрузкой не отдали всю серию одному человеку.
+    """
+
+    def __init__(self, strategy: AssignmentStrategy, rosters: dict[str, Roster]):
+        self.strategy = strategy
+        self.rosters = rosters
+        self._positions = {
+            team_name: {user_id: i for i, user_id in enumerate(roster.user_ids)}
+            for team_name, roster in rosters.items()
+            if roster.open_reviews
+        }
+
+    def pick(self, team_name: str, count: int, exclude: Set[str]) -> list[str]:
+        """Выбрать до count участников команды, не входящих в exclude."""
+        roster = self.rosters.get(team_name)
+        if roster is None:
+            return []
+        picked = self.strategy.choose(roster, count, exclude)
+        positions = self._positions.get(team_name)
+        if positions is not None:
+            for user_id in picked:
+                roster.open_reviews[positions[user_id]] += 1
+        return picked
+
+
+class ReviewerAssigner:
+    """
+    Выбор ревьюверов настроенной стратегией. Стратегиям без нагрузки снимок
+    отдаёт ROSTER_BACKEND (app.domain.roster), остальным и при его недоступности — БД.
+    """
+
+    def __init__(self, user_repo: UserRepository, strategy: AssignmentStrategy | None = None):
+        self.user_repo = user_repo
+        self.strategy = strategy
+
+    async def pick(self, team_name: str, count: int, exclude: Set[str]) -> list[str]:
+        """Выбрать до count активных участников команды, не входящих в exclude."""
+        strategy = self.strategy or get_strategy()
+        roster = None
+        if strategy.sample_only and settings.ROSTER_BACKEND == "redis":
+            roster = await sample_candidate_pool(team_name, count + len(exclude))
+        elif not strategy.needs_load:
+            roster = roster_index.snapshot(team_name, ordered=strategy.ordered)
+        if roster is None:
+            roster = await self._load_roster(strategy, team_name, exclude)
+        return strategy.choose(roster, count, exclude)
+
+    async def batch(self, team_names: Set[str], inactive: Set[str] = frozenset()) -> RosterBatch:
+        """
+        Снимки команд для серии назначений: из индекса в памяти, если стратегии
+        не нужна нагрузка, остальные — одним запросом к БД.
+        inactive — пользователи, деактивированные в текущей транзакции: индекс
+        узнает о них только после коммита, поэтому из его снимков они убираются здесь.
+        """
+        strategy = self.strategy or get_strategy()
+        rosters: dict[str, Roster] = {}
+        if not strategy.needs_load:
+            for team_name in team_names:
+                roster = roster_index.snapshot(team_name, ordered=strategy.ordered)
+                if roster is not None:
+                    rosters[team_name] = _without(roster, inactive)
+
+        missing = sorted(set(team_names) - rosters.keys())
+        loads = await self.user_repo.get_active_loads_by_teams(missing)
+        for team_name, rows in loads.items():
+            rosters[team_name] = Roster(
+                team_name,
+                tuple(user_id for user_id, _ in rows),
+                [load for _, load in rows],
+            )
+        return RosterBatch(strategy, rosters)
+
+    async def _load_roster(
+        self, strategy: AssignmentStrategy, team_name: str, exclude: Set[str]
+    ) -> Roster:
+        """Снимок команды из БД."""
+        limit = settings.REVIEWER_LEAST_LOADED_WINDOW + len(exclude) if strategy.by_load else None
+        rows = await self.user_repo.get_active_loads_by_team(team_name, least_loaded=limit)
+        return Roster(
+            team_name,
+            tuple(user_id for user_id, _ in rows),
+            tuple(load for _, load in rows),
+        )
+
+
+def _without(roster: Roster, user_ids: Set[str]) -> Roster:
+    """Снимок без user_ids; без копирования, если их в команде нет."""
+    if not user_ids or user_ids.isdisjoint(roster.user_ids):
+        return roster
+    return Roster(roster.team_name, tuple(uid for uid in roster.user_ids if uid not in user_ids))
@@ -1,8 +1,12 @@
 """Базовый класс для сервисов."""
 
+from collections.abc import Awaitable, Callable
+from typing import Any
+
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.cache import CacheService, get_cache
+from app.core.cache import CacheService, get_cache, get_local_cache
+from app.core.database import async_session_maker
 
 
 class BaseService:
@@ -14,4 +18,18 @@ class BaseService:
     async def _get_cache_service(self) -> CacheService:
         """Получить сервис кеширования."""
         redis_client = await get_cache()
-        return CacheService(redis_client)
+        return CacheService(redis_client, local_cache_instance=get_local_cache())
+
+    def _detached(self, method_name: str, *args) -> Callable[[], Awaitable[Any]]:
+        """
+        Фабрика вызова метода сервиса в собственной сессии БД.
+        Используется для фонового обновления кеша, которое продолжается
+        после завершения запроса и закрытия его сессии.
+        """
+        service_class = type(self)
+
+        async def call():
+            async with async_session_maker() as session:
+                return await getattr(service_class(session), method_name)(*args)
+
+        return call
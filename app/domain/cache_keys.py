@@ -0,0 +1,46 @@
+"""Ключи и теги кеша доменных сервисов."""
+
+STATS_KEY = "stats:get_stats"
+STATS_RESPONSE_KEY = "http:stats"
+FAIRNESS_KEY = "stats:fairness"
+STATS_TAG = "stats"
+CANDIDATE_POOLS_READY_KEY = "roster:ready"
+CANDIDATE_POOL_PATTERN = "roster:team:*"
+CANDIDATE_POOLS_VERSION_KEY = "roster:version"
+CANDIDATE_POOLS_REBUILD_KEY = "roster:rebuild"
+
+LEGACY_KEY_PATTERNS = (
+    "stats:get_stats",
+    "teams:get_team:*",
+    "users:get_reviews:*",
+)
+
+
+def team_key(team_name: str) -> str:
+    """Базовый ключ кеша команды."""
+    return f"teams:get_team:{team_name}"
+
+
+def team_tag(team_name: str) -> str:
+    """Тег всех записей, зависящих от состава команды."""
+    return f"team:{team_name}"
+
+
+def reviews_key(user_id: str) -> str:
+    """Базовый ключ кеша списка ревью пользователя."""
+    return f"users:get_reviews:{user_id}"
+
+
+def reviews_response_key(user_id: str) -> str:
+    """Базовый ключ закодированного ответа /users/getReview."""
+    return f"http:users:get_reviews:{user_id}"
+
+
+def user_tag(user_id: str) -> str:
+    """Тег всех записей, зависящих от пользователя."""
+    return f"user:{user_id}"
+
+
+def candidate_pool_key(team_name: str) -> str:
+    """Множество ID активных участников команды (кандидатов в ревьюверы)."""
+    return f"roster:team:{team_name}"
@@ -0,0 +1,153 @@
+"""Обработчики доменных событий, выполняемые после коммита."""
+
+import asyncio
+import logging
+import math
+import time
+from collections import defaultdict
+from collections.abc import Awaitable, Callable, Iterable
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import CacheService, get_cache, get_local_cache
+from app.core.config import settings
+from app.domain.cache_keys import (
+    CANDIDATE_POOLS_VERSION_KEY,
+    STATS_TAG,
+    candidate_pool_key,
+    team_tag,
+    user_tag,
+)
+from app.domain.events import (
+    DomainEvent,
+    PRCreated,
+    PRMerged,
+    ReviewerChanged,
+    RosterChanged,
+    TeamChanged,
+    UsersActivityChanged,
+    pop_events,
+)
+from app.domain.roster import roster_index
+
+logger = logging.getLogger(__name__)
+
+
+def affected_tags(event: DomainEvent) -> set[str]:
+    """Теги кеша, которые устаревают из-за события."""
+    if isinstance(event, PRCreated | PRMerged):
+        return {user_tag(uid) for uid in event.reviewer_ids} | {STATS_TAG}
+    if isinstance(event, ReviewerChanged):
+        user_ids = (event.old_reviewer_id, event.new_reviewer_id)
+        return {user_tag(uid) for uid in user_ids if uid} | {STATS_TAG}
+    if isinstance(event, UsersActivityChanged | TeamChanged):
+        return (
+            {user_tag(uid) for uid in event.user_ids}
+            | {team_tag(name) for name in event.team_names if name}
+            | {STATS_TAG}
+        )
+    return set()
+
+
+class StatsInvalidator:
+    """
+    Сброс тега статистики не чаще раза в STATS_INVALIDATION_INTERVAL секунд.
+    Статистику меняет каждая запись, и без ограничения её ключи сбрасывались бы
+    на каждом PR. Изменения внутри интервала сбрасываются одной отложенной
+    задачей в его конце, поэтому ни одно из них не теряется.
+    """
+
+    def __init__(self):
+        self._last = -math.inf
+        self._pending: asyncio.Task | None = None
+
+    def due(self) -> bool:
+        """True — сбросить тег сейчас; иначе сброс откладывается до конца интервала."""
+        if self._pending is not None and not self._pending.done():
+            return False
+        wait = self._last + settings.STATS_INVALIDATION_INTERVAL - time.monotonic()
+        if wait <= 0:
+            self._last = time.monotonic()
+            return True
+        self._pending = asyncio.create_task(self._invalidate_later(wait))
+        return False
+
+    def reset(self):
+        if self._pending is not None:
+            self._pending.cancel()
+        self._last, self._pending = -math.inf, None
+
+    async def _invalidate_later(self, delay: float):
+        await asyncio.sleep(delay)
+        self._last = time.monotonic()
+        cache_service = CacheService(await get_cache(), local_cache_instance=get_local_cache())
+        await cache_service.invalidate_tags(STATS_TAG)
+
+
+stats_invalidator = StatsInvalidator()
+
+
+async def invalidate_cache(events: Iterable[DomainEvent]):
+    """Инвалидировать теги, затронутые событиями, одной пачкой."""
+    tags = set()
+    for event in events:
+        tags |= affected_tags(event)
+    if STATS_TAG in tags and not stats_invalidator.due():
+        tags.discard(STATS_TAG)
+    if not tags:
+        return
+
+    cache_service = CacheService(await get_cache(), local_cache_instance=get_local_cache())
+    await cache_service.invalidate_tags(*sorted(tags))
+
+
+async def update_roster_index(events: Iterable[DomainEvent]):
+    """Применить изменения состава команд к индексу участников в памяти."""
+    for event in events:
+        if not isinstance(event, RosterChanged):
+            continue
+        for user_id, _ in event.removed:
+            roster_index.deactivate(user_id)
+        for user_id, team_name in event.added:
+            roster_index.activate(user_id, team_name)
+
+
+async def update_candidate_pools(events: Iterable[DomainEvent]):
+    """Применить изменения состава команд к множествам кандидатов в Redis."""
+    if settings.ROSTER_BACKEND != "redis":
+        return
+
+    cache_service = CacheService(await get_cache())
+    for event in events:
+        if not isinstance(event, RosterChanged):
+            continue
+        removed, added = defaultdict(list), defaultdict(list)
+        for user_id, team_name in event.removed:
+            removed[candidate_pool_key(team_name)].append(user_id)
+        for user_id, team_name in event.added:
+            added[candidate_pool_key(team_name)].append(user_id)
+        await cache_service.update_sets(removed, added, CANDIDATE_POOLS_VERSION_KEY)
+
+
+HANDLERS: tuple[Callable[[list[DomainEvent]], Awaitable[None]], ...] = (
+    update_roster_index,
+    update_candidate_pools,
+    invalidate_cache,
+)
+
+
+async def dispatch_events(session: AsyncSession):
+    """
+    Передать обработчикам события, накопленные в сессии.
+    Вызывается после успешного коммита; ошибка обработчика не откатывает
+    уже зафиксированные изменения, поэтому только логируется.
+    """
+    events = pop_events(session)
+    if not events:
+        return
+
+    for handler in HANDLERS:
+        try:
+            await handler(events)
+        except Exception:
+            logger.exception("Event handler %s failed", handler.__name__)
@@ -0,0 +1,91 @@
+"""
+Доменные события.
+
+Сервисы публикуют события в сессию БД, а после успешного коммита
+они передаются обработчикам (см. app.domain.event_handlers).
+При откате транзакции события отбрасываются вместе с сессией.
+"""
+
+from dataclasses import dataclass
+
+from sqlalchemy.event import listens_for
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+_SESSION_KEY = "domain_events"
+
+
+@dataclass(frozen=True)
+class DomainEvent:
+    """Базовый класс доменного события."""
+
+
+@dataclass(frozen=True)
+class PRCreated(DomainEvent):
+    """Создан PR с назначенными ревьюверами."""
+
+    pull_request_id: str
+    author_id: str
+    reviewer_ids: tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class PRMerged(DomainEvent):
+    """PR переведён в статус MERGED."""
+
+    pull_request_id: str
+    reviewer_ids: tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class ReviewerChanged(DomainEvent):
+    """Ревьювер PR заменён другим или снят без замены (new_reviewer_id is None)."""
+
+    pull_request_id: str
+    old_reviewer_id: str
+    new_reviewer_id: str | None
+
+
+@dataclass(frozen=True)
+class UsersActivityChanged(DomainEvent):
+    """Изменён флаг активности пользователей."""
+
+    user_ids: tuple[str, ...]
+    team_names: tuple[str, ...]
+    is_active: bool
+
+
+@dataclass(frozen=True)
+class TeamChanged(DomainEvent):
+    """Создана команда или изменён её состав."""
+
+    team_names: tuple[str, ...]
+    user_ids: tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class RosterChanged(DomainEvent):
+    """
+    Изменён состав активных участников команд парами (user_id, team_name):
+    removed — кто больше не активен в команде (деактивирован или перешёл в другую),
+    added — кто стал активным в команде. Сначала применяется removed, затем added.
+    """
+
+    added: tuple[tuple[str, str], ...] = ()
+    removed: tuple[tuple[str, str], ...] = ()
+
+
+def publish(session: AsyncSession, event: DomainEvent) -> None:
+    """Отложить событие до коммита сессии."""
+    session.info.setdefault(_SESSION_KEY, []).append(event)
+
+
+def pop_events(session: AsyncSession) -> list[DomainEvent]:
+    """Забрать накопленные в сессии события."""
+    return session.info.pop(_SESSION_KEY, [])
+
+
+@listens_for(Session, "after_rollback")
+def _discard_events(session: Session) -> None:
+    """События откаченной транзакции не должны дойти до обработчиков."""
+    session.info.pop(_SESSION_KEY, None)
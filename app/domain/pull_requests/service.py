@@ -1,19 +1,23 @@
 """Сервис для работы с Pull Request'ами."""
 
 import logging
-import random
+from datetime import datetime
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
 from app.core.exceptions import (
+    BatchTooLargeException,
     NotAssignedException,
     NotFoundException,
     PRExistsException,
     PRMergedException,
+    ServiceException,
 )
 from app.db.repositories.pr_repository import PRRepository
-from app.db.repositories.team_repository import TeamRepository
 from app.db.repositories.user_repository import UserRepository
+from app.domain.assignment import ReviewerAssigner
+from app.domain.events import PRCreated, PRMerged, ReviewerChanged, publish
 
 logger = logging.getLogger(__name__)
 
@@ -25,34 +29,96 @@ class PullRequestService:
         self.session = session
         self.pr_repo = PRRepository(session)
         self.user_repo = UserRepository(session)
-        self.team_repo = TeamRepository(session)
+        self.assigner = ReviewerAssigner(self.user_repo)
 
     async def create_pr(self, pr_id: str, pr_name: str, author_id: str) -> dict:
-        """Создать PR и автоматически назначить ревьюверов."""
-
-        if await self.pr_repo.exists(pr_id):
+        """
+        Создать PR и автоматически назначить ревьюверов.
+        Существование PR и команда автора читаются одним запросом, ревьюверы
+        выбираются стратегией по снимку команды, а PR вставляется без чтения
+        обратно: ответ собирается из известных значений.
+        """
+        pr_exists, team_name = await self.pr_repo.get_author_context(pr_id, author_id)
+        if pr_exists:
             raise PRExistsException()
-
-        author = await self.user_repo.get_by_id(author_id)
-        if not author:
+        if team_name is None:
             raise NotFoundException("Author")
 
-        team = await self.team_repo.get_by_name(author.team_name)
-        if not team:
-            raise NotFoundException("Team")
+        reviewer_ids = await self.assigner.pick(team_name, 2, exclude={author_id})
 
-        candidates = await self.user_repo.get_active_by_team(
-            author.team_name, exclude_user_id=author_id, limit=2
+        created_at = await self.pr_repo.create_with_reviewers(
+            pr_id, pr_name, author_id, reviewer_ids, reviewers_team=team_name
         )
-        random.shuffle(candidates)
-        reviewer_ids = [user.user_id for user in candidates[:2]]
-
-        await self.pr_repo.create_with_reviewers(pr_id, pr_name, author_id, reviewer_ids)
-        await self.session.flush()
-
-        pr = await self.pr_repo.get_by_id(pr_id, load_reviewers=True)
-
-        return {"pr": self._pr_to_schema(pr)}
+        if created_at is None:
+            # PR с тем же ID создали параллельно после проверки
+            raise PRExistsException()
+        publish(self.session, PRCreated(pr_id, author_id, tuple(reviewer_ids)))
+
+        return {"pr": self._new_pr_to_schema(pr_id, pr_name, author_id, reviewer_ids, created_at)}
+
+    async def create_prs(self, items: list[dict]) -> dict:
+        """
+        Создать пачку PR с результатом по каждому элементу в порядке запроса.
+        Существующие PR и команды авторов читаются двумя запросами на всю пачку,
+        ревьюверы выбираются в памяти по снимкам команд (RosterBatch), а PR,
+        ревьюверы и счётчики записываются пачками. Ошибки элементов (PR_EXISTS,
+        NOT_FOUND) не прерывают обработку остальных. Пустой запрос отклоняется
+        схемой (422), здесь пустая пачка просто ничего не создаёт.
+        """
+        if len(items) > settings.PR_BATCH_MAX_SIZE:
+            raise BatchTooLargeException(settings.PR_BATCH_MAX_SIZE)
+        if not items:
+            return {"created_count": 0, "results": []}
+
+        existing = await self.pr_repo.get_existing_ids([i["pull_request_id"] for i in items])
+        teams = await self.user_repo.get_teams_by_ids(list({i["author_id"] for i in items}))
+        batch = await self.assigner.batch(set(teams.values()))
+
+        errors: dict[int, ServiceException] = {}
+        planned: list[tuple[str, str, str, list[str]]] = []
+        reviewer_teams: dict[str, str] = {}
+        seen: set[str] = set()
+        for position, item in enumerate(items):
+            pr_id, author_id = item["pull_request_id"], item["author_id"]
+            if pr_id in existing or pr_id in seen:
+                errors[position] = PRExistsException()
+                continue
+            team_name = teams.get(author_id)
+            if team_name is None:
+                errors[position] = NotFoundException("Author")
+                continue
+            seen.add(pr_id)
+            reviewer_ids = batch.pick(team_name, 2, exclude={author_id})
+            reviewer_teams.update(dict.fromkeys(reviewer_ids, team_name))
+            planned.append((pr_id, item["pull_request_name"], author_id, reviewer_ids))
+
+        created = await self.pr_repo.create_many(planned, reviewer_teams)
+
+        results: list[dict] = []
+        planned_by_id = {pr[0]: pr for pr in planned}
+        for position, item in enumerate(items):
+            pr_id = item["pull_request_id"]
+            error = errors.get(position)
+            if error is None and pr_id not in created:
+                # PR с тем же ID создали параллельно после проверки
+                error = PRExistsException()
+            if error is not None:
+                results.append({"pull_request_id": pr_id, "pr": None, "error": error.detail})
+                continue
+
+            _, pr_name, author_id, reviewer_ids = planned_by_id[pr_id]
+            publish(self.session, PRCreated(pr_id, author_id, tuple(reviewer_ids)))
+            results.append(
+                {
+                    "pull_request_id": pr_id,
+                    "pr": self._new_pr_to_schema(
+                        pr_id, pr_name, author_id, reviewer_ids, created[pr_id]
+                    ),
+                    "error": None,
+                }
+            )
+
+        return {"created_count": len(created), "results": results}
 
     async def get_pr(self, pr_id: str) -> dict:
         """Получить PR по идентификатору."""
@@ -69,11 +135,16 @@ class PullRequestService:
         if not pr:
             raise NotFoundException("PR")
 
+        publish(self.session, PRMerged(pr_id, tuple(r.user_id for r in pr.reviewers)))
+
         return {"pr": self._pr_to_schema(pr)}
 
     async def reassign_reviewer(self, pr_id: str, old_user_id: str) -> dict:
-        """Переназначить ревьювера."""
-        pr = await self.pr_repo.get_by_id(pr_id, load_reviewers=True)
+        """
+        Переназначить ревьювера. PR читается с блокировкой строки: статус и
+        ревьюверы не меняются параллельно между проверкой и заменой.
+        """
+        pr = await self.pr_repo.get_by_id(pr_id, load_reviewers=True, for_update=True)
         if not pr:
             raise NotFoundException("PR")
 
@@ -89,31 +160,21 @@ class PullRequestService:
         if not old_reviewer:
             raise NotFoundException("User")
 
-        team_name = old_reviewer.team_name
-
-        initial_candidates = await self.user_repo.get_active_by_team(
-            team_name, exclude_user_id=old_user_id, limit=100
+        new_reviewer_ids = await self.assigner.pick(
+            old_reviewer.team_name, 1, exclude={*old_reviewer_ids, pr.author_id}
         )
 
-        candidates = [
-            u
-            for u in initial_candidates
-            if u.user_id not in old_reviewer_ids and u.user_id != pr.author_id
-        ]
-
-        if candidates:
-            new_reviewer = random.choice(candidates)
-
-            pr = await self.pr_repo.reassign_reviewer(pr_id, old_user_id, new_reviewer.user_id)
-            replaced_by = new_reviewer.user_id
+        if new_reviewer_ids:
+            replaced_by = new_reviewer_ids[0]
+            pr = await self.pr_repo.reassign_reviewer(pr_id, old_user_id, replaced_by)
         else:
-
             pr = await self.pr_repo.remove_reviewer(pr_id, old_user_id)
             replaced_by = ""
 
         if not pr:
             raise NotFoundException("PR")
 
+        publish(self.session, ReviewerChanged(pr_id, old_user_id, replaced_by or None))
         return {"pr": self._pr_to_schema(pr), "replaced_by": replaced_by}
 
     def _pr_to_schema(self, pr) -> dict:
@@ -128,3 +189,18 @@ class PullRequestService:
             "createdAt": pr.created_at.isoformat() if pr.created_at else None,
             "mergedAt": pr.merged_at.isoformat() if pr.merged_at else None,
         }
+
+    @staticmethod
+    def _new_pr_to_schema(
+        pr_id: str, pr_name: str, author_id: str, reviewer_ids: list[str], created_at: datetime
+    ) -> dict:
+        """Схема только что созданного PR из известных значений, без чтения из БД."""
+        return {
+            "pull_request_id": pr_id,
+            "pull_request_name": pr_name,
+            "author_id": author_id,
+            "status": "OPEN",
+            "assigned_reviewers": list(reviewer_ids),
+            "createdAt": created_at.isoformat(),
+            "mergedAt": None,
+        }
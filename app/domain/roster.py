@@ -0,0 +1,220 @@
+"""
+Состав активных участников команд для выбора ревьюверов.
+
+ROSTER_BACKEND выбирает, где он хранится:
+- memory — индекс в памяти процесса (RosterIndex): по команде массив ID
+  активных участников и позиции в нём, добавление и удаление (перестановкой
+  с последним элементом) стоят O(1). Изменения, сделанные другими
+  инстансами, попадают в индекс при перестроении;
+- redis — множества candidate_pool_key в Redis, общие для всех воркеров;
+  выборка кандидатов — одна команда SRANDMEMBER. Перестраивает их один
+  воркер — владелец аренды. Пока множества не построены или Redis
+  недоступен, состав читается из БД;
+- db — состав каждый раз читается из БД.
+
+Индекс и множества строятся из БД при старте и перестраиваются каждые
+ROSTER_INDEX_REFRESH_INTERVAL, а между перестроениями обновляются событиями
+RosterChanged после коммита (см. app.domain.event_handlers).
+"""
+
+import asyncio
+import logging
+from collections import defaultdict
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.core.cache import CacheService, get_cache
+from app.core.config import settings
+from app.core.database import async_session_maker
+from app.db.repositories.user_repository import UserRepository
+from app.domain.cache_keys import (
+    CANDIDATE_POOL_PATTERN,
+    CANDIDATE_POOLS_READY_KEY,
+    CANDIDATE_POOLS_REBUILD_KEY,
+    CANDIDATE_POOLS_VERSION_KEY,
+    candidate_pool_key,
+)
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class Roster:
+    """
+    Снимок активных участников команды для стратегии назначения.
+    open_reviews заполняется по позициям user_ids, только если стратегии нужна нагрузка.
+    """
+
+    team_name: str
+    user_ids: Sequence[str]
+    open_reviews: Sequence[int] = ()
+
+
+class TeamRoster:
+    """Активные участники одной команды: массив ID и позиции в нём."""
+
+    __slots__ = ("user_ids", "positions", "_sorted")
+
+    def __init__(self):
+        self.user_ids: list[str] = []
+        self.positions: dict[str, int] = {}
+        self._sorted: tuple[str, ...] | None = None
+
+    def add(self, user_id: str):
+        if user_id in self.positions:
+            return
+        self.positions[user_id] = len(self.user_ids)
+        self.user_ids.append(user_id)
+        self._sorted = None
+
+    def remove(self, user_id: str):
+        position = self.positions.pop(user_id, None)
+        if position is None:
+            return
+        last = self.user_ids.pop()
+        if last != user_id:
+            self.user_ids[position] = last
+            self.positions[last] = position
+        self._sorted = None
+
+    def sorted_ids(self) -> tuple[str, ...]:
+        """ID в порядке возрастания; пересчитываются только после изменения состава."""
+        if self._sorted is None:
+            self._sorted = tuple(sorted(self.user_ids))
+        return self._sorted
+
+
+class RosterIndex:
+    """Индекс команда → активные участники."""
+
+    def __init__(self):
+        self._teams: dict[str, TeamRoster] = {}
+        self._team_of: dict[str, str] = {}
+        # Изменения, пришедшие во время перестроения, повторяются поверх загруженного
+        self._replay: list[tuple[str, str | None]] | None = None
+        self.ready = False
+
+    def load(self, members: Iterable[tuple[str, str]]):
+        """Заменить содержимое индекса парами (team_name, user_id) активных участников."""
+        teams: dict[str, TeamRoster] = {}
+        team_of: dict[str, str] = {}
+        for team_name, user_id in members:
+            teams.setdefault(team_name, TeamRoster()).add(user_id)
+            team_of[user_id] = team_name
+        self._teams, self._team_of = teams, team_of
+        self.ready = True
+
+    def clear(self):
+        self._teams, self._team_of = {}, {}
+        self.ready = False
+
+    async def rebuild(self, session_maker: async_sessionmaker = async_session_maker):
+        """Перестроить индекс из БД."""
+        self._replay = []
+        try:
+            async with session_maker() as session:
+                members = await UserRepository(session).get_active_members()
+            replay, self._replay = self._replay, None
+            self.load(members)
+            for user_id, team_name in replay:
+                self._apply(user_id, team_name)
+        finally:
+            self._replay = None
+
+    def activate(self, user_id: str, team_name: str):
+        """Добавить активного участника в команду (и убрать из прежней)."""
+        self._record(user_id, team_name)
+        self._apply(user_id, team_name)
+
+    def deactivate(self, user_id: str):
+        """Убрать участника из индекса."""
+        self._record(user_id, None)
+        self._apply(user_id, None)
+
+    def snapshot(self, team_name: str, ordered: bool = False) -> Roster | None:
+        """
+        Снимок команды без копирования массива (ordered — ID по возрастанию).
+        None, если индекс не построен или команды в нём нет: тогда снимок читается из БД.
+        """
+        if not self.ready:
+            return None
+        team = self._teams.get(team_name)
+        if team is None:
+            return None
+        return Roster(team_name, team.sorted_ids() if ordered else team.user_ids)
+
+    def _record(self, user_id: str, team_name: str | None):
+        if self._replay is not None:
+            self._replay.append((user_id, team_name))
+
+    def _apply(self, user_id: str, team_name: str | None):
+        previous = self._team_of.pop(user_id, None)
+        if previous is not None:
+            team = self._teams[previous]
+            team.remove(user_id)
+            if not team.user_ids:
+                del self._teams[previous]
+        if team_name is not None:
+            self._teams.setdefault(team_name, TeamRoster()).add(user_id)
+            self._team_of[user_id] = team_name
+
+
+roster_index = RosterIndex()
+
+
+async def rebuild_candidate_pools(session_maker: async_sessionmaker = async_session_maker):
+    """
+    Перестроить множества кандидатов в Redis из БД.
+    Множества общие, поэтому за ROSTER_INDEX_REFRESH_INTERVAL их перестраивает
+    один процесс — владелец аренды CANDIDATE_POOLS_REBUILD_KEY. Изменения
+    RosterChanged, пришедшие во время чтения из БД, увеличивают
+    CANDIDATE_POOLS_VERSION_KEY, и снимок читается заново (см. replace_sets).
+    """
+    cache_service = CacheService(await get_cache())
+    if not await cache_service.acquire_lease(
+        CANDIDATE_POOLS_REBUILD_KEY, settings.ROSTER_INDEX_REFRESH_INTERVAL
+    ):
+        return
+
+    async def load() -> dict[str, list[str]]:
+        async with session_maker() as session:
+            members = await UserRepository(session).get_active_members()
+        pools: dict[str, list[str]] = defaultdict(list)
+        for team_name, user_id in members:
+            pools[candidate_pool_key(team_name)].append(user_id)
+        return pools
+
+    await cache_service.replace_sets(
+        CANDIDATE_POOL_PATTERN, load, CANDIDATE_POOLS_READY_KEY, CANDIDATE_POOLS_VERSION_KEY
+    )
+
+
+async def sample_candidate_pool(team_name: str, count: int) -> Roster | None:
+    """До count случайных активных участников команды из Redis; None — читать из БД."""
+    cache_service = CacheService(await get_cache())
+    user_ids = await cache_service.sample_set(
+        candidate_pool_key(team_name), count, CANDIDATE_POOLS_READY_KEY
+    )
+    return Roster(team_name, user_ids) if user_ids is not None else None
+
+
+async def run_roster_index(session_maker: async_sessionmaker = async_session_maker):
+    """
+    Построить состав команд выбранного ROSTER_BACKEND при старте
+    и перестраивать его каждые ROSTER_INDEX_REFRESH_INTERVAL.
+    """
+    if settings.ROSTER_BACKEND == "memory":
+        rebuild = roster_index.rebuild
+    elif settings.ROSTER_BACKEND == "redis":
+        rebuild = rebuild_candidate_pools
+    else:
+        return
+
+    while True:
+        try:
+            await rebuild(session_maker)
+        except Exception:
+            logger.exception("Roster rebuild failed")
+        await asyncio.sleep(settings.ROSTER_INDEX_REFRESH_INTERVAL)
@@ -0,0 +1,61 @@
+"""
+Метрики равномерности распределения ревью.
+
+Все метрики считаются векторно по всем группам сразу: значения сортируются
+по (группа, значение), границы групп находятся по bincount, а суммы,
+перцентили и коэффициент Джини вычисляются операциями над массивами без
+циклов Python по пользователям.
+"""
+
+import numpy as np
+
+PERCENTILES = (50, 90, 99)
+
+
+def group_distribution(codes: np.ndarray, values: np.ndarray) -> dict[str, np.ndarray]:
+    """
+    Метрики распределения values внутри каждой группы.
+
+    codes — номер группы каждого значения, группы 0..codes.max() непусты
+    (как у np.unique(..., return_inverse=True)). Возвращает массивы по группам:
+    mean, min, max, p50/p90/p99 (линейная интерполяция, как в numpy.percentile),
+    gini, max_to_min (nan при min = 0) и max_to_mean (nan при mean = 0).
+    """
+    order = np.lexsort((values, codes))
+    codes = codes[order]
+    values = values[order].astype(np.float64)
+
+    count = np.bincount(codes)
+    total = np.bincount(codes, weights=values)
+    start = np.concatenate(([0], np.cumsum(count)[:-1]))
+    end = start + count - 1
+
+    mean = total / count
+    minimum = values[start]
+    maximum = values[end]
+
+    # Джини по отсортированным значениям: G = 2·Σ(i·x_i) / (n·Σx) − (n + 1) / n
+    rank = np.arange(1, len(values) + 1) - start[codes]
+    weighted = np.bincount(codes, weights=rank * values)
+    safe_total = np.where(total > 0, total, 1)
+    gini = np.where(total > 0, 2 * weighted / (count * safe_total) - (count + 1) / count, 0.0)
+
+    metrics = {
+        "mean": mean,
+        "min": minimum,
+        "max": maximum,
+        "gini": gini,
+        "max_to_min": np.divide(
+            maximum, minimum, out=np.full_like(maximum, np.nan), where=minimum > 0
+        ),
+        "max_to_mean": np.divide(maximum, mean, out=np.full_like(maximum, np.nan), where=mean > 0),
+    }
+
+    for q in PERCENTILES:
+        position = (count - 1) * (q / 100)
+        lower = np.floor(position).astype(np.int64)
+        upper = np.ceil(position).astype(np.int64)
+        low_value = values[start + lower]
+        metrics[f"p{q}"] = low_value + (values[start + upper] - low_value) * (position - lower)
+
+    return metrics
@@ -1,10 +1,18 @@
 """Сервис для работы со статистикой."""
 
+from collections.abc import AsyncIterator
+from datetime import date, timedelta
+
+import numpy as np
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.repositories.pr_repository import PRRepository
-from app.db.repositories.user_repository import UserRepository
+from app.core.config import settings
+from app.core.exceptions import InvalidDateRangeException, NotFoundException
+from app.db.repositories.stats_repository import StatsRepository
+from app.db.repositories.team_repository import TeamRepository
 from app.domain.base_service import BaseService
+from app.domain.cache_keys import FAIRNESS_KEY, STATS_KEY, STATS_TAG
+from app.domain.stats.fairness import group_distribution
 
 
 class StatsService(BaseService):
@@ -12,22 +20,36 @@ class StatsService(BaseService):
 
     def __init__(self, session: AsyncSession):
         super().__init__(session)
-        self.user_repo = UserRepository(session)
-        self.pr_repo = PRRepository(session)
+        self.stats_repo = StatsRepository(session)
+        self.team_repo = TeamRepository(session)
 
     async def get_stats(self) -> dict:
-        """Получить статистику по пользователям и PR."""
+        """
+        Получить статистику по пользователям и PR.
+        Пересчёт при промахе выполняется одним запросом на процесс и одним
+        воркером на кластер; остальные получают последнее известное значение.
+        Устаревшее значение отдаётся сразу и обновляется в фоне.
+        """
         cache_service = await self._get_cache_service()
-        cache_key = "stats:get_stats"
+        cache_key = await cache_service.tagged_key(STATS_KEY, STATS_TAG)
 
-        cached_result = await cache_service.get(cache_key)
-        if cached_result is not None:
-            return cached_result
+        return await cache_service.get_or_compute(
+            cache_key,
+            self._compute_stats,
+            ttl=300,
+            fallback_key=f"{STATS_KEY}:last",
+            soft_ttl=settings.CACHE_SOFT_TTL,
+            refresh=self._detached("_compute_stats"),
+        )
 
-        user_stats_list = await self.user_repo.get_all_with_stats()
-        pr_stats_dict = await self.pr_repo.get_stats()
+    async def _compute_stats(self) -> dict:
+        """
+        Прочитать статистику из счётчиков одним запросом к БД:
+        O(пользователей), без агрегации по PR.
+        """
+        user_stats_list, pr_stats_dict = await self.stats_repo.get_stats()
 
-        result = {
+        return {
             "users": [
                 {
                     "user_id": stat["user_id"],
@@ -41,5 +63,130 @@ class StatsService(BaseService):
             "pull_requests": pr_stats_dict,
         }
 
-        await cache_service.set(cache_key, result, ttl=300)
-        return result
+    async def get_fairness(self) -> dict:
+        """
+        Получить метрики равномерности распределения ревью по командам.
+        Кешируется так же, как статистика, и сбрасывается вместе с ней тегом
+        STATS_TAG после записей, меняющих ревью и пользователей.
+        """
+        cache_service = await self._get_cache_service()
+        cache_key = await cache_service.tagged_key(FAIRNESS_KEY, STATS_TAG)
+
+        return await cache_service.get_or_compute(
+            cache_key,
+            self._compute_fairness,
+            ttl=300,
+            fallback_key=f"{FAIRNESS_KEY}:last",
+            soft_ttl=settings.CACHE_SOFT_TTL,
+            refresh=self._detached("_compute_fairness"),
+        )
+
+    async def _compute_fairness(self) -> dict:
+        """Посчитать метрики по счётчикам активных пользователей векторно в NumPy."""
+        team_names, open_reviews, total_reviews = await self.stats_repo.get_active_review_counts()
+        if not team_names:
+            return {"overall": None, "teams": []}
+
+        teams, codes = np.unique(np.asarray(team_names), return_inverse=True)
+        counts = np.bincount(codes)
+        open_reviews = np.asarray(open_reviews, dtype=np.int64)
+        total_reviews = np.asarray(total_reviews, dtype=np.int64)
+
+        by_team = (
+            group_distribution(codes, open_reviews),
+            group_distribution(codes, total_reviews),
+        )
+        everyone = np.zeros_like(codes)
+        overall = (
+            group_distribution(everyone, open_reviews),
+            group_distribution(everyone, total_reviews),
+        )
+
+        return {
+            "overall": _fairness_entry(None, len(codes), overall, 0),
+            "teams": [
+                _fairness_entry(str(team), int(counts[i]), by_team, i)
+                for i, team in enumerate(teams)
+            ],
+        }
+
+    async def get_user_stats_page(self, after: str | None, limit: int) -> dict:
+        """
+        Страница статистики пользователей с пагинацией по ключу.
+        next_after передаётся в следующий запрос; None — страниц больше нет.
+        """
+        users = await self.stats_repo.get_user_stats_page(after, limit)
+        next_after = users[-1]["user_id"] if len(users) == limit else None
+        return {"users": users, "next_after": next_after}
+
+    def stream_user_stats(self) -> AsyncIterator[list[dict]]:
+        """Статистика всех пользователей пачками, без загрузки списка целиком."""
+        return self.stats_repo.stream_user_stats(settings.STATS_STREAM_BATCH_SIZE)
+
+    async def get_team_stats(self, team_name: str, day_from: date, day_to: date) -> dict:
+        """
+        Нагрузка ревью команды по дням за интервал [day_from, day_to] (UTC).
+        Считается по дневным агрегатам: строк читается не больше, чем
+        ревьюверов команды на число дней интервала.
+        """
+        if day_from > day_to or (day_to - day_from).days >= settings.STATS_TEAM_MAX_DAYS:
+            raise InvalidDateRangeException(settings.STATS_TEAM_MAX_DAYS)
+
+        if not await self.team_repo.exists(team_name):
+            raise NotFoundException("Team")
+
+        open_reviews, rows = await self.stats_repo.get_team_rollups(team_name, day_from, day_to)
+        team_open = sum(open_reviews.values())
+
+        rows_by_day: dict[date, list] = {}
+        for row in rows:
+            rows_by_day.setdefault(row.day, []).append(row)
+
+        reviewers: dict[str, dict] = {}
+        days = []
+        for offset in range((day_to - day_from).days + 1):
+            day = day_from + timedelta(days=offset)
+            assigned = merged = 0
+            for row in rows_by_day.get(day, ()):
+                reviewer = reviewers.setdefault(row.reviewer_id, {"assigned": 0, "merged": 0})
+                reviewer["assigned"] += row.assigned
+                reviewer["merged"] += row.merged
+                open_reviews[row.reviewer_id] = (
+                    open_reviews.get(row.reviewer_id, 0) + row.open_delta
+                )
+                assigned += row.assigned
+                merged += row.merged
+                team_open += row.open_delta
+            days.append({"date": day, "assigned": assigned, "merged": merged, "open": team_open})
+
+        return {
+            "team_name": team_name,
+            "from": day_from,
+            "to": day_to,
+            "days": days,
+            "reviewers": [
+                {
+                    "user_id": user_id,
+                    "assigned": reviewers.get(user_id, {}).get("assigned", 0),
+                    "merged": reviewers.get(user_id, {}).get("merged", 0),
+                    "open": open_reviews.get(user_id, 0),
+                }
+                for user_id in sorted(reviewers.keys() | open_reviews.keys())
+            ],
+        }
+
+
+def _fairness_entry(team_name: str | None, active_users: int, metrics: tuple, index: int) -> dict:
+    """Метрики группы index: NaN (деление на ноль) превращается в None."""
+    open_metrics, total_metrics = metrics
+    return {
+        "team_name": team_name,
+        "active_users": active_users,
+        "open_reviews": _metrics_at(open_metrics, index),
+        "total_reviews": _metrics_at(total_metrics, index),
+    }
+
+
+def _metrics_at(metrics: dict[str, np.ndarray], index: int) -> dict:
+    values = {name: float(column[index]) for name, column in metrics.items()}
+    return {name: None if np.isnan(value) else round(value, 4) for name, value in values.items()}
@@ -1,14 +1,16 @@
 """Сервис для работы с командами."""
 
-import json
-
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
 from app.core.exceptions import NotFoundException, TeamExistsException
 from app.db.models import Team, User
+from app.db.repositories.stats_repository import StatsRepository
 from app.db.repositories.team_repository import TeamRepository
 from app.db.repositories.user_repository import UserRepository
 from app.domain.base_service import BaseService
+from app.domain.cache_keys import team_key, team_tag
+from app.domain.events import RosterChanged, TeamChanged, publish
 from app.schemas.team import TeamMemberSchema
 
 
@@ -19,12 +21,10 @@ class TeamService(BaseService):
         super().__init__(session)
         self.team_repo = TeamRepository(session)
         self.user_repo = UserRepository(session)
+        self.stats_repo = StatsRepository(session)
 
     async def create_team(self, team_name: str, members: list[dict]) -> dict:
         """Создать команду с участниками."""
-        cache_service = await self._get_cache_service()
-        await cache_service.delete_pattern(f"teams:get_team:{team_name}:*")
-
         if await self.team_repo.exists(team_name):
             raise TeamExistsException()
 
@@ -32,10 +32,21 @@ class TeamService(BaseService):
         self.session.add(team)
         await self.session.flush()
 
+        previous_teams = set()
+        moves: dict[str, tuple[str, str]] = {}
+        added, removed = [], []
         for member_data in members:
             member = TeamMemberSchema(**member_data)
+            if member.is_active:
+                added.append((member.user_id, team_name))
+            else:
+                removed.append((member.user_id, team_name))
             user = await self.user_repo.get_by_id(member.user_id)
             if user:
+                if user.team_name != team_name:
+                    previous_teams.add(user.team_name)
+                    removed.append((user.user_id, user.team_name))
+                    moves[user.user_id] = (user.team_name, team_name)
                 user.username = member.username
                 user.is_active = member.is_active
                 user.team_name = team_name
@@ -49,32 +60,42 @@ class TeamService(BaseService):
                 self.session.add(user)
 
         await self.session.flush()
+        if moves:
+            await self.stats_repo.reviewers_moved(moves)
+
+        publish(
+            self.session,
+            TeamChanged(
+                (team_name, *sorted(previous_teams)),
+                tuple(member["user_id"] for member in members),
+            ),
+        )
+        publish(self.session, RosterChanged(tuple(added), tuple(removed)))
 
         team = await self.team_repo.get_by_name(team_name, load_members=True)
-        team_data = self._team_to_schema(team)
-
-        cache_key = f"teams:get_team:{team_name}:{json.dumps(sorted([('team_name', team_name)]), sort_keys=True)}"
-        await cache_service.set(cache_key, team_data)
-
-        return {"team": team_data}
+        return {"team": self._team_to_schema(team)}
 
     async def get_team(self, team_name: str) -> dict:
         """Получить команду с участниками."""
         cache_service = await self._get_cache_service()
-        cache_key = f"teams:get_team:{team_name}:{json.dumps(sorted([('team_name', team_name)]), sort_keys=True)}"
-
-        cached_result = await cache_service.get(cache_key)
-        if cached_result is not None:
-            return {"team": cached_result}
+        cache_key = await cache_service.tagged_key(team_key(team_name), team_tag(team_name))
+
+        team_data = await cache_service.get_or_compute(
+            cache_key,
+            lambda: self._compute_team(team_name),
+            ttl=settings.CACHE_TEAMS_TTL,
+            soft_ttl=settings.CACHE_SOFT_TTL,
+            refresh=self._detached("_compute_team", team_name),
+        )
+        return {"team": team_data}
 
+    async def _compute_team(self, team_name: str) -> dict:
+        """Загрузить команду из БД."""
         team = await self.team_repo.get_by_name(team_name, load_members=True)
         if not team:
             raise NotFoundException("Team")
 
-        team_data = self._team_to_schema(team)
-        await cache_service.set(cache_key, team_data)
-
-        return {"team": team_data}
+        return self._team_to_schema(team)
 
     def _team_to_schema(self, team: Team) -> dict:
         """Преобразовать модель в схему."""
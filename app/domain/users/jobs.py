@@ -0,0 +1,172 @@
+"""
+Фоновая массовая деактивация пользователей.
+
+Запрос сохраняет задачу со списком ID и сразу возвращает её ID. Воркер
+(run_bulk_job_worker, запускается в lifespan каждого инстанса) арендует
+задачу условным UPDATE и обрабатывает пользователей пачками по
+BULK_JOB_CHUNK_SIZE: деактивация, переназначение ревью и сдвиг processed
+коммитятся одной транзакцией, так что блокировки держатся только на время
+пачки. Аренда продлевается с каждой пачкой; если воркер упал, после
+BULK_JOB_LEASE_SECONDS задачу подхватывает другой и продолжает с первой
+необработанной пачки. Если пачка упала с ошибкой (взаимоблокировка, обрыв
+соединения), её транзакция откатывается, ошибка записывается в задачу, а
+аренда снимается: через BULK_JOB_RETRY_DELAY пачку повторит любой воркер.
+После BULK_JOB_MAX_ATTEMPTS неудач подряд задача завершается со статусом failed.
+"""
+
+import asyncio
+import logging
+import os
+import socket
+import uuid
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.core.database import async_session_maker
+from app.core.exceptions import NotFoundException
+from app.db.models import BulkDeactivationJob
+from app.db.repositories.job_repository import BulkJobRepository
+from app.db.repositories.user_repository import UserRepository
+from app.domain.base_service import BaseService
+from app.domain.event_handlers import dispatch_events
+from app.domain.users.service import UserService
+
+logger = logging.getLogger(__name__)
+
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+class BulkDeactivationJobService(BaseService):
+    """Сервис задач массовой деактивации."""
+
+    def __init__(self, session: AsyncSession):
+        super().__init__(session)
+        self.job_repo = BulkJobRepository(session)
+
+    async def create_job(self, user_ids: list[str]) -> dict:
+        """Поставить деактивацию пользователей в очередь."""
+        job = await self.job_repo.create(user_ids)
+        return {"job_id": job.job_id, "status": job.status}
+
+    async def get_job(self, job_id: str) -> dict:
+        """Прогресс задачи."""
+        job = await self.job_repo.get_by_id(job_id)
+        if not job:
+            raise NotFoundException("Job")
+        return job_progress(job)
+
+
+def job_progress(job: BulkDeactivationJob) -> dict:
+    """Представление задачи для API."""
+    return {
+        "job_id": job.job_id,
+        "status": job.status,
+        "total": len(job.user_ids),
+        "processed": job.processed,
+        "deactivated_count": job.deactivated_count,
+        "reassigned_prs_count": job.reassigned_prs_count,
+        "errors": job.errors,
+        "attempts": job.attempts,
+        "created_at": job.created_at,
+        "finished_at": job.finished_at,
+    }
+
+
+async def run_bulk_job_worker(session_maker: async_sessionmaker = async_session_maker):
+    """Обрабатывать задачи по одной; без задач — опрашивать раз в BULK_JOB_POLL_INTERVAL."""
+    if not settings.BULK_JOB_WORKER_ENABLED:
+        return
+
+    while True:
+        try:
+            claimed = await process_next_job(session_maker)
+        except Exception:
+            logger.exception("Bulk deactivation worker failed")
+            claimed = False
+        if not claimed:
+            await asyncio.sleep(settings.BULK_JOB_POLL_INTERVAL)
+
+
+async def process_next_job(session_maker: async_sessionmaker = async_session_maker) -> bool:
+    """Арендовать и обработать одну задачу. False, если свободных задач нет."""
+    async with session_maker() as session:
+        job_id = await BulkJobRepository(session).claim_next(
+            WORKER_ID, settings.BULK_JOB_LEASE_SECONDS
+        )
+        await session.commit()
+
+    if job_id is None:
+        return False
+    await process_job(session_maker, job_id)
+    return True
+
+
+async def process_job(session_maker: async_sessionmaker, job_id: str):
+    """Обработать арендованную задачу пачками до конца или до потери аренды."""
+    while True:
+        async with session_maker() as session:
+            if not await _process_chunk(session, job_id):
+                return
+
+
+async def _process_chunk(session: AsyncSession, job_id: str) -> bool:
+    """
+    Обработать следующую пачку задачи в одной транзакции.
+    Возвращает False, когда задача завершена или аренда потеряна.
+    """
+    job_repo = BulkJobRepository(session)
+    job = await job_repo.get_by_id(job_id)
+    if job is None or job.locked_by != WORKER_ID:
+        return False
+
+    processed, errors = job.processed, list(job.errors)
+    chunk = job.user_ids[processed : processed + settings.BULK_JOB_CHUNK_SIZE]
+    if not chunk:
+        await job_repo.finish(job_id, WORKER_ID, "done", errors)
+        await session.commit()
+        return False
+
+    try:
+        found = {u.user_id for u in await UserRepository(session).get_users_by_ids(chunk)}
+        result = await UserService(session).bulk_deactivate_users(chunk)
+        advanced = await job_repo.advance(
+            job_id,
+            WORKER_ID,
+            processed_before=processed,
+            processed=processed + len(chunk),
+            deactivated=result["deactivated_count"],
+            reassigned=result["reassigned_prs_count"],
+            errors=errors
+            + [
+                {"user_id": user_id, "code": "NOT_FOUND", "message": "User not found"}
+                for user_id in chunk
+                if user_id not in found
+            ],
+            lease=settings.BULK_JOB_LEASE_SECONDS,
+        )
+    except Exception as exc:
+        await session.rollback()
+        logger.exception("Chunk of bulk deactivation job %s failed", job_id)
+        errors.append({"user_id": None, "code": "INTERNAL_ERROR", "message": str(exc)})
+        status = await job_repo.retry_later(
+            job_id,
+            WORKER_ID,
+            errors,
+            delay=settings.BULK_JOB_RETRY_DELAY,
+            max_attempts=settings.BULK_JOB_MAX_ATTEMPTS,
+        )
+        await session.commit()
+        if status == "failed":
+            logger.error("Bulk deactivation job %s failed after repeated errors", job_id)
+        return False
+
+    if not advanced:
+        # Аренду перехватил другой воркер: пачку обработает он
+        await session.rollback()
+        logger.warning("Lost lease on bulk deactivation job %s", job_id)
+        return False
+
+    await session.commit()
+    await dispatch_events(session)
+    return True
@@ -1,14 +1,17 @@
 """Сервис для работы с пользователями."""
 
-import random
-
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
 from app.core.exceptions import NotFoundException
-from app.db.models import PullRequest
+from app.db.models import User
 from app.db.repositories.pr_repository import PRRepository
+from app.db.repositories.team_repository import TeamRepository
 from app.db.repositories.user_repository import UserRepository
+from app.domain.assignment import ReviewerAssigner
 from app.domain.base_service import BaseService
+from app.domain.cache_keys import reviews_key, user_tag
+from app.domain.events import ReviewerChanged, RosterChanged, UsersActivityChanged, publish
 
 
 class UserService(BaseService):
@@ -18,6 +21,7 @@ class UserService(BaseService):
         super().__init__(session)
         self.user_repo = UserRepository(session)
         self.pr_repo = PRRepository(session)
+        self.assigner = ReviewerAssigner(self.user_repo)
 
     async def set_is_active(self, user_id: str, is_active: bool) -> dict:
         """Установить флаг активности пользователя."""
@@ -25,13 +29,14 @@ class UserService(BaseService):
         if not user:
             raise NotFoundException("User")
 
-        cache_service = await self._get_cache_service()
+        publish(self.session, UsersActivityChanged((user_id,), (user.team_name,), is_active))
+        if is_active:
+            publish(self.session, RosterChanged(added=((user_id, user.team_name),)))
+        else:
+            publish(self.session, RosterChanged(removed=((user_id, user.team_name),)))
 
         if not is_active:
-            await self._reassign_pull_requests([user_id])
-
-        await cache_service.delete_pattern(f"users:get_reviews:{user_id}:*")
-        await cache_service.delete(f"user:{user_id}")
+            await self._reassign_pull_requests([user])
 
         return {
             "user": {
@@ -45,18 +50,24 @@ class UserService(BaseService):
     async def get_reviews(self, user_id: str) -> dict:
         """Получить PR'ы, где пользователь назначен ревьювером."""
         cache_service = await self._get_cache_service()
-        cache_key = f"users:get_reviews:{user_id}"
-
-        cached_result = await cache_service.get(cache_key)
-        if cached_result is not None:
-            return cached_result
+        cache_key = await cache_service.tagged_key(reviews_key(user_id), user_tag(user_id))
+
+        return await cache_service.get_or_compute(
+            cache_key,
+            lambda: self._compute_reviews(user_id),
+            ttl=settings.CACHE_REVIEWS_TTL,
+            soft_ttl=settings.CACHE_SOFT_TTL,
+            refresh=self._detached("_compute_reviews", user_id),
+        )
 
+    async def _compute_reviews(self, user_id: str) -> dict:
+        """Загрузить PR'ы ревьювера из БД."""
         user = await self.user_repo.get_by_id(user_id)
         if not user:
             raise NotFoundException("User")
 
         prs = await self.user_repo.get_review_prs(user_id)
-        result = {
+        return {
             "user_id": user_id,
             "pull_requests": [
                 {
@@ -69,9 +80,6 @@ class UserService(BaseService):
             ],
         }
 
-        await cache_service.set(cache_key, result, ttl=300)
-        return result
-
     async def bulk_deactivate_users(self, user_ids: list[str]) -> dict:
 
         if not user_ids:
@@ -80,62 +88,78 @@ class UserService(BaseService):
         users_before = await self.user_repo.get_users_by_ids(user_ids)
         deactivated_count = await self.user_repo.bulk_deactivate_by_ids(user_ids)
 
-        cache = await self._get_cache_service()
-
-        await cache.delete_pattern("users:get_reviews:*")
-
-        for uid in user_ids:
-            await cache.delete(f"user:{uid}")
-            await cache.delete(f"users:get_reviews:{uid}")
-
-        teams = {u.team_name for u in users_before if u.team_name}
-        for team in teams:
-            await cache.delete_pattern(f"teams:get_team:{team}:*")
+        teams = sorted({u.team_name for u in users_before if u.team_name})
+        publish(self.session, UsersActivityChanged(tuple(user_ids), tuple(teams), False))
+        publish(
+            self.session,
+            RosterChanged(removed=tuple((u.user_id, u.team_name) for u in users_before)),
+        )
 
-        reassigned_count = await self._reassign_pull_requests(user_ids)
+        reassigned_count = await self._reassign_pull_requests(users_before)
 
         return {
             "deactivated_count": deactivated_count,
             "reassigned_prs_count": reassigned_count,
         }
 
-    async def _reassign_pull_requests(self, user_ids: list[str]) -> int:
-        prs = await self.user_repo.get_prs_by_reviewer_ids(user_ids)
-        reassigned_count = 0
-
-        for pr in prs:
-            reviewers_to_replace = [
-                r for r in pr.reviewers if r.user_id in user_ids and not r.is_active
-            ]
-            if not reviewers_to_replace:
-                continue
-
-            current_ids = [r.user_id for r in pr.reviewers]
-
-            for old in reviewers_to_replace:
-                reassigned = await self._reassign_single_reviewer(pr, old, current_ids)
-                reassigned_count += reassigned
+    async def deactivate_team(self, team_name: str) -> dict:
+        """
+        Деактивировать всех участников команды.
+        Замена ревьюверу ищется в его команде, а активных в ней не остаётся,
+        поэтому открытые ревью участников снимаются без замены — одним
+        удалением по команде, без списков ID и цикла по PR.
+        """
+        if not await TeamRepository(self.session).exists(team_name):
+            raise NotFoundException("Team")
+
+        user_ids = await self.user_repo.deactivate_team(team_name)
+        unassigned_count = await self.pr_repo.remove_team_reviews(team_name)
+
+        # Теги списков ревью деактивированных сбрасывает UsersActivityChanged,
+        # поэтому ReviewerChanged по каждому снятому ревью не публикуется
+        publish(self.session, UsersActivityChanged(tuple(user_ids), (team_name,), False))
+        publish(
+            self.session,
+            RosterChanged(removed=tuple((user_id, team_name) for user_id in user_ids)),
+        )
 
-        return reassigned_count
+        return {
+            "team_name": team_name,
+            "deactivated_count": len(user_ids),
+            "unassigned_reviews_count": unassigned_count,
+        }
 
-    async def _reassign_single_reviewer(self, pr: PullRequest, old_reviewer, current_ids) -> int:
-        candidates = await self.user_repo.get_active_candidates_for_pr(
-            excluded_user_ids=[old_reviewer.user_id],
-            current_pr_reviewers_ids=current_ids,
-            limit=10,
+    async def _reassign_pull_requests(self, users: list[User]) -> int:
+        """
+        Заменить неактивных пользователей из users во всех открытых PR.
+        План замен строится в памяти по снимкам команд, а применяется
+        одним удалением, одной вставкой и пачкой обновлений счётчиков.
+        """
+        teams = {u.user_id: u.team_name for u in users if not u.is_active}
+        assignments = await self.pr_repo.get_open_review_assignments(list(teams))
+        if not assignments:
+            return 0
+
+        batch = await self.assigner.batch(
+            {teams[uid] for _, ids in assignments.values() for uid in ids if uid in teams},
+            inactive=teams.keys(),
         )
 
-        if candidates:
-            new = random.choice(candidates)
-            await self.pr_repo.reassign_reviewer(
-                pr.pull_request_id, old_reviewer.user_id, new.user_id
-            )
-            return 1
-
-        try:
-            pr.reviewers.remove(old_reviewer)
-        except ValueError:
-            pass
+        changes: list[tuple[str, str, str | None]] = []
+        for pr_id, (author_id, reviewer_ids) in assignments.items():
+            # Автор, текущие ревьюверы и уже выбранные в плане замены этого PR
+            taken = {author_id, *reviewer_ids}
+            for old_reviewer_id in reviewer_ids:
+                if old_reviewer_id not in teams:
+                    continue
+                picked = batch.pick(teams[old_reviewer_id], 1, exclude=taken)
+                taken.update(picked)
+                changes.append((pr_id, old_reviewer_id, picked[0] if picked else None))
+
+        await self.pr_repo.apply_reviewer_changes(
+            changes, {pr_id: len(ids) for pr_id, (_, ids) in assignments.items()}
+        )
+        for pr_id, old_reviewer_id, new_reviewer_id in changes:
+            publish(self.session, ReviewerChanged(pr_id, old_reviewer_id, new_reviewer_id))
 
-        await self.session.flush()
-        return 0
+        return sum(new_reviewer_id is not None for _, _, new_reviewer_id in changes)
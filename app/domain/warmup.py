@@ -0,0 +1,169 @@
+"""
+Прогрев кеша после старта приложения.
+
+Заполняет статистику, составы самых активных команд и очереди ревью
+самых загруженных ревьюверов, а также готовые тела ответов /stats и
+/users/getReview, пока инстанс ещё не принимает трафик.
+Прогрев ограничен по числу ключей, параллельности и времени; готовность
+инстанса (/health/ready) выставляется после завершения прогрева или по таймауту.
+"""
+
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import asdict, dataclass
+
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.api.response_cache import render_json
+from app.core.cache import CacheService, get_cache, get_local_cache
+from app.core.config import settings
+from app.core.database import async_session_maker
+from app.db.repositories.team_repository import TeamRepository
+from app.db.repositories.user_repository import UserRepository
+from app.domain.cache_keys import (
+    STATS_KEY,
+    STATS_RESPONSE_KEY,
+    STATS_TAG,
+    reviews_key,
+    reviews_response_key,
+    team_key,
+    team_tag,
+    user_tag,
+)
+from app.domain.stats.service import StatsService
+from app.domain.teams.service import TeamService
+from app.domain.users.service import UserService
+from app.schemas.stats import StatsResponse
+from app.schemas.user import GetReviewsResponse
+
+logger = logging.getLogger(__name__)
+
+WarmupJob = Callable[[AsyncSession], Awaitable[object]]
+
+
+@dataclass
+class WarmupStatus:
+    """Состояние прогрева: pending, running, done, timeout, failed или skipped."""
+
+    state: str = "pending"
+    warmed: int = 0
+    failed: int = 0
+    duration: float | None = None
+
+    @property
+    def ready(self) -> bool:
+        return self.state not in ("pending", "running")
+
+    def snapshot(self) -> dict:
+        return {**asdict(self), "ready": self.ready}
+
+
+warmup_status = WarmupStatus()
+
+
+async def run_warmup(session_maker: async_sessionmaker = async_session_maker):
+    """Прогреть кеш с ограничением по времени и выставить готовность инстанса."""
+    if not settings.CACHE_WARMUP_ENABLED or await get_cache() is None:
+        warmup_status.state = "skipped"
+        return
+
+    warmup_status.state = "running"
+    started = time.monotonic()
+    try:
+        await asyncio.wait_for(warm_up_cache(session_maker), settings.CACHE_WARMUP_TIMEOUT)
+        warmup_status.state = "done"
+    except TimeoutError:
+        warmup_status.state = "timeout"
+        logger.warning("Cache warm-up timed out after %.1fs", settings.CACHE_WARMUP_TIMEOUT)
+    except Exception:
+        warmup_status.state = "failed"
+        logger.exception("Cache warm-up failed")
+    finally:
+        warmup_status.duration = round(time.monotonic() - started, 3)
+
+    logger.info(
+        "Cache warm-up %s: %d keys warmed, %d failed in %.3fs",
+        warmup_status.state,
+        warmup_status.warmed,
+        warmup_status.failed,
+        warmup_status.duration,
+    )
+
+
+async def warm_up_cache(session_maker: async_sessionmaker = async_session_maker):
+    """
+    Заполнить кеш горячими ключами. Ключи, которые уже есть в Redis (например,
+    их прогрел другой инстанс), читаются одним MGET и заодно попадают в L1;
+    остальные вычисляются, каждый в собственной сессии. Тела ответов
+    кодируются render_json, как в cached_json_response, и записываются
+    одним пайплайном на каждый TTL (set_many).
+    """
+    async with session_maker() as session:
+        team_names = await TeamRepository(session).get_most_active_names(
+            settings.CACHE_WARMUP_TEAMS
+        )
+        reviewer_ids = await UserRepository(session).get_most_loaded_reviewer_ids(
+            settings.CACHE_WARMUP_REVIEWERS
+        )
+
+    cache_service = CacheService(await get_cache(), local_cache_instance=get_local_cache())
+    # Поколения всех тегов одним MGET: дальше tagged_key берёт их из L1
+    await cache_service.get_generations(
+        [STATS_TAG, *map(team_tag, team_names), *map(user_tag, reviewer_ids)]
+    )
+
+    stats_key = await cache_service.tagged_key(STATS_KEY, STATS_TAG)
+    jobs: dict[str, WarmupJob] = {stats_key: lambda s: StatsService(s).get_stats()}
+    for name in team_names:
+        key = await cache_service.tagged_key(team_key(name), team_tag(name))
+        jobs[key] = lambda s, name=name: TeamService(s).get_team(name)
+
+    # Готовые тела ответов /stats и /users/getReview: запросы читают их раньше
+    # ключей сервисов (см. app.api.response_cache), поэтому прогреваются и они
+    responses: dict[str, tuple[str, type[BaseModel], int]] = {}
+    if settings.RESPONSE_CACHE_ENABLED:
+        responses[stats_key] = (
+            await cache_service.tagged_key(STATS_RESPONSE_KEY, STATS_TAG),
+            StatsResponse,
+            settings.CACHE_SOFT_TTL,
+        )
+    for uid in reviewer_ids:
+        key = await cache_service.tagged_key(reviews_key(uid), user_tag(uid))
+        jobs[key] = lambda s, uid=uid: UserService(s).get_reviews(uid)
+        if settings.RESPONSE_CACHE_ENABLED:
+            responses[key] = (
+                await cache_service.tagged_key(reviews_response_key(uid), user_tag(uid)),
+                GetReviewsResponse,
+                settings.CACHE_REVIEWS_TTL,
+            )
+
+    cached = await cache_service.get_many(
+        [*jobs, *(response_key for response_key, _, _ in responses.values())]
+    )
+    data = {key: value for key, value in cached.items() if key in jobs}
+    warmup_status.warmed += len(cached)
+
+    semaphore = asyncio.Semaphore(max(settings.CACHE_WARMUP_CONCURRENCY, 1))
+
+    async def warm(key: str, job: WarmupJob):
+        async with semaphore:
+            try:
+                async with session_maker() as job_session:
+                    data[key] = await job(job_session)
+                warmup_status.warmed += 1
+            except Exception:
+                warmup_status.failed += 1
+                logger.debug("Cache warm-up job failed", exc_info=True)
+
+    await asyncio.gather(*(warm(key, job) for key, job in jobs.items() if key not in cached))
+
+    bodies: dict[int, dict[str, bytes]] = {}
+    for key, (response_key, response_model, ttl) in responses.items():
+        if response_key not in cached and key in data:
+            bodies.setdefault(ttl, {})[response_key] = render_json(response_model, data[key])
+    for ttl, items in bodies.items():
+        await cache_service.set_many(items, ttl=ttl)
+        warmup_status.warmed += len(items)
@@ -1,6 +1,7 @@
 """Главный модуль FastAPI приложения."""
 
-from contextlib import asynccontextmanager
+import asyncio
+from contextlib import asynccontextmanager, suppress
 from pathlib import Path
 
 import yaml
@@ -16,6 +17,9 @@ from app.core.exceptions import (
     service_exception_handler,
     validation_exception_handler,
 )
+from app.domain.roster import run_roster_index
+from app.domain.users.jobs import run_bulk_job_worker
+from app.domain.warmup import run_warmup
 
 
 @asynccontextmanager
@@ -23,8 +27,15 @@ async def lifespan(app: FastAPI):
     """Lifecycle events."""
     # Startup
     await init_db()
+    roster_task = asyncio.create_task(run_roster_index())
+    warmup_task = asyncio.create_task(run_warmup())
+    bulk_job_task = asyncio.create_task(run_bulk_job_worker())
     yield
     # Shutdown
+    for task in (bulk_job_task, warmup_task, roster_task):
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
     await close_db()
 
 
@@ -44,6 +44,34 @@ class CreatePRRequest(BaseModel):
     author_id: str
 
 
+class CreatePRBatchRequest(BaseModel):
+    """Запрос на пакетное создание PR."""
+
+    pull_requests: list[CreatePRRequest] = Field(min_length=1)
+
+
+class PRBatchError(BaseModel):
+    """Ошибка создания одного PR из пачки."""
+
+    code: str
+    message: str
+
+
+class PRBatchItemResult(BaseModel):
+    """Результат создания одного PR из пачки: pr или error."""
+
+    pull_request_id: str
+    pr: PullRequestSchema | None = None
+    error: PRBatchError | None = None
+
+
+class CreatePRBatchResponse(BaseModel):
+    """Ответ на пакетное создание PR."""
+
+    created_count: int
+    results: list[PRBatchItemResult]
+
+
 class MergePRRequest(BaseModel):
     """Запрос на merge PR."""
 
@@ -1,6 +1,8 @@
 """Схемы для статистики."""
 
-from pydantic import BaseModel
+from datetime import date
+
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class UserStatsSchema(BaseModel):
@@ -29,3 +31,70 @@ class StatsResponse(BaseModel):
 
     users: list[UserStatsSchema]
     pull_requests: PRStatsSchema
+
+
+class UserStatsPageResponse(BaseModel):
+    """Страница статистики пользователей."""
+
+    users: list[UserStatsSchema]
+    next_after: str | None
+
+
+class TeamDayStatsSchema(BaseModel):
+    """Нагрузка ревью команды за день."""
+
+    date: date
+    assigned: int
+    merged: int
+    open: int
+
+
+class ReviewerLoadSchema(BaseModel):
+    """Нагрузка ревьювера за интервал; open — на конец интервала."""
+
+    user_id: str
+    assigned: int
+    merged: int
+    open: int
+
+
+class TeamStatsResponse(BaseModel):
+    """Нагрузка ревью команды по дням."""
+
+    model_config = ConfigDict(populate_by_name=True)
+
+    team_name: str
+    date_from: date = Field(alias="from")
+    date_to: date = Field(alias="to")
+    days: list[TeamDayStatsSchema]
+    reviewers: list[ReviewerLoadSchema]
+
+
+class DistributionSchema(BaseModel):
+    """Распределение числа ревью между пользователями группы."""
+
+    mean: float
+    min: float
+    max: float
+    p50: float
+    p90: float
+    p99: float
+    gini: float
+    max_to_min: float | None
+    max_to_mean: float | None
+
+
+class TeamFairnessSchema(BaseModel):
+    """Равномерность ревью в команде (team_name = None — по всем активным пользователям)."""
+
+    team_name: str | None
+    active_users: int
+    open_reviews: DistributionSchema
+    total_reviews: DistributionSchema
+
+
+class FairnessResponse(BaseModel):
+    """Метрики равномерности распределения ревью."""
+
+    overall: TeamFairnessSchema | None
+    teams: list[TeamFairnessSchema]
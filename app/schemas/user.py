@@ -1,5 +1,7 @@
 """Схемы для пользователей."""
 
+from datetime import datetime
+
 from pydantic import BaseModel, ConfigDict
 
 from app.schemas.pr import PullRequestShortSchema
@@ -42,6 +44,44 @@ class BulkDeactivateResponse(BaseModel):
     reassigned_prs_count: int
 
 
+class TeamDeactivateResponse(BaseModel):
+    """Ответ на деактивацию команды."""
+
+    team_name: str
+    deactivated_count: int
+    unassigned_reviews_count: int
+
+
+class BulkDeactivateJobResponse(BaseModel):
+    """Ответ на постановку массовой деактивации в очередь."""
+
+    job_id: str
+    status: str
+
+
+class BulkDeactivateJobError(BaseModel):
+    """Ошибка обработки пользователя в задаче массовой деактивации."""
+
+    user_id: str | None
+    code: str
+    message: str
+
+
+class BulkDeactivateJobStatusResponse(BaseModel):
+    """Прогресс задачи массовой деактивации."""
+
+    job_id: str
+    status: str
+    total: int
+    processed: int
+    deactivated_count: int
+    reassigned_prs_count: int
+    errors: list[BulkDeactivateJobError]
+    attempts: int
+    created_at: datetime
+    finished_at: datetime | None
+
+
 class GetReviewsResponse(BaseModel):
     """Ответ со списком PR'ов пользователя."""
 
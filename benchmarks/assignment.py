@@ -0,0 +1,47 @@
+"""
+Микробенчмарк стратегий назначения ревьюверов.
+
+Запуск: python -m benchmarks.assignment [--sizes 10,100,1000,10000]
+Измеряет только решение стратегии по снимку команды в памяти (выбор двух
+ревьюверов при исключённом авторе), без загрузки снимка из БД.
+"""
+
+import argparse
+import random
+
+from app.domain.assignment import STRATEGIES, Roster
+from benchmarks.common import timeit
+
+
+def build_roster(size: int, seed_value: int = 42) -> Roster:
+    """Снимок команды из size участников со случайной нагрузкой 0..9."""
+    rng = random.Random(seed_value)
+    user_ids = tuple(sorted(f"u-{i:06}" for i in range(size)))
+    return Roster("team-0", user_ids, tuple(rng.randrange(10) for _ in user_ids))
+
+
+def run(sizes: list[int], repeat: int):
+    header = f"{'strategy':<16}" + "".join(f"{size:>12}" for size in sizes)
+    print(header + "   (us per decision)")
+    print("-" * len(header))
+    rosters = [build_roster(size) for size in sizes]
+    for name, strategy in sorted(STRATEGIES.items()):
+        row = f"{name:<16}"
+        for roster in rosters:
+            exclude = {roster.user_ids[0]}
+            elapsed = timeit(lambda s=strategy, r=roster, e=exclude: s.choose(r, 2, e), repeat)
+            row += f"{elapsed:>12.2f}"
+        print(row)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", default="10,100,1000,10000")
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+
+    run([int(size) for size in args.sizes.split(",")], args.repeat)
+
+
+if __name__ == "__main__":
+    main()
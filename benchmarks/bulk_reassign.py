@@ -0,0 +1,81 @@
+"""
+Бенчмарк переназначения ревью при массовой деактивации.
+
+Запуск: python -m benchmarks.bulk_reassign [--prs 10,100,1000]
+Деактивируется один ревьювер, назначенный на N открытых PR. Сравнивается
+пакетное переназначение bulk_deactivate_users с заменой по одному PR через
+reassign_reviewer (так раньше работал цикл по PR). Для каждого варианта
+выводятся число SQL-запросов и время; изменения откатываются после замера.
+"""
+
+import argparse
+import asyncio
+import time
+
+from sqlalchemy import update
+
+from app.db.models import User
+from app.db.repositories.pr_repository import PRRepository
+from app.domain.pull_requests.service import PullRequestService
+from app.domain.users.service import UserService
+from benchmarks.common import bench_sessionmaker, count_statements, seed
+
+VICTIM = "u-0-1"
+
+
+async def batched(session):
+    await UserService(session).bulk_deactivate_users([VICTIM])
+
+
+async def per_pr(session, pr_ids: list[str]):
+    await session.execute(update(User).where(User.user_id == VICTIM).values(is_active=False))
+    pr_service = PullRequestService(session)
+    for pr_id in pr_ids:
+        await pr_service.reassign_reviewer(pr_id, VICTIM)
+
+
+async def measure(prs: int, users_per_team: int) -> dict[str, tuple[int, float]]:
+    results = {}
+    async with bench_sessionmaker() as sessionmaker:
+        async with sessionmaker() as session:
+            await seed(session, 1, users_per_team, 0)
+            pr_ids = [f"victim-pr-{n}" for n in range(prs)]
+            pr_repo = PRRepository(session)
+            for n, pr_id in enumerate(pr_ids):
+                other = f"u-0-{2 + n % (users_per_team - 2)}"
+                await pr_repo.create_with_reviewers(pr_id, pr_id, "u-0-0", [VICTIM, other])
+            await session.commit()
+
+            engine = session.bind.sync_engine
+            for name, run in (("batched", batched), ("per-PR", lambda s: per_pr(s, pr_ids))):
+                with count_statements(engine) as counter:
+                    start = time.perf_counter()
+                    await run(session)
+                    await session.flush()
+                    elapsed = (time.perf_counter() - start) * 1e3
+                results[name] = (counter[0], elapsed)
+                await session.rollback()
+    return results
+
+
+async def run(sizes: list[int], users_per_team: int):
+    header = f"{'PRs':>6}{'batched, queries':>18}{'batched, ms':>13}{'per-PR, queries':>17}{'per-PR, ms':>12}"
+    print(header)
+    print("-" * len(header))
+    for prs in sizes:
+        results = await measure(prs, users_per_team)
+        (bq, bt), (pq, pt) = results["batched"], results["per-PR"]
+        print(f"{prs:>6}{bq:>18}{bt:>13.1f}{pq:>17}{pt:>12.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--prs", default="10,100,1000")
+    parser.add_argument("--users-per-team", type=int, default=200)
+    args = parser.parse_args()
+
+    asyncio.run(run([int(size) for size in args.prs.split(",")], args.users_per_team))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Бенчмарк кодеков кеша на реальных ответах сервисов.
+
+Запуск: python -m benchmarks.cache_codecs
+Payload'ы строятся настоящими методами сервисов на сгенерированной БД
+(по умолчанию 4000 пользователей, как в нагрузочном тесте).
+"""
+
+import argparse
+import asyncio
+
+from app.core.cache_codecs import CODECS, COMPRESSORS, CacheSerializer
+from app.domain.stats.service import StatsService
+from app.domain.teams.service import TeamService
+from app.domain.users.service import UserService
+from benchmarks.common import bench_sessionmaker, seed, timeit
+
+
+async def build_payloads(teams: int, users_per_team: int, prs: int) -> dict[str, dict]:
+    """Получить ответы /stats, /team/get и /users/getReview без кеша."""
+    async with bench_sessionmaker() as sessionmaker:
+        async with sessionmaker() as session:
+            roster = await seed(session, teams, users_per_team, prs)
+            team_name = next(iter(roster))
+            busiest = roster[team_name][0]
+            return {
+                "stats:get_stats": await StatsService(session)._compute_stats(),
+                "teams:get_team": await TeamService(session)._compute_team(team_name),
+                "users:get_reviews": await UserService(session)._compute_reviews(busiest),
+            }
+
+
+def run(payloads: dict[str, dict], repeat: int):
+    """Вывести время кодирования/декодирования и размер для всех кодеков и сжатий."""
+    header = f"{'payload':<20}{'codec':<10}{'compression':<13}{'bytes':>10}{'encode, us':>13}{'decode, us':>13}"
+    print(header)
+    print("-" * len(header))
+    for key, payload in payloads.items():
+        for codec in CODECS:
+            for compression in COMPRESSORS:
+                serializer = CacheSerializer(
+                    codec, compression=compression, compression_threshold=1
+                )
+                data = serializer.dumps(key, payload)
+                encode = timeit(lambda s=serializer, k=key, p=payload: s.dumps(k, p), repeat)
+                decode = timeit(lambda s=serializer, d=data: s.loads(d), repeat)
+                print(
+                    f"{key:<20}{codec:<10}{compression:<13}{len(data):>10}"
+                    f"{encode:>13.1f}{decode:>13.1f}"
+                )
+        print()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--teams", type=int, default=20)
+    parser.add_argument("--users-per-team", type=int, default=200)
+    parser.add_argument("--prs", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    payloads = asyncio.run(build_payloads(args.teams, args.users_per_team, args.prs))
+    run(payloads, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""Общие утилиты бенчмарков: тестовая БД и генерация данных."""
+
+import os
+import random
+import time
+from contextlib import asynccontextmanager, contextmanager
+from datetime import datetime, timedelta
+
+from sqlalchemy import event, insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from app.core.database import Base
+from app.db.models import PullRequest, Team, User, pr_reviewers
+from app.db.repositories.stats_repository import StatsRepository
+
+BENCH_DATABASE_URL = os.getenv("BENCH_DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+_INSERT_BATCH = 5000
+
+
+@asynccontextmanager
+async def bench_sessionmaker():
+    """
+    Создать пустую схему в BENCH_DATABASE_URL и вернуть фабрику сессий.
+    По умолчанию используется SQLite в памяти; для цифр, сопоставимых с продом,
+    укажите PostgreSQL: BENCH_DATABASE_URL=postgresql+asyncpg://...
+    """
+    kwargs = {}
+    if BENCH_DATABASE_URL.startswith("sqlite"):
+        kwargs = {"connect_args": {"check_same_thread": False}, "poolclass": StaticPool}
+    engine = create_async_engine(BENCH_DATABASE_URL, **kwargs)
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+
+    try:
+        yield async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    finally:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.drop_all)
+        await engine.dispose()
+
+
+async def seed(
+    session: AsyncSession,
+    teams: int,
+    users_per_team: int,
+    prs: int,
+    merged_ratio: float = 0.5,
+    seed_value: int = 42,
+) -> dict[str, list[str]]:
+    """
+    Заполнить БД командами, пользователями и PR с двумя ревьюверами из команды автора.
+    Возвращает состав команд: {team_name: [user_id, ...]}.
+    """
+    rng = random.Random(seed_value)
+    roster = {f"team-{t}": [f"u-{t}-{i}" for i in range(users_per_team)] for t in range(teams)}
+
+    await session.execute(insert(Team), [{"team_name": name} for name in roster])
+    await _insert_batched(
+        session,
+        User,
+        [
+            {"user_id": uid, "username": f"User {uid}", "team_name": name, "is_active": True}
+            for name, user_ids in roster.items()
+            for uid in user_ids
+        ],
+    )
+
+    now = datetime.utcnow()
+    team_names = list(roster)
+    pr_rows, reviewer_rows = [], []
+    for n in range(prs):
+        members = roster[rng.choice(team_names)]
+        author, *reviewers = rng.sample(members, min(3, len(members)))
+        merged = rng.random() < merged_ratio
+        created_at = now - timedelta(minutes=prs - n)
+        pr_rows.append(
+            {
+                "pull_request_id": f"pr-{n}",
+                "pull_request_name": f"PR {n}",
+                "author_id": author,
+                "status": "MERGED" if merged else "OPEN",
+                "created_at": created_at,
+                "merged_at": created_at + timedelta(minutes=1) if merged else None,
+            }
+        )
+        reviewer_rows.extend({"pr_id": f"pr-{n}", "reviewer_id": uid} for uid in reviewers)
+
+    await _insert_batched(session, PullRequest, pr_rows)
+    await _insert_batched(session, pr_reviewers, reviewer_rows)
+    await StatsRepository(session).rebuild()
+    await StatsRepository(session).rebuild_rollups()
+    await session.commit()
+    return roster
+
+
+async def _insert_batched(session: AsyncSession, table, rows: list[dict]):
+    """Вставить строки пачками."""
+    for start in range(0, len(rows), _INSERT_BATCH):
+        await session.execute(insert(table), rows[start : start + _INSERT_BATCH])
+
+
+def timeit(func, repeat: int) -> float:
+    """Среднее время вызова func в микросекундах."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+async def atimeit(func, repeat: int) -> float:
+    """Среднее время вызова корутины func в миллисекундах."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        await func()
+    return (time.perf_counter() - start) / repeat * 1e3
+
+
+@contextmanager
+def count_statements(engine):
+    """Считать SQL-запросы, выполненные движком внутри блока."""
+    counter = [0]
+
+    def before_cursor_execute(*args):
+        counter[0] += 1
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield counter
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
@@ -0,0 +1,109 @@
+"""
+Бенчмарк запросов по большим спискам ID.
+
+Запуск: python -m benchmarks.id_lists [--ids 1000,10000,50000]
+Сравниваются методы репозиториев, которые передают список через _id_filters
+(на PostgreSQL — один параметр-массив в = ANY(:ids), на SQLite — IN по кускам),
+с одним IN на весь список, где каждый ID — отдельный параметр. Для каждого
+варианта выводятся число SQL-запросов и время; «—» — запрос отклонён СУБД
+(SQLite допускает не больше 32766 параметров, asyncpg — 32767).
+Для PostgreSQL укажите BENCH_DATABASE_URL=postgresql+asyncpg://...
+"""
+
+import argparse
+import asyncio
+import time
+
+from sqlalchemy import select, update
+
+from app.db.models import PullRequest, User, pr_reviewers
+from app.db.repositories.pr_repository import PRRepository
+from app.db.repositories.user_repository import UserRepository
+from benchmarks.common import bench_sessionmaker, count_statements, seed
+
+
+async def plain_get_users(session, ids):
+    return (await session.execute(select(User).where(User.user_id.in_(ids)))).scalars().all()
+
+
+async def plain_deactivate(session, ids):
+    await session.execute(
+        update(User)
+        .where(User.user_id.in_(ids), User.is_active == True)  # noqa: E712
+        .values(is_active=False)
+        .execution_options(synchronize_session="fetch")
+    )
+
+
+async def plain_assignments(session, ids):
+    affected = select(pr_reviewers.c.pr_id).where(pr_reviewers.c.reviewer_id.in_(ids))
+    query = (
+        select(PullRequest.pull_request_id, PullRequest.author_id, pr_reviewers.c.reviewer_id)
+        .join(pr_reviewers, pr_reviewers.c.pr_id == PullRequest.pull_request_id)
+        .where(PullRequest.status == "OPEN", PullRequest.pull_request_id.in_(affected))
+    )
+    return (await session.execute(query)).all()
+
+
+CASES = {
+    "get_users_by_ids": (
+        lambda s, ids: UserRepository(s).get_users_by_ids(ids),
+        plain_get_users,
+    ),
+    "bulk_deactivate_by_ids": (
+        lambda s, ids: UserRepository(s).bulk_deactivate_by_ids(ids),
+        plain_deactivate,
+    ),
+    "get_open_review_assignments": (
+        lambda s, ids: PRRepository(s).get_open_review_assignments(ids),
+        plain_assignments,
+    ),
+}
+
+
+async def timed(session, run, ids) -> tuple[int, float | None]:
+    engine = session.bind.sync_engine
+    with count_statements(engine) as counter:
+        start = time.perf_counter()
+        try:
+            await run(session, ids)
+        except Exception:
+            await session.rollback()
+            return counter[0], None
+        elapsed = (time.perf_counter() - start) * 1e3
+    await session.rollback()
+    session.expunge_all()
+    return counter[0], elapsed
+
+
+async def run(sizes: list[int]):
+    header = f"{'method':<29}{'ids':>7}{'array/chunks':>14}{'ms':>9}{'single IN':>11}{'ms':>9}"
+    print(header)
+    print("-" * len(header))
+    async with bench_sessionmaker() as sessionmaker:
+        async with sessionmaker() as session:
+            roster = await seed(session, 5, max(sizes) // 5, max(sizes) // 2)
+            all_ids = [uid for user_ids in roster.values() for uid in user_ids]
+
+            for name, (batched, plain) in CASES.items():
+                for size in sizes:
+                    ids = all_ids[:size]
+                    bq, bt = await timed(session, batched, ids)
+                    pq, pt = await timed(session, plain, ids)
+                    print(f"{name:<29}{size:>7}{bq:>14}{_ms(bt):>9}{pq:>11}{_ms(pt):>9}")
+
+
+def _ms(value: float | None) -> str:
+    return "—" if value is None else f"{value:.1f}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--ids", default="1000,10000,50000")
+    args = parser.parse_args()
+
+    asyncio.run(run([int(size) for size in args.ids.split(",")]))
+
+
+if __name__ == "__main__":
+    main()
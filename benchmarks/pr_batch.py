@@ -0,0 +1,95 @@
+"""
+Бенчмарк пакетного создания PR.
+
+Запуск: python -m benchmarks.pr_batch [--prs 100,1000] [--teams 20] [--users-per-team 50]
+Импорт N новых PR от случайных авторов: create_prs пачками по PR_BATCH_MAX_SIZE
+сравнивается с create_pr на каждый PR, оба варианта — одной транзакцией на пачку
+(по одному PR — транзакция на PR, как при отдельных запросах /pullRequest/create).
+Для каждого варианта выводятся число SQL-запросов, время и PR в секунду.
+"""
+
+import argparse
+import asyncio
+import random
+import time
+
+from app.core.config import settings
+from app.domain.pull_requests.service import PullRequestService
+from benchmarks.common import bench_sessionmaker, count_statements, seed
+
+
+def make_items(roster: dict[str, list[str]], prs: int, prefix: str) -> list[dict]:
+    rng = random.Random(7)
+    authors = [uid for members in roster.values() for uid in members]
+    return [
+        {
+            "pull_request_id": f"{prefix}-{n}",
+            "pull_request_name": f"Import {n}",
+            "author_id": rng.choice(authors),
+        }
+        for n in range(prs)
+    ]
+
+
+async def batched(sessionmaker, items: list[dict]):
+    size = settings.PR_BATCH_MAX_SIZE
+    for start in range(0, len(items), size):
+        async with sessionmaker() as session:
+            await PullRequestService(session).create_prs(items[start : start + size])
+            await session.commit()
+
+
+async def one_by_one(sessionmaker, items: list[dict]):
+    for item in items:
+        async with sessionmaker() as session:
+            await PullRequestService(session).create_pr(
+                item["pull_request_id"], item["pull_request_name"], item["author_id"]
+            )
+            await session.commit()
+
+
+async def measure(prs: int, teams: int, users_per_team: int) -> dict[str, tuple[int, float]]:
+    results = {}
+    async with bench_sessionmaker() as sessionmaker:
+        async with sessionmaker() as session:
+            roster = await seed(session, teams, users_per_team, 0)
+            engine = session.bind.sync_engine
+
+        for name, run in (("batch", batched), ("single", one_by_one)):
+            items = make_items(roster, prs, name)
+            with count_statements(engine) as counter:
+                start = time.perf_counter()
+                await run(sessionmaker, items)
+                elapsed = time.perf_counter() - start
+            results[name] = (counter[0], elapsed)
+    return results
+
+
+async def run(sizes: list[int], teams: int, users_per_team: int):
+    header = (
+        f"{'prs':>7}{'batch, queries':>16}{'batch, ms':>11}{'batch, PR/s':>13}"
+        f"{'single, queries':>17}{'single, ms':>12}{'single, PR/s':>14}"
+    )
+    print(header)
+    print("-" * len(header))
+    for prs in sizes:
+        results = await measure(prs, teams, users_per_team)
+        (bq, bt), (sq, st) = results["batch"], results["single"]
+        print(
+            f"{prs:>7}{bq:>16}{bt * 1e3:>11.0f}{prs / bt:>13.0f}"
+            f"{sq:>17}{st * 1e3:>12.0f}{prs / st:>14.0f}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--prs", default="100,1000")
+    parser.add_argument("--teams", type=int, default=20)
+    parser.add_argument("--users-per-team", type=int, default=50)
+    args = parser.parse_args()
+
+    asyncio.run(run([int(size) for size in args.prs.split(",")], args.teams, args.users_per_team))
+
+
+if __name__ == "__main__":
+    main()
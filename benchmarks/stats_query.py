@@ -0,0 +1,100 @@
+"""
+Бенчмарк запроса статистики /stats.
+
+Запуск: python -m benchmarks.stats_query [--prs 10000,100000,1000000]
+Сравнивает прежний путь (агрегация по pull_requests и pr_reviewers тремя
+последовательными запросами) с чтением счётчиков одним запросом.
+"""
+
+import argparse
+import asyncio
+
+from sqlalchemy import case, func, select
+
+from app.db.models import PullRequest, User, pr_reviewers
+from app.db.repositories.pr_repository import PRRepository
+from app.db.repositories.stats_repository import StatsRepository
+from benchmarks.common import atimeit, bench_sessionmaker, seed
+
+
+async def aggregate_user_stats(session) -> list[dict]:
+    """Статистика ревью пользователей полной агрегацией по pr_reviewers."""
+
+    review_stats = (
+        select(
+            pr_reviewers.c.reviewer_id,
+            func.count(pr_reviewers.c.pr_id).label("total_reviews"),
+            func.sum(case((PullRequest.status == "OPEN", 1), else_=0)).label("open_reviews"),
+        )
+        .join(PullRequest, pr_reviewers.c.pr_id == PullRequest.pull_request_id)
+        .group_by(pr_reviewers.c.reviewer_id)
+        .subquery()
+    )
+
+    query = (
+        select(
+            User.user_id,
+            User.username,
+            func.coalesce(review_stats.c.total_reviews, 0).label("total_reviews"),
+            func.coalesce(review_stats.c.open_reviews, 0).label("open_reviews"),
+        )
+        .outerjoin(review_stats, User.user_id == review_stats.c.reviewer_id)
+        .order_by(User.user_id)
+    )
+
+    result = await session.execute(query)
+    return [
+        {
+            "user_id": row.user_id,
+            "username": row.username,
+            "total_reviews": int(row.total_reviews or 0),
+            "open_reviews": int(row.open_reviews or 0),
+            "merged_reviews": int((row.total_reviews or 0) - (row.open_reviews or 0)),
+        }
+        for row in result.all()
+    ]
+
+
+async def aggregate_stats(session):
+    """Прежний путь: статистика пользователей, статусы PR и корзины ревьюверов."""
+    await aggregate_user_stats(session)
+    await PRRepository(session).get_stats()
+
+
+async def counters_stats(session):
+    """Текущий путь: один запрос к счётчикам."""
+    await StatsRepository(session).get_stats()
+
+
+async def measure(prs: int, teams: int, users_per_team: int, repeat: int) -> tuple[float, float]:
+    async with bench_sessionmaker() as sessionmaker:
+        async with sessionmaker() as session:
+            await seed(session, teams, users_per_team, prs)
+            before = await atimeit(lambda: aggregate_stats(session), repeat)
+            after = await atimeit(lambda: counters_stats(session), repeat)
+    return before, after
+
+
+async def run(sizes: list[int], teams: int, users_per_team: int, repeat: int):
+    header = f"{'PRs':>10}{'aggregate, ms':>16}{'counters, ms':>16}{'speedup':>10}"
+    print(header)
+    print("-" * len(header))
+    for prs in sizes:
+        before, after = await measure(prs, teams, users_per_team, repeat)
+        print(f"{prs:>10}{before:>16.1f}{after:>16.1f}{before / after:>9.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--prs", default="10000,100000,1000000")
+    parser.add_argument("--teams", type=int, default=20)
+    parser.add_argument("--users-per-team", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.prs.split(",")]
+    asyncio.run(run(sizes, args.teams, args.users_per_team, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Бенчмарк деактивации всей команды.
+
+Запуск: python -m benchmarks.team_deactivate [--members 1000,10000]
+Команда из N человек, у участников открытые ревью (по --prs-per-member PR на
+участника, половина влита). Сравнивается deactivate_team, которая работает
+запросами по команде, с bulk_deactivate_users со списком всех ID команды.
+Для каждого варианта выводятся число SQL-запросов и время; изменения
+откатываются после замера.
+"""
+
+import argparse
+import asyncio
+import time
+
+from sqlalchemy import select
+
+from app.db.models import User
+from app.domain.users.service import UserService
+from benchmarks.common import bench_sessionmaker, count_statements, seed
+
+TEAM = "team-0"
+
+
+async def by_team(session):
+    await UserService(session).deactivate_team(TEAM)
+
+
+async def by_ids(session):
+    result = await session.execute(select(User.user_id).where(User.team_name == TEAM))
+    await UserService(session).bulk_deactivate_users(list(result.scalars()))
+
+
+async def measure(members: int, prs_per_member: float) -> dict[str, tuple[int, float]]:
+    results = {}
+    async with bench_sessionmaker() as sessionmaker:
+        async with sessionmaker() as session:
+            await seed(session, 2, members, int(members * prs_per_member * 2))
+
+            engine = session.bind.sync_engine
+            for name, run in (("team", by_team), ("ids", by_ids)):
+                with count_statements(engine) as counter:
+                    start = time.perf_counter()
+                    await run(session)
+                    await session.flush()
+                    elapsed = (time.perf_counter() - start) * 1e3
+                results[name] = (counter[0], elapsed)
+                await session.rollback()
+    return results
+
+
+async def run(sizes: list[int], prs_per_member: float):
+    header = (
+        f"{'members':>8}{'team, queries':>15}{'team, ms':>10}{'ids, queries':>14}{'ids, ms':>10}"
+    )
+    print(header)
+    print("-" * len(header))
+    for members in sizes:
+        results = await measure(members, prs_per_member)
+        (tq, tt), (iq, it) = results["team"], results["ids"]
+        print(f"{members:>8}{tq:>15}{tt:>10.1f}{iq:>14}{it:>10.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--members", default="1000,10000")
+    parser.add_argument("--prs-per-member", type=float, default=1.0)
+    args = parser.parse_args()
+
+    asyncio.run(run([int(size) for size in args.members.split(",")], args.prs_per_member))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,43 @@
 """Конфигурация тестов."""
 
+import copy
+
 import pytest
+from httpx import ASGITransport, AsyncClient
+from redis.asyncio import WatchError
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.pool import StaticPool
 
+from app.api.dependencies import get_session, get_session_maker
+from app.core.cache import get_local_cache, redis_breaker
 from app.core.database import Base
 from app.db.models import Team, User
+from app.domain.event_handlers import dispatch_events, stats_invalidator
+from app.main import app
+
+
+@pytest.fixture(autouse=True)
+def clear_local_cache():
+    """Очистить процессный L1-кеш, чтобы тесты не влияли друг на друга."""
+    local = get_local_cache()
+    if local is not None:
+        local.clear()
+    yield
+
+
+@pytest.fixture(autouse=True)
+def reset_redis_breaker():
+    """Сбросить circuit breaker Redis между тестами."""
+    redis_breaker.reset()
+    yield
+
+
+@pytest.fixture(autouse=True)
+def reset_stats_invalidator():
+    """Сбросить ограничение частоты сброса статистики между тестами."""
+    stats_invalidator.reset()
+    yield
+    stats_invalidator.reset()
 
 
 @pytest.fixture(scope="function")
@@ -43,22 +75,118 @@ async def mock_cache(monkeypatch):
     """Mock Redis кеш."""
     cache_dict = {}
 
+    class MockPipeline:
+        def __init__(self, redis):
+            self.redis = redis
+            self.commands = []
+            self.watched = {}
+
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *exc_info):
+            self.commands, self.watched = [], {}
+
+        async def watch(self, *keys):
+            self.watched = {key: copy.deepcopy(cache_dict.get(key)) for key in keys}
+
+        def multi(self):
+            pass
+
+        def __getattr__(self, name):
+            def command(*args, **kwargs):
+                self.commands.append((name, args, kwargs))
+                return self
+
+            return command
+
+        async def execute(self):
+            watched, self.watched = self.watched, {}
+            if any(cache_dict.get(key) != value for key, value in watched.items()):
+                self.commands = []
+                raise WatchError("Watched variable changed")
+            results = []
+            for name, args, kwargs in self.commands:
+                results.append(await getattr(self.redis, name)(*args, **kwargs))
+            self.commands = []
+            return results
+
     class MockRedis:
+        def pipeline(self, transaction: bool = True):
+            return MockPipeline(self)
+
         async def get(self, key: str):
             return cache_dict.get(key)
 
         async def setex(self, key: str, ttl: int, value: str):
             cache_dict[key] = value
 
+        async def set(
+            self,
+            key: str,
+            value: str,
+            nx: bool = False,
+            ex: int | None = None,
+            px: int | None = None,
+        ):
+            if nx and key in cache_dict:
+                return None
+            cache_dict[key] = value
+            return True
+
+        async def eval(self, script: str, numkeys: int, key: str, token: str):
+            # Поддерживается только compare-and-delete освобождения блокировки.
+            if cache_dict.get(key) == token:
+                return await self.delete(key)
+            return 0
+
+        async def exists(self, *keys):
+            return sum(key in cache_dict for key in keys)
+
+        async def sadd(self, key: str, *members):
+            members_set = cache_dict.setdefault(key, set())
+            added = len(set(members) - members_set)
+            members_set.update(members)
+            return added
+
+        async def srem(self, key: str, *members):
+            members_set = cache_dict.get(key, set())
+            removed = len(members_set & set(members))
+            members_set.difference_update(members)
+            if not members_set:
+                cache_dict.pop(key, None)
+            return removed
+
+        async def srandmember(self, key: str, count: int):
+            import random
+
+            members = list(cache_dict.get(key, set()))
+            return random.sample(members, min(count, len(members)))
+
+        async def mget(self, keys):
+            return [cache_dict.get(key) for key in keys]
+
+        async def incr(self, key: str):
+            cache_dict[key] = str(int(cache_dict.get(key) or 0) + 1)
+            return int(cache_dict[key])
+
         async def delete(self, *keys):
+            deleted = 0
             for key in keys:
-                cache_dict.pop(key, None)
+                deleted += cache_dict.pop(key, None) is not None
+            return deleted
+
+        async def unlink(self, *keys):
+            return await self.delete(*keys)
 
         async def keys(self, pattern: str):
             import fnmatch
 
             return [k for k in cache_dict.keys() if fnmatch.fnmatch(k, pattern)]
 
+        async def scan(self, cursor: int = 0, match: str = "*", count: int | None = None):
+            return 0, await self.keys(match)
+
         async def close(self):
             pass
 
@@ -86,3 +214,22 @@ async def sample_team(session):
 
     await session.commit()
     return team
+
+
+@pytest.fixture
+async def client(test_db, session, mock_cache, sample_team):
+    """
+    HTTP-клиент приложения с тестовой сессией: после запроса сессия коммитится
+    и события передаются обработчикам, как в get_session.
+    """
+
+    async def override_get_session():
+        yield session
+        await session.commit()
+        await dispatch_events(session)
+
+    app.dependency_overrides[get_session] = override_get_session
+    app.dependency_overrides[get_session_maker] = lambda: test_db
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        yield client
+    app.dependency_overrides.clear()
@@ -0,0 +1,113 @@
+"""Тесты стратегий назначения ревьюверов."""
+
+import pytest
+from sqlalchemy import update
+
+from app.core.config import settings
+from app.db.models import User
+from app.db.repositories.user_repository import UserRepository
+from app.domain.assignment import STRATEGIES, get_strategy
+from app.domain.pull_requests.service import PullRequestService
+from app.domain.roster import Roster
+from app.domain.users.service import UserService
+
+ROSTER = Roster("backend", ("u1", "u2", "u3", "u4", "u5"), (3, 0, 1, 0, 5))
+
+
+@pytest.mark.parametrize("name", sorted(STRATEGIES))
+def test_strategies_skip_excluded(name):
+    """Тест: каждая стратегия выбирает разных участников не из exclude."""
+    for _ in range(50):
+        picked = get_strategy(name).choose(ROSTER, 2, {"u2", "u3"})
+        assert len(picked) == len(set(picked)) == 2
+        assert not {"u2", "u3"} & set(picked)
+
+    assert get_strategy(name).choose(ROSTER, 2, set(ROSTER.user_ids) - {"u4"}) == ["u4"]
+    assert get_strategy(name).choose(Roster("empty", (), ()), 2, set()) == []
+
+
+def test_round_robin_rotates_per_team():
+    """Тест: round_robin идёт по кругу с места последнего назначения команды."""
+    strategy = get_strategy("round_robin")
+    other = Roster("frontend", ("f1", "f2"), (0, 0))
+
+    picked = [strategy.choose(ROSTER, 2, {"u1"}) for _ in range(3)]
+    assert strategy.choose(other, 1, set()) == ["f1"]
+    picked.append(strategy.choose(ROSTER, 2, {"u1"}))
+
+    # Начальная позиция зависит от предыдущих тестов, важен порядок обхода
+    flat = [user_id for pair in picked for user_id in pair]
+    cycle = ["u2", "u3", "u4", "u5"]
+    start = cycle.index(flat[0])
+    assert flat == [cycle[(start + i) % 4] for i in range(8)]
+
+
+def test_least_loaded_picks_minimum():
+    """Тест: least_loaded берёт участников с наименьшей нагрузкой."""
+    assert sorted(get_strategy("least_loaded").choose(ROSTER, 2, set())) == ["u2", "u4"]
+    assert get_strategy("least_loaded").choose(ROSTER, 3, set())[2] == "u3"
+
+
+def test_weighted_prefers_spare_capacity(monkeypatch):
+    """Тест: weighted не выбирает участников без свободной ёмкости, пока есть другие."""
+    monkeypatch.setattr(settings, "REVIEWER_CAPACITY", 3)
+    monkeypatch.setattr(settings, "REVIEWER_CAPACITY_OVERRIDES", {"u4": 0})
+    strategy = get_strategy("weighted")
+
+    # Свободная ёмкость только у u2 и u3; u4 ограничен нулём, у u1 и u5 перегруз
+    for _ in range(50):
+        assert sorted(strategy.choose(ROSTER, 2, set())) == ["u2", "u3"]
+    # Когда не хватает, добираются наименее загруженные из перегруженных
+    assert strategy.choose(ROSTER, 3, {"u2"})[1:] == ["u4", "u1"]
+
+
+def test_unknown_strategy(monkeypatch):
+    """Тест: неизвестное имя стратегии — ошибка конфигурации."""
+    monkeypatch.setattr(settings, "REVIEWER_ASSIGNMENT_STRATEGY", "fastest")
+    with pytest.raises(ValueError):
+        get_strategy()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("name", sorted(STRATEGIES))
+async def test_call_sites_use_strategy(session, mock_cache, sample_team, monkeypatch, name):
+    """Тест: создание PR, переназначение и деактивация выбирают ревьюверов стратегией."""
+    monkeypatch.setattr(settings, "REVIEWER_ASSIGNMENT_STRATEGY", name)
+    pr_service = PullRequestService(session)
+
+    created = await pr_service.create_pr("pr-1", "One", "u1")
+    reviewers = created["pr"]["assigned_reviewers"]
+    assert len(reviewers) == 2 and "u1" not in reviewers
+
+    reassigned = await pr_service.reassign_reviewer("pr-1", reviewers[0])
+    # Единственный свободный участник команды — не автор и не текущий ревьювер
+    (expected,) = {"u2", "u3", "u4"} - set(reviewers)
+    assert reassigned["replaced_by"] == expected
+
+    await UserService(session).set_is_active(reviewers[1], False)
+    pr = await pr_service.get_pr("pr-1")
+    assert sorted(pr["pr"]["assigned_reviewers"]) == sorted([expected, reviewers[0]])
+
+
+@pytest.mark.asyncio
+async def test_least_loaded_window_keeps_ties(session, mock_cache, sample_team, monkeypatch):
+    """
+    Тест: окно least_loaded включает всех равных по нагрузке на его границе,
+    поэтому замену получают разные участники, а не первые по индексу.
+    """
+    monkeypatch.setattr(settings, "REVIEWER_ASSIGNMENT_STRATEGY", "least_loaded")
+    monkeypatch.setattr(settings, "REVIEWER_LEAST_LOADED_WINDOW", 1)
+    await session.execute(update(User).where(User.user_id == "u1").values(open_reviews=1))
+
+    user_repo = UserRepository(session)
+    rows = await user_repo.get_active_loads_by_team("backend", least_loaded=1)
+    assert sorted(rows) == [("u2", 0), ("u3", 0), ("u4", 0)]
+    assert len(await user_repo.get_active_loads_by_team("backend", least_loaded=4)) == 4
+
+    service = PullRequestService(session)
+    picked = set()
+    for i in range(30):
+        result = await service.create_pr(f"pr-{i}", "PR", "u1")
+        picked.update(result["pr"]["assigned_reviewers"])
+        await session.rollback()
+    assert picked == {"u2", "u3", "u4"}
@@ -0,0 +1,155 @@
+"""Тесты фоновой массовой деактивации."""
+
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import select, update
+from sqlalchemy.exc import OperationalError
+
+from app.core.config import settings
+from app.db.models import BulkDeactivationJob, User
+from app.db.repositories.job_repository import BulkJobRepository
+from app.domain.pull_requests.service import PullRequestService
+from app.domain.users.jobs import process_next_job
+from app.domain.users.service import UserService
+
+
+async def active_ids(session_maker) -> set[str]:
+    async with session_maker() as session:
+        result = await session.execute(select(User.user_id).where(User.is_active))
+        return set(result.scalars())
+
+
+@pytest.mark.asyncio
+async def test_async_bulk_deactivate(client, session, test_db):
+    """Тест: задача ставится в очередь, воркер её выполняет, прогресс отдаётся по job_id."""
+    await PullRequestService(session).create_pr("pr-1", "Feature", "u1")
+    await session.commit()
+
+    response = await client.post(
+        "/users/bulkDeactivate", params={"async": "true"}, json={"user_ids": ["u2", "nope"]}
+    )
+    assert response.status_code == 202
+    job_id = response.json()["job_id"]
+    assert response.json()["status"] == "pending"
+    assert "u2" in await active_ids(test_db)
+
+    assert await process_next_job(test_db) is True
+    assert await process_next_job(test_db) is False
+
+    session.expire_all()
+    data = (await client.get(f"/users/bulkDeactivate/{job_id}")).json()
+    assert data["status"] == "done"
+    assert (data["total"], data["processed"], data["deactivated_count"]) == (2, 2, 1)
+    assert data["errors"] == [{"user_id": "nope", "code": "NOT_FOUND", "message": "User not found"}]
+    assert data["finished_at"] is not None
+    assert "u2" not in await active_ids(test_db)
+
+    response = await client.get("/users/bulkDeactivate/missing")
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_job_commits_each_chunk(session, test_db, mock_cache, sample_team, monkeypatch):
+    """Тест: каждая пачка коммитится отдельно и сдвигает processed."""
+    monkeypatch.setattr(settings, "BULK_JOB_CHUNK_SIZE", 1)
+    job_id = (await BulkJobRepository(session).create(["u2", "u3", "u4"])).job_id
+    await session.commit()
+
+    assert await process_next_job(test_db)
+
+    session.expire_all()
+    job = await BulkJobRepository(session).get_by_id(job_id)
+    assert (job.status, job.processed, job.deactivated_count) == ("done", 3, 3)
+    assert job.locked_by is None
+    assert await active_ids(test_db) == {"u1"}
+
+
+@pytest.mark.asyncio
+async def test_job_resumes_after_expired_lease(session, test_db, mock_cache, sample_team):
+    """Тест: задачу упавшего воркера подхватывают после истечения аренды и продолжают."""
+    job_repo = BulkJobRepository(session)
+    job_id = (await job_repo.create(["u2", "u3"])).job_id
+    await session.commit()
+    assert await job_repo.claim_next("dead-worker", 60) == job_id
+    # Упавший воркер успел обработать первого пользователя
+    await session.execute(update(User).where(User.user_id == "u2").values(is_active=False))
+    await session.execute(
+        update(BulkDeactivationJob)
+        .where(BulkDeactivationJob.job_id == job_id)
+        .values(processed=1, deactivated_count=1)
+    )
+    await session.commit()
+
+    # Пока аренда действует, задачу никто не берёт
+    assert await process_next_job(test_db) is False
+
+    await session.execute(
+        update(BulkDeactivationJob)
+        .where(BulkDeactivationJob.job_id == job_id)
+        .values(lease_until=datetime.utcnow() - timedelta(seconds=1))
+    )
+    await session.commit()
+    assert await process_next_job(test_db) is True
+
+    session.expire_all()
+    job = await job_repo.get_by_id(job_id)
+    assert (job.status, job.processed, job.deactivated_count) == ("done", 2, 2)
+    assert await active_ids(test_db) == {"u1", "u4"}
+
+
+@pytest.mark.asyncio
+async def test_failed_chunk_is_retried(session, test_db, mock_cache, sample_team, monkeypatch):
+    """Тест: пачка, упавшая с временной ошибкой, откатывается и повторяется, задача доходит до конца."""
+    monkeypatch.setattr(settings, "BULK_JOB_CHUNK_SIZE", 1)
+    monkeypatch.setattr(settings, "BULK_JOB_RETRY_DELAY", 0)
+    deactivate = UserService.bulk_deactivate_users
+    failures = []
+
+    async def flaky(self, user_ids):
+        if user_ids == ["u3"] and not failures:
+            failures.append(user_ids)
+            await deactivate(self, user_ids)
+            raise OperationalError("UPDATE users", {}, Exception("deadlock detected"))
+        return await deactivate(self, user_ids)
+
+    monkeypatch.setattr(UserService, "bulk_deactivate_users", flaky)
+    job_id = (await BulkJobRepository(session).create(["u2", "u3", "u4"])).job_id
+    await session.commit()
+
+    assert await process_next_job(test_db) is True
+    session.expire_all()
+    job = await BulkJobRepository(session).get_by_id(job_id)
+    assert (job.status, job.processed, job.attempts, job.locked_by) == ("pending", 1, 1, None)
+    assert await active_ids(test_db) == {"u1", "u3", "u4"}
+
+    assert await process_next_job(test_db) is True
+    session.expire_all()
+    job = await BulkJobRepository(session).get_by_id(job_id)
+    assert (job.status, job.processed, job.deactivated_count, job.attempts) == ("done", 3, 3, 0)
+    assert [error["code"] for error in job.errors] == ["INTERNAL_ERROR"]
+    assert await active_ids(test_db) == {"u1"}
+
+
+@pytest.mark.asyncio
+async def test_job_fails_after_max_attempts(session, test_db, mock_cache, sample_team, monkeypatch):
+    """Тест: после BULK_JOB_MAX_ATTEMPTS неудач подряд задача завершается со статусом failed."""
+    monkeypatch.setattr(settings, "BULK_JOB_RETRY_DELAY", 0)
+    monkeypatch.setattr(settings, "BULK_JOB_MAX_ATTEMPTS", 2)
+
+    async def broken(self, user_ids):
+        raise OperationalError("UPDATE users", {}, Exception("connection lost"))
+
+    monkeypatch.setattr(UserService, "bulk_deactivate_users", broken)
+    job_id = (await BulkJobRepository(session).create(["u2"])).job_id
+    await session.commit()
+
+    assert await process_next_job(test_db) is True
+    assert await process_next_job(test_db) is True
+    assert await process_next_job(test_db) is False
+
+    session.expire_all()
+    job = await BulkJobRepository(session).get_by_id(job_id)
+    assert (job.status, job.processed, job.attempts) == ("failed", 0, 2)
+    assert job.finished_at is not None and job.locked_by is None
+    assert await active_ids(test_db) == {"u1", "u2", "u3", "u4"}
@@ -0,0 +1,217 @@
+"""Тесты для сервиса кеширования."""
+
+import asyncio
+
+import pytest
+
+from app.core.cache import CacheService, LocalCache, _background_tasks
+from app.db.commands import COMMANDS
+
+
+def test_local_cache_evicts_least_recently_used():
+    """Тест вытеснения самого давно использованного ключа."""
+    local = LocalCache(max_size=2, ttl=60)
+    local.set("a", {"v": 1})
+    local.set("b", {"v": 2})
+    assert local.get("a") == {"v": 1}
+
+    local.set("c", {"v": 3})
+
+    assert local.get("b") is None
+    assert local.get("a") == {"v": 1}
+    assert local.get("c") == {"v": 3}
+    assert local.stats()["evictions"] == 1
+
+
+def test_local_cache_expires_entries(monkeypatch):
+    """Тест истечения TTL записи локального кеша."""
+    now = [1000.0]
+    monkeypatch.setattr("app.core.cache.time.monotonic", lambda: now[0])
+
+    local = LocalCache(max_size=10, ttl=5)
+    local.set("a", {"v": 1}, ttl=300)
+
+    now[0] += 4
+    assert local.get("a") == {"v": 1}
+
+    now[0] += 2
+    assert local.get("a") is None
+    assert local.stats()["expirations"] == 1
+
+
+@pytest.mark.asyncio
+async def test_cache_service_reads_local_before_redis(mock_cache):
+    """Тест: повторное чтение обслуживается L1 без обращения к Redis."""
+    local = LocalCache(max_size=10, ttl=60)
+    await mock_cache.setex("stats:get_stats", 300, '{"users": []}')
+
+    calls = []
+    original_get = mock_cache.get
+
+    async def counting_get(key):
+        calls.append(key)
+        return await original_get(key)
+
+    mock_cache.get = counting_get
+    cache = CacheService(mock_cache, local_cache_instance=local)
+
+    assert await cache.get("stats:get_stats") == {"users": []}
+    assert await cache.get("stats:get_stats") == {"users": []}
+    assert calls == ["stats:get_stats"]
+
+
+@pytest.mark.asyncio
+async def test_cache_service_invalidation_reaches_local(mock_cache):
+    """Тест: delete и delete_pattern удаляют ключи и из L1."""
+    local = LocalCache(max_size=10, ttl=60)
+    cache = CacheService(mock_cache, local_cache_instance=local)
+
+    await cache.set("teams:get_team:backend:x", {"team_name": "backend"})
+    await cache.set("users:get_reviews:u1", {"user_id": "u1"})
+
+    await cache.delete_pattern("teams:get_team:backend:*")
+    await cache.delete("users:get_reviews:u1")
+
+    assert await cache.get("teams:get_team:backend:x") is None
+    assert await cache.get("users:get_reviews:u1") is None
+    assert len(local) == 0
+
+
+@pytest.mark.asyncio
+async def test_invalidate_tags_changes_tagged_key(mock_cache):
+    """Тест: инвалидация тега меняет ключ без сканирования keyspace."""
+    mock_cache.keys = None
+    cache = CacheService(mock_cache, local_cache_instance=LocalCache(max_size=10, ttl=60))
+
+    key = await cache.tagged_key("users:get_reviews:u1", "reviews", "user:u1")
+    await cache.set(key, {"user_id": "u1"})
+    assert await cache.get(await cache.tagged_key("users:get_reviews:u1", "reviews", "user:u1"))
+
+    await cache.invalidate_tags("user:u1")
+
+    new_key = await cache.tagged_key("users:get_reviews:u1", "reviews", "user:u1")
+    assert new_key != key
+    assert await cache.get(new_key) is None
+
+
+@pytest.mark.asyncio
+async def test_purge_legacy_keys_keeps_generation_keys(mock_cache):
+    """Тест: удаляются только ключи старого формата."""
+    cache = CacheService(mock_cache)
+    await mock_cache.setex("users:get_reviews:u1", 300, "{}")
+    await mock_cache.setex('teams:get_team:backend:[["team_name", "backend"]]', 300, "{}")
+    new_key = await cache.tagged_key("users:get_reviews:u1", "reviews", "user:u1")
+    await cache.set(new_key, {})
+
+    deleted = await cache.purge_legacy_keys(("users:get_reviews:*", "teams:get_team:*"))
+
+    assert deleted == 2
+    assert await mock_cache.keys("*") == [new_key]
+
+
+@pytest.mark.asyncio
+async def test_purge_legacy_cache_keys_command(mock_cache):
+    """Тест: команда purge-legacy-cache-keys удаляет ключи всех старых форматов."""
+    await mock_cache.setex("stats:get_stats", 300, "{}")
+    await mock_cache.setex("users:get_reviews:u1", 300, "{}")
+    await mock_cache.setex("stats:get_stats:g1", 300, "{}")
+
+    await COMMANDS["purge-legacy-cache-keys"]()
+
+    assert await mock_cache.keys("*") == ["stats:get_stats:g1"]
+
+
+@pytest.mark.asyncio
+async def test_get_or_compute_coalesces_concurrent_misses(mock_cache):
+    """Тест: одновременные промахи по ключу выполняют одно вычисление."""
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {"users": []}
+
+    results = await asyncio.gather(
+        *[CacheService(mock_cache).get_or_compute("stats:get_stats", compute) for _ in range(10)]
+    )
+
+    assert len(calls) == 1
+    assert all(result == {"users": []} for result in results)
+
+
+@pytest.mark.asyncio
+async def test_get_or_compute_serves_fallback_while_locked(mock_cache):
+    """Тест: пока пересчёт держит другой процесс, отдаётся прошлое значение."""
+    cache = CacheService(mock_cache)
+    await cache.set("stats:get_stats:last", {"users": ["old"]})
+    await mock_cache.set("cache:lock:stats:get_stats", "other-worker", nx=True)
+
+    async def compute():
+        raise AssertionError("пересчёт должен выполнять владелец блокировки")
+
+    result = await cache.get_or_compute(
+        "stats:get_stats", compute, fallback_key="stats:get_stats:last"
+    )
+
+    assert result == {"users": ["old"]}
+
+
+@pytest.mark.asyncio
+async def test_get_or_compute_serves_stale_and_refreshes_in_background(mock_cache, monkeypatch):
+    """Тест: после soft TTL отдаётся старое значение, а обновление идёт в фоне."""
+    now = [1000.0]
+    monkeypatch.setattr("app.core.cache.time.time", lambda: now[0])
+    cache = CacheService(mock_cache)
+    await cache.set("teams:get_team:backend:g0", {"v": 1}, ttl=300, soft_ttl=60)
+
+    async def compute():
+        raise AssertionError("устаревшее значение не должно пересчитываться синхронно")
+
+    async def refresh():
+        return {"v": 2}
+
+    now[0] += 61
+    result = await cache.get_or_compute(
+        "teams:get_team:backend:g0", compute, ttl=300, soft_ttl=60, refresh=refresh
+    )
+    assert result == {"v": 1}
+
+    await asyncio.gather(*_background_tasks)
+    assert await cache.get("teams:get_team:backend:g0") == {"v": 2}
+
+
+@pytest.mark.asyncio
+async def test_get_reads_legacy_entries_without_envelope(mock_cache):
+    """Тест: записи без soft TTL читаются как раньше."""
+    await mock_cache.setex("users:get_reviews:u1:g0.0", 300, '{"user_id": "u1"}')
+    cache = CacheService(mock_cache)
+
+    assert await cache.get("users:get_reviews:u1:g0.0") == {"user_id": "u1"}
+
+
+@pytest.mark.asyncio
+async def test_batch_operations_use_single_round_trip(mock_cache):
+    """Тест: set_many/get_many выполняются одним обращением к Redis."""
+    executed = []
+    original_pipeline = mock_cache.pipeline
+
+    def counting_pipeline(transaction: bool = True):
+        pipe = original_pipeline(transaction)
+        original_execute = pipe.execute
+
+        async def execute():
+            executed.append(len(pipe.commands))
+            return await original_execute()
+
+        pipe.execute = execute
+        return pipe
+
+    mock_cache.pipeline = counting_pipeline
+    cache = CacheService(mock_cache)
+    keys = [f"user:u{i}" for i in range(1200)]
+
+    await cache.set_many({key: {"id": key} for key in keys}, soft_ttl=60)
+    assert executed == [1200]
+
+    found = await CacheService(mock_cache).get_many(keys[:3] + ["user:missing"])
+    assert found == {key: {"id": key} for key in keys[:3]}
@@ -0,0 +1,128 @@
+"""Тесты для кодеков кеша."""
+
+import json
+import math
+
+import pytest
+
+from app.core.cache import CacheService
+from app.core.cache_codecs import (
+    CODECS,
+    COMPRESSORS,
+    MAGIC,
+    CacheCorruptError,
+    CacheDecodeError,
+    CacheSerializer,
+)
+
+PAYLOAD = {
+    "users": [
+        {"user_id": f"u{i}", "username": f"User {i}", "total_reviews": i, "open_reviews": 1}
+        for i in range(200)
+    ],
+    "pull_requests": {"total_prs": 10, "open_prs": 4, "merged_prs": 6},
+}
+
+
+@pytest.mark.parametrize("codec", sorted(CODECS))
+@pytest.mark.parametrize("compression", sorted(COMPRESSORS))
+def test_round_trip(codec, compression):
+    """Тест: значение и fresh_until переживают кодирование любым кодеком."""
+    serializer = CacheSerializer(codec, compression=compression, compression_threshold=1)
+
+    data = serializer.dumps("stats:get_stats:g0", PAYLOAD, fresh_until=123.5)
+
+    assert data.startswith(MAGIC)
+    assert serializer.loads(data) == (PAYLOAD, 123.5)
+
+
+def test_compression_only_above_threshold():
+    """Тест: маленькие значения не сжимаются."""
+    serializer = CacheSerializer("json", compression="zlib", compression_threshold=1024)
+
+    small = serializer.dumps("teams:get_team:a:g0", {"team_name": "a"})
+    large = serializer.dumps("stats:get_stats:g0", PAYLOAD)
+
+    assert small[2] == COMPRESSORS["none"].compression_id
+    assert large[2] == COMPRESSORS["zlib"].compression_id
+    assert len(large) < len(json.dumps(PAYLOAD))
+
+
+def test_codec_selected_by_namespace():
+    """Тест: кодек выбирается по пространству имён ключа."""
+    serializer = CacheSerializer("json", namespace_codecs={"stats": "msgpack"})
+
+    assert serializer.codec_for("teams:get_team:a").name == "json"
+    assert (
+        serializer.codec_for("stats:get_stats").name == CODECS.get("msgpack", CODECS["json"]).name
+    )
+
+
+def test_legacy_entries_are_decoded():
+    """Тест: JSON-записи прежних форматов читаются без ошибок."""
+    serializer = CacheSerializer("json")
+    envelope = {"__swr__": 1, "value": {"v": 1}, "fresh_until": 10.0}
+
+    assert serializer.loads(b'{"v": 1}') == ({"v": 1}, math.inf)
+    assert serializer.loads(json.dumps(envelope)) == ({"v": 1}, 10.0)
+
+
+@pytest.mark.asyncio
+async def test_undecodable_entry_is_a_miss(mock_cache):
+    """Тест: запись с неизвестным кодеком считается промахом, кеш остаётся доступным."""
+    await mock_cache.setex("stats:get_stats:g0", 300, MAGIC + b"\xff" + b"\x00" * 9)
+    cache = CacheService(mock_cache)
+
+    with pytest.raises(CacheDecodeError):
+        cache.serializer.loads(await mock_cache.get("stats:get_stats:g0"))
+    assert await cache.get("stats:get_stats:g0") is None
+    assert cache.is_available
+
+
+def test_bytes_are_stored_as_is():
+    """Тест: готовые байты ответа не перекодируются."""
+    serializer = CacheSerializer("orjson", compression="zlib", compression_threshold=16)
+    body = b'{"users":[],"pull_requests":{}}' * 4
+
+    assert serializer.loads(serializer.dumps("http:stats:g0", body)) == (body, math.inf)
+
+
+def test_missing_codec_falls_back_with_warning(monkeypatch, caplog):
+    """Тест: без orjson и lz4 используются json и zlib, замена попадает в лог."""
+    monkeypatch.delitem(CODECS, "orjson", raising=False)
+    monkeypatch.delitem(COMPRESSORS, "lz4", raising=False)
+
+    with caplog.at_level("WARNING", logger="app.core.cache_codecs"):
+        serializer = CacheSerializer("orjson", compression="lz4")
+
+    assert serializer.default_codec is CODECS["json"]
+    assert serializer.compressor is COMPRESSORS["zlib"]
+    assert [record.getMessage() for record in caplog.records] == [
+        "Cache codec 'orjson' is not available, falling back to 'json'",
+        "Cache codec 'lz4' is not available, falling back to 'zlib'",
+    ]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("codec", sorted(set(CODECS) - {"raw"}))
+@pytest.mark.parametrize("compression", sorted(COMPRESSORS))
+async def test_corrupt_entry_is_dropped(mock_cache, codec, compression):
+    """Тест: повреждённая запись — промах с удалением ключа, а не сбой Redis."""
+    serializer = CacheSerializer(codec, compression=compression, compression_threshold=1)
+    data = serializer.dumps("stats:get_stats:g0", PAYLOAD)
+    corrupt = data[: len(data) // 2] + b"\xc1\xff" * 8
+    with pytest.raises(CacheCorruptError):
+        serializer.loads(corrupt)
+
+    cache = CacheService(mock_cache, serializer=serializer)
+    await mock_cache.setex("stats:get_stats:g0", 300, corrupt)
+    assert await cache.get("stats:get_stats:g0") is None
+    assert await mock_cache.get("stats:get_stats:g0") is None
+
+    await mock_cache.setex("stats:get_stats:g1", 300, corrupt)
+    await mock_cache.setex("stats:get_stats:g2", 300, data)
+    assert await cache.get_many(["stats:get_stats:g1", "stats:get_stats:g2"]) == {
+        "stats:get_stats:g2": PAYLOAD
+    }
+    assert await mock_cache.get("stats:get_stats:g1") is None
+    assert cache.is_available
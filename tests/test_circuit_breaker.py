@@ -0,0 +1,109 @@
+"""Тесты для circuit breaker."""
+
+import asyncio
+
+import pytest
+
+from app.core.cache import CacheService, redis_breaker
+from app.core.circuit_breaker import CircuitBreaker
+from app.domain.base_service import BaseService
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Управляемые часы для breaker."""
+    now = [1000.0]
+    monkeypatch.setattr("app.core.circuit_breaker.time.monotonic", lambda: now[0])
+    monkeypatch.setattr("app.core.circuit_breaker.random.uniform", lambda a, b: b)
+    return now
+
+
+def test_breaker_opens_after_threshold(clock):
+    """Тест: после порога ошибок запросы отклоняются до истечения задержки."""
+    breaker = CircuitBreaker(failure_threshold=2, backoff=1.0)
+    breaker.record_failure()
+    assert breaker.allow_request()
+
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow_request()
+
+    clock[0] += 1.0
+    assert breaker.allow_request()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert not breaker.allow_request()
+
+
+def test_breaker_half_open_probe_result(clock):
+    """Тест: успех пробы закрывает breaker, ошибка удваивает задержку."""
+    breaker = CircuitBreaker(failure_threshold=1, backoff=1.0, max_backoff=30.0)
+    breaker.record_failure()
+    clock[0] += 1.0
+    assert breaker.allow_request()
+
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    clock[0] += 1.0
+    assert not breaker.allow_request()
+    clock[0] += 1.0
+    assert breaker.allow_request()
+
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.snapshot()["opened_total"] == 2
+
+
+@pytest.mark.asyncio
+async def test_cache_operations_skip_redis_when_open(mock_cache):
+    """Тест: при открытом breaker команды в Redis не отправляются."""
+    calls = []
+
+    async def failing_get(key):
+        calls.append(key)
+        raise TimeoutError
+
+    mock_cache.get = failing_get
+    for _ in range(redis_breaker.failure_threshold):
+        assert await CacheService(mock_cache).get("stats:get_stats") is None
+
+    assert redis_breaker.state == CircuitBreaker.OPEN
+    assert await CacheService(mock_cache).get("stats:get_stats") is None
+    assert len(calls) == redis_breaker.failure_threshold
+
+
+@pytest.mark.asyncio
+async def test_service_cache_recovers_through_single_probe(session, mock_cache, clock):
+    """
+    Тест: после задержки запросы сервисов отправляют в Redis одну пробную команду,
+    а после её успеха breaker закрывается и кеш снова используется.
+    """
+    for _ in range(redis_breaker.failure_threshold):
+        redis_breaker.record_failure()
+    service = BaseService(session)
+    assert (await service._get_cache_service()).redis is None
+
+    clock[0] += redis_breaker.max_backoff
+    calls = []
+    release = asyncio.Event()
+
+    async def slow_get(key):
+        calls.append(key)
+        await release.wait()
+        return None
+
+    async def request(key):
+        return await (await service._get_cache_service()).get(key)
+
+    mock_cache.get = slow_get
+    tasks = [asyncio.create_task(request(f"stats:{n}")) for n in range(5)]
+    for _ in range(10):
+        await asyncio.sleep(0)
+    assert len(calls) == 1
+
+    release.set()
+    assert await asyncio.gather(*tasks) == [None] * 5
+    assert redis_breaker.state == CircuitBreaker.CLOSED
+
+    assert await request("stats:again") is None
+    assert await request("stats:again") is None
+    assert len(calls) == 3
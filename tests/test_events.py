@@ -0,0 +1,107 @@
+"""Тесты доменных событий и инвалидации кеша после коммита."""
+
+import asyncio
+
+import pytest
+
+from app.api import dependencies
+from app.core.config import settings
+from app.domain.cache_keys import STATS_TAG, team_tag, user_tag
+from app.domain.event_handlers import affected_tags, dispatch_events
+from app.domain.events import ReviewerChanged, UsersActivityChanged, pop_events
+from app.domain.pull_requests.service import PullRequestService
+from app.domain.stats.service import StatsService
+from app.domain.users.service import UserService
+
+
+def test_affected_tags_are_exact():
+    """Тест: событие затрагивает только теги своих пользователей и команд и статистику."""
+    assert affected_tags(ReviewerChanged("pr-1", "u1", "u2")) == {
+        user_tag("u1"),
+        user_tag("u2"),
+        STATS_TAG,
+    }
+    assert affected_tags(ReviewerChanged("pr-1", "u1", None)) == {user_tag("u1"), STATS_TAG}
+    assert affected_tags(UsersActivityChanged(("u1",), ("backend",), False)) == {
+        user_tag("u1"),
+        team_tag("backend"),
+        STATS_TAG,
+    }
+
+
+@pytest.mark.asyncio
+async def test_stats_refreshed_after_commit(session, mock_cache, sample_team, monkeypatch):
+    """
+    Тест: статистика и fairness сбрасываются после записи, а сбросы чаще
+    STATS_INVALIDATION_INTERVAL откладываются до конца интервала.
+    """
+    monkeypatch.setattr(settings, "STATS_INVALIDATION_INTERVAL", 0.05)
+    stats_service = StatsService(session)
+    pr_service = PullRequestService(session)
+    assert (await stats_service.get_stats())["pull_requests"]["total_prs"] == 0
+    assert (await stats_service.get_fairness())["overall"]["open_reviews"]["max"] == 0
+
+    await pr_service.create_pr("pr-1", "One", "u1")
+    await session.commit()
+    await dispatch_events(session)
+    assert (await stats_service.get_stats())["pull_requests"]["total_prs"] == 1
+    assert (await stats_service.get_fairness())["overall"]["open_reviews"]["max"] == 1
+
+    await pr_service.create_pr("pr-2", "Two", "u1")
+    await session.commit()
+    await dispatch_events(session)
+    assert (await stats_service.get_stats())["pull_requests"]["total_prs"] == 1
+
+    await asyncio.sleep(0.1)
+    assert (await stats_service.get_stats())["pull_requests"]["total_prs"] == 2
+
+
+@pytest.mark.asyncio
+async def test_pr_events_invalidate_reviewer_queues(session, mock_cache, sample_team):
+    """Тест: после коммита создание и merge PR сбрасывают кеш ревью назначенных ревьюверов."""
+    user_service = UserService(session)
+    pr_service = PullRequestService(session)
+    reviews = {uid: await user_service.get_reviews(uid) for uid in ("u1", "u2", "u3", "u4")}
+    assert all(not r["pull_requests"] for r in reviews.values())
+
+    created = await pr_service.create_pr("pr-1", "Feature", "u1")
+    await session.commit()
+    await dispatch_events(session)
+
+    reviewer_ids = created["pr"]["assigned_reviewers"]
+    for uid in reviewer_ids:
+        result = await user_service.get_reviews(uid)
+        assert [pr["status"] for pr in result["pull_requests"]] == ["OPEN"]
+
+    await pr_service.merge_pr("pr-1")
+    await session.commit()
+    await dispatch_events(session)
+
+    for uid in reviewer_ids:
+        result = await user_service.get_reviews(uid)
+        assert [pr["status"] for pr in result["pull_requests"]] == ["MERGED"]
+
+
+@pytest.mark.asyncio
+async def test_events_not_dispatched_after_rollback(session, mock_cache, sample_team, monkeypatch):
+    """Тест: при ошибке запроса транзакция откатывается, а её события не обрабатываются."""
+
+    async def fake_get_db():
+        try:
+            yield session
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            raise
+
+    monkeypatch.setattr(dependencies, "get_db", fake_get_db)
+
+    request_session = dependencies.get_session()
+    await UserService(await anext(request_session)).set_is_active("u2", False)
+    with pytest.raises(RuntimeError):
+        await request_session.athrow(RuntimeError("request failed"))
+
+    assert await mock_cache.keys("cache:gen:*") == []
+
+    await session.rollback()
+    assert pop_events(session) == []
@@ -0,0 +1,55 @@
+"""Тесты метрик равномерности распределения ревью."""
+
+import numpy as np
+import pytest
+
+from app.domain.pull_requests.service import PullRequestService
+from app.domain.stats.fairness import group_distribution
+from app.domain.stats.service import StatsService
+
+
+def reference_gini(values: np.ndarray) -> float:
+    """Джини через среднюю абсолютную разность всех пар."""
+    if values.sum() == 0:
+        return 0.0
+    diffs = np.abs(values[:, None] - values[None, :]).sum()
+    return diffs / (2 * len(values) ** 2 * values.mean())
+
+
+def test_group_distribution_matches_per_group_reference():
+    """Тест: векторные метрики совпадают с посчитанными отдельно для каждой группы."""
+    rng = np.random.default_rng(7)
+    codes = rng.integers(0, 5, size=500)
+    values = rng.poisson(3, size=500)
+    values[codes == 4] = 0
+
+    metrics = group_distribution(codes, values)
+
+    for group in range(5):
+        group_values = values[codes == group].astype(float)
+        assert metrics["mean"][group] == pytest.approx(group_values.mean())
+        assert metrics["max"][group] == group_values.max()
+        assert metrics["gini"][group] == pytest.approx(reference_gini(group_values))
+        for q in (50, 90, 99):
+            assert metrics[f"p{q}"][group] == pytest.approx(np.percentile(group_values, q))
+
+    assert np.isnan(metrics["max_to_min"][4])
+    assert np.isnan(metrics["max_to_mean"][4])
+
+
+@pytest.mark.asyncio
+async def test_fairness_by_team(session, mock_cache, sample_team):
+    """Тест: метрики считаются по открытым ревью активных пользователей команды."""
+    await PullRequestService(session).create_pr("pr-1", "One", "u1")
+    await session.commit()
+
+    result = await StatsService(session).get_fairness()
+
+    assert [team["team_name"] for team in result["teams"]] == ["backend"]
+    backend = result["teams"][0]
+    assert backend["active_users"] == 4
+    # Два ревьювера из четырёх получили по одному ревью
+    assert backend["open_reviews"]["mean"] == 0.5
+    assert backend["open_reviews"]["gini"] == 0.5
+    assert backend["open_reviews"]["max_to_min"] is None
+    assert result["overall"]["open_reviews"] == backend["open_reviews"]
@@ -4,6 +4,8 @@ import pytest
 from httpx import ASGITransport, AsyncClient
 
 from app.api.dependencies import get_session
+from app.core.config import settings
+from app.domain.event_handlers import dispatch_events
 from app.main import app
 
 
@@ -14,6 +16,7 @@ async def test_e2e_pr_workflow(session, mock_cache):
 
     async def override_get_session():
         yield session
+        await dispatch_events(session)
 
     app.dependency_overrides[get_session] = override_get_session
 
@@ -97,6 +100,7 @@ async def test_e2e_stats(session, mock_cache):
 
     async def override_get_session():
         yield session
+        await dispatch_events(session)
 
     app.dependency_overrides[get_session] = override_get_session
 
@@ -152,6 +156,7 @@ async def test_e2e_simple_bulk_deactivate(session):
 
     async def override_get_session():
         yield session
+        await dispatch_events(session)
 
     app.dependency_overrides[get_session] = override_get_session
 
@@ -227,3 +232,49 @@ async def test_e2e_simple_bulk_deactivate(session):
         )
 
         app.dependency_overrides.clear()
+
+
+@pytest.mark.asyncio
+async def test_e2e_create_pr_batch(session, mock_cache, sample_team, monkeypatch):
+    """E2E тест пакетного создания PR: результаты по элементам и лимит размера пачки."""
+    monkeypatch.setattr(settings, "PR_BATCH_MAX_SIZE", 2)
+
+    async def override_get_session():
+        yield session
+        await dispatch_events(session)
+
+    app.dependency_overrides[get_session] = override_get_session
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.post(
+            "/pullRequest/createBatch",
+            json={
+                "pull_requests": [
+                    {"pull_request_id": "pr-1", "pull_request_name": "One", "author_id": "u1"},
+                    {"pull_request_id": "pr-2", "pull_request_name": "Two", "author_id": "ghost"},
+                ]
+            },
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert data["created_count"] == 1
+        assert data["results"][0]["pr"]["status"] == "OPEN"
+        assert data["results"][0]["error"] is None
+        assert data["results"][1]["pr"] is None
+        assert data["results"][1]["error"]["code"] == "NOT_FOUND"
+
+        pr = (await client.get("/pullRequest", params={"pr_id": "pr-1"})).json()["pr"]
+        assert sorted(pr["assigned_reviewers"]) == sorted(
+            data["results"][0]["pr"]["assigned_reviewers"]
+        )
+
+        item = {"pull_request_id": "pr-3", "pull_request_name": "Three", "author_id": "u1"}
+        response = await client.post("/pullRequest/createBatch", json={"pull_requests": [item] * 3})
+        assert response.status_code == 400
+        assert response.json()["error"]["code"] == "BATCH_TOO_LARGE"
+
+        response = await client.post("/pullRequest/createBatch", json={"pull_requests": []})
+        assert response.status_code == 422
+        assert response.json()["error"]["code"] == "VALIDATION_ERROR"
+
+    app.dependency_overrides.clear()
@@ -1,12 +1,19 @@
 """Тесты для сервиса Pull Request'ов."""
 
+from collections import Counter
+
 import pytest
+from sqlalchemy import event
 
+from app.core.config import settings
 from app.core.exceptions import (
+    BatchTooLargeException,
+    NotFoundException,
     PRExistsException,
     PRMergedException,
 )
 from app.domain.pull_requests.service import PullRequestService
+from tests.test_stats_counters import assert_counters_match_aggregates
 
 
 @pytest.mark.asyncio
@@ -82,3 +89,104 @@ async def test_reassign_on_merged_pr(session, mock_cache, sample_team):
         await service.merge_pr("pr-1")
         with pytest.raises(PRMergedException):
             await service.reassign_reviewer("pr-1", old_reviewer)
+
+
+@pytest.mark.asyncio
+async def test_create_pr_least_loaded(session, mock_cache, sample_team, monkeypatch):
+    """Тест: стратегия least_loaded назначает наименее загруженных ревьюверов."""
+    monkeypatch.setattr(settings, "REVIEWER_ASSIGNMENT_STRATEGY", "least_loaded")
+    service = PullRequestService(session)
+
+    # Каждый PR от u1 уходит двоим из трёх; после трёх PR нагрузка u2..u4 равна 2
+    assigned = []
+    for i in range(3):
+        result = await service.create_pr(f"pr-{i}", "Test PR", "u1")
+        assigned += result["pr"]["assigned_reviewers"]
+
+    assert sorted(assigned) == ["u2", "u2", "u3", "u3", "u4", "u4"]
+
+
+@pytest.mark.asyncio
+async def test_create_pr_round_trips(session, mock_cache, sample_team):
+    """Тест: PR создаётся без чтения обратно, ответ совпадает с сохранённым PR."""
+    service = PullRequestService(session)
+    statements = []
+    engine = session.bind.sync_engine
+
+    def listener(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        created = await service.create_pr("pr-1", "Test PR", "u1")
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+
+    # Проверка PR и автора, состав команды, PR, ревьюверы и четыре группы счётчиков
+    assert len(statements) <= 8
+    stored = (await service.get_pr("pr-1"))["pr"]
+    assert sorted(created["pr"].pop("assigned_reviewers")) == sorted(
+        stored.pop("assigned_reviewers")
+    )
+    assert created["pr"] == stored
+
+
+@pytest.mark.asyncio
+async def test_create_pr_errors(session, mock_cache, sample_team):
+    """Тест: PR_EXISTS проверяется раньше автора, неизвестный автор — NOT_FOUND."""
+    service = PullRequestService(session)
+    await service.create_pr("pr-1", "Test PR", "u1")
+
+    with pytest.raises(PRExistsException):
+        await service.create_pr("pr-1", "Another PR", "nope")
+    with pytest.raises(NotFoundException):
+        await service.create_pr("pr-2", "Another PR", "nope")
+
+
+@pytest.mark.asyncio
+async def test_create_prs_batch(session, mock_cache, sample_team, monkeypatch):
+    """Тест: пачка создаётся целиком, ошибки возвращаются по каждому PR."""
+    monkeypatch.setattr(settings, "REVIEWER_ASSIGNMENT_STRATEGY", "least_loaded")
+    service = PullRequestService(session)
+    await service.create_pr("pr-0", "Existing", "u1")
+
+    items = [
+        {"pull_request_id": f"pr-{i}", "pull_request_name": f"PR {i}", "author_id": "u1"}
+        for i in range(1, 4)
+    ]
+    items += [
+        {"pull_request_id": "pr-0", "pull_request_name": "Existing", "author_id": "u1"},
+        {"pull_request_id": "pr-1", "pull_request_name": "Duplicate", "author_id": "u2"},
+        {"pull_request_id": "pr-9", "pull_request_name": "Ghost", "author_id": "nope"},
+    ]
+    result = await service.create_prs(items)
+
+    assert result["created_count"] == 3
+    assert [r["pull_request_id"] for r in result["results"]] == [
+        "pr-1",
+        "pr-2",
+        "pr-3",
+        "pr-0",
+        "pr-1",
+        "pr-9",
+    ]
+    assert [r["error"]["code"] for r in result["results"][3:]] == [
+        "PR_EXISTS",
+        "PR_EXISTS",
+        "NOT_FOUND",
+    ]
+    # Нагрузка в снимке растёт по ходу пачки: 8 ревью на u2..u4 распределены поровну
+    assigned = [uid for r in result["results"][:3] for uid in r["pr"]["assigned_reviewers"]]
+    assigned += (await service.get_pr("pr-0"))["pr"]["assigned_reviewers"]
+    assert sorted(Counter(assigned).values()) == [2, 3, 3]
+    for r in result["results"][:3]:
+        stored = (await service.get_pr(r["pull_request_id"]))["pr"]
+        assert sorted(r["pr"]["assigned_reviewers"]) == sorted(stored["assigned_reviewers"])
+        assert r["pr"]["createdAt"] == stored["createdAt"]
+
+    await assert_counters_match_aggregates(session)
+
+    assert await service.create_prs([]) == {"created_count": 0, "results": []}
+    monkeypatch.setattr(settings, "PR_BATCH_MAX_SIZE", 2)
+    with pytest.raises(BatchTooLargeException):
+        await service.create_prs(items[:3])
@@ -0,0 +1,49 @@
+"""Тесты кеширования готовых ответов."""
+
+import pytest
+
+from app.core.config import settings
+from app.domain.event_handlers import dispatch_events
+from app.domain.pull_requests.service import PullRequestService
+
+
+@pytest.fixture
+async def review_prs(session, mock_cache, sample_team):
+    """PR с не-ASCII и экранируемыми символами в названиях."""
+    await PullRequestService(session).create_pr("pr-1", "Добавить поиск", "u1")
+    await PullRequestService(session).create_pr("pr-2", 'Fix "quotes" & ünïcode', "u2")
+    await session.commit()
+    await dispatch_events(session)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "url, params",
+    [("/stats", {}), ("/users/getReview", {"user_id": "u3"})],
+)
+async def test_cached_body_matches_uncached(review_prs, client, monkeypatch, url, params):
+    """Тест: тело ответа из кеша байт в байт совпадает с обычным ответом."""
+    monkeypatch.setattr(settings, "RESPONSE_CACHE_ENABLED", False)
+    uncached = await client.get(url, params=params)
+
+    monkeypatch.setattr(settings, "RESPONSE_CACHE_ENABLED", True)
+    miss = await client.get(url, params=params)
+    hit = await client.get(url, params=params)
+
+    assert uncached.status_code == miss.status_code == hit.status_code == 200
+    assert uncached.content == miss.content == hit.content
+    assert hit.headers["content-type"] == uncached.headers["content-type"]
+
+
+@pytest.mark.asyncio
+async def test_cached_response_served_without_service(review_prs, client, monkeypatch):
+    """Тест: при попадании в кеш сервис не вызывается."""
+    first = await client.get("/stats")
+
+    async def fail(self):
+        raise AssertionError("ответ должен браться из кеша")
+
+    monkeypatch.setattr("app.domain.stats.service.StatsService.get_stats", fail)
+    second = await client.get("/stats")
+
+    assert second.content == first.content
@@ -0,0 +1,194 @@
+"""Тесты индекса активных участников команд."""
+
+import asyncio
+import random
+
+import pytest
+from sqlalchemy import select
+
+from app.core.cache import redis_breaker
+from app.core.config import settings
+from app.db.models import pr_reviewers
+from app.db.repositories.user_repository import UserRepository
+from app.domain.event_handlers import dispatch_events
+from app.domain.pull_requests.service import PullRequestService
+from app.domain.roster import TeamRoster, rebuild_candidate_pools, roster_index
+from app.domain.teams.service import TeamService
+from app.domain.users.service import UserService
+
+
+@pytest.fixture(autouse=True)
+def reset_roster_index():
+    """Каждый тест начинает с непостроенного индекса."""
+    roster_index.clear()
+    yield
+    roster_index.clear()
+
+
+def test_team_roster_swap_remove():
+    """Тест: после удалений позиции указывают на свои ID в массиве."""
+    rng = random.Random(1)
+    team = TeamRoster()
+    expected = set()
+    for _ in range(500):
+        user_id = f"u{rng.randrange(50)}"
+        if rng.random() < 0.5:
+            team.add(user_id)
+            expected.add(user_id)
+        else:
+            team.remove(user_id)
+            expected.discard(user_id)
+
+        assert set(team.user_ids) == expected
+        assert all(team.user_ids[pos] == uid for uid, pos in team.positions.items())
+        assert team.sorted_ids() == tuple(sorted(expected))
+
+
+@pytest.mark.asyncio
+async def test_index_follows_committed_changes(test_db, session, mock_cache, sample_team):
+    """Тест: индекс строится из БД и обновляется событиями после коммита."""
+    await roster_index.rebuild(test_db)
+    assert sorted(roster_index.snapshot("backend").user_ids) == ["u1", "u2", "u3", "u4"]
+
+    await UserService(session).set_is_active("u2", False)
+    await session.commit()
+    await dispatch_events(session)
+    assert roster_index.snapshot("backend", ordered=True).user_ids == ("u1", "u3", "u4")
+
+    await TeamService(session).create_team(
+        "frontend",
+        [
+            {"user_id": "u3", "username": "Charlie", "is_active": True},
+            {"user_id": "f1", "username": "Frank", "is_active": False},
+        ],
+    )
+    await session.commit()
+    await dispatch_events(session)
+    assert roster_index.snapshot("backend", ordered=True).user_ids == ("u1", "u4")
+    assert list(roster_index.snapshot("frontend").user_ids) == ["u3"]
+
+    await UserService(session).set_is_active("u2", True)
+    await session.rollback()
+    await dispatch_events(session)
+    assert "u2" not in roster_index.snapshot("backend").user_ids
+
+
+@pytest.mark.asyncio
+async def test_random_assignment_uses_index(test_db, session, mock_cache, sample_team, monkeypatch):
+    """Тест: при построенном индексе случайный выбор не читает состав команды из БД."""
+    await roster_index.rebuild(test_db)
+
+    async def no_db(*args, **kwargs):
+        raise AssertionError("roster must come from the index")
+
+    monkeypatch.setattr(UserRepository, "get_active_loads_by_team", no_db)
+
+    result = await PullRequestService(session).create_pr("pr-1", "One", "u1")
+    reviewers = result["pr"]["assigned_reviewers"]
+    assert len(reviewers) == 2 and "u1" not in reviewers
+
+
+@pytest.mark.asyncio
+async def test_bulk_deactivation_skips_uncommitted_deactivations(
+    test_db, session, mock_cache, sample_team
+):
+    """Тест: деактивированные в той же транзакции не назначаются заменой, хотя индекс их ещё держит."""
+    await roster_index.rebuild(test_db)
+    for n in range(20):
+        await PullRequestService(session).create_pr(f"pr-{n}", "One", "u1")
+    await session.commit()
+
+    await UserService(session).bulk_deactivate_users(["u2", "u4"])
+    assert "u4" in roster_index.snapshot("backend").user_ids
+
+    result = await session.execute(select(pr_reviewers.c.reviewer_id).distinct())
+    assert set(result.scalars()) == {"u3"}
+
+
+async def no_db(*args, **kwargs):
+    raise AssertionError("roster must come from Redis")
+
+
+@pytest.mark.asyncio
+async def test_redis_pools_follow_committed_changes(
+    test_db, session, mock_cache, sample_team, monkeypatch
+):
+    """Тест: множества в Redis строятся из БД, обновляются событиями и отдают кандидатов."""
+    monkeypatch.setattr(settings, "ROSTER_BACKEND", "redis")
+    await rebuild_candidate_pools(test_db)
+    assert await mock_cache.get("roster:team:backend") == {"u1", "u2", "u3", "u4"}
+
+    await UserService(session).set_is_active("u2", False)
+    await TeamService(session).create_team(
+        "frontend", [{"user_id": "u3", "username": "Charlie", "is_active": True}]
+    )
+    await session.commit()
+    await dispatch_events(session)
+    assert await mock_cache.get("roster:team:backend") == {"u1", "u4"}
+    assert await mock_cache.get("roster:team:frontend") == {"u3"}
+
+    monkeypatch.setattr(UserRepository, "get_active_loads_by_team", no_db)
+    result = await PullRequestService(session).create_pr("pr-1", "One", "u1")
+    assert result["pr"]["assigned_reviewers"] == ["u4"]
+
+
+@pytest.mark.asyncio
+async def test_redis_pools_keep_changes_made_during_rebuild(
+    test_db, session, mock_cache, sample_team, monkeypatch
+):
+    """
+    Тест: деактивация, закоммиченная, пока перестроение читало БД, не затирается
+    снимком — перестроение читает состав заново.
+    """
+    monkeypatch.setattr(settings, "ROSTER_BACKEND", "redis")
+    get_active_members = UserRepository.get_active_members
+    reads = []
+
+    async def racing_read(self):
+        members = await get_active_members(self)
+        reads.append(members)
+        if len(reads) == 1:
+            await UserService(session).set_is_active("u2", False)
+            await session.commit()
+            await dispatch_events(session)
+        return members
+
+    monkeypatch.setattr(UserRepository, "get_active_members", racing_read)
+    await rebuild_candidate_pools(test_db)
+
+    assert len(reads) == 2
+    assert await mock_cache.get("roster:team:backend") == {"u1", "u3", "u4"}
+    assert await mock_cache.exists("roster:ready")
+
+
+@pytest.mark.asyncio
+async def test_redis_pools_rebuilt_by_one_process(test_db, mock_cache, sample_team, monkeypatch):
+    """Тест: в пределах ROSTER_INDEX_REFRESH_INTERVAL множества перестраивает один владелец аренды."""
+    monkeypatch.setattr(settings, "ROSTER_BACKEND", "redis")
+    get_active_members = UserRepository.get_active_members
+    reads = []
+
+    async def counting_read(self):
+        reads.append(self)
+        return await get_active_members(self)
+
+    monkeypatch.setattr(UserRepository, "get_active_members", counting_read)
+    await asyncio.gather(*(rebuild_candidate_pools(test_db) for _ in range(3)))
+
+    assert len(reads) == 1
+    assert await mock_cache.get("roster:team:backend") == {"u1", "u2", "u3", "u4"}
+
+
+@pytest.mark.asyncio
+async def test_redis_pools_fall_back_to_db(session, mock_cache, sample_team, monkeypatch):
+    """Тест: без построенных множеств или без Redis состав читается из БД."""
+    monkeypatch.setattr(settings, "ROSTER_BACKEND", "redis")
+    pr_service = PullRequestService(session)
+
+    result = await pr_service.create_pr("pr-1", "One", "u1")
+    assert len(result["pr"]["assigned_reviewers"]) == 2
+
+    for _ in range(redis_breaker.failure_threshold):
+        redis_breaker.record_failure()
+    result = await pr_service.create_pr("pr-2", "Two", "u1")
+    assert len(result["pr"]["assigned_reviewers"]) == 2
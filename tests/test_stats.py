@@ -0,0 +1,167 @@
+"""Тесты эндпоинтов статистики."""
+
+import json
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import func, select
+
+from app.core.config import settings
+from app.db.models import ReviewDailyRollup, User
+from app.db.repositories.stats_repository import StatsRepository
+from app.domain.pull_requests.service import PullRequestService
+from app.domain.teams.service import TeamService
+
+
+@pytest.fixture
+async def stats_data(session, mock_cache, sample_team):
+    """Команда из 14 человек и открытый PR."""
+    session.add_all(
+        User(user_id=f"x{i:02}", username=f"Extra {i}", team_name="backend", is_active=True)
+        for i in range(10)
+    )
+    await PullRequestService(session).create_pr("pr-1", "Feature", "u1")
+    await session.commit()
+
+
+@pytest.mark.asyncio
+async def test_user_stats_pages_cover_all_users(stats_data, client):
+    """Тест: обход страниц по next_after возвращает тех же пользователей, что и /stats."""
+    expected = (await client.get("/stats")).json()["users"]
+
+    users, after = [], None
+    while True:
+        params = {"limit": 4} if after is None else {"limit": 4, "after": after}
+        page = (await client.get("/stats/users", params=params)).json()
+        users += page["users"]
+        after = page["next_after"]
+        if after is None:
+            break
+
+    assert users == expected
+    assert len(users) == 14
+
+
+@pytest.mark.asyncio
+async def test_user_stats_stream(stats_data, client, monkeypatch):
+    """Тест: NDJSON-поток пачками содержит ту же статистику, что и /stats."""
+    monkeypatch.setattr(settings, "STATS_STREAM_BATCH_SIZE", 3)
+    expected = (await client.get("/stats")).json()["users"]
+
+    response = await client.get("/stats/users/stream")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert [json.loads(line) for line in response.text.splitlines()] == expected
+
+
+async def rollup_rows(session) -> list[tuple]:
+    """Все строки дневных агрегатов."""
+    result = await session.execute(
+        select(ReviewDailyRollup).order_by(ReviewDailyRollup.reviewer_id)
+    )
+    return [
+        (r.team_name, r.day, r.reviewer_id, r.assigned, r.merged, r.open_delta)
+        for r in result.scalars()
+    ]
+
+
+@pytest.mark.asyncio
+async def test_rollups_match_backfill(session, mock_cache, sample_team):
+    """Тест: агрегаты, накопленные при создании и merge PR, совпадают с backfill."""
+    pr_service = PullRequestService(session)
+    await pr_service.create_pr("pr-1", "One", "u1")
+    await pr_service.create_pr("pr-2", "Two", "u2")
+    await pr_service.merge_pr("pr-1")
+    live = await rollup_rows(session)
+
+    await StatsRepository(session).rebuild_rollups()
+
+    assert await rollup_rows(session) == live
+    assert sum(row[3] for row in live) == 4
+
+
+@pytest.mark.asyncio
+async def test_team_move_carries_open_reviews(session, mock_cache, sample_team):
+    """Тест: открытые ревью переходят в новую команду ревьювера и закрываются в ней."""
+    pr_service = PullRequestService(session)
+    reviewer = (await pr_service.create_pr("pr-1", "One", "u1"))["pr"]["assigned_reviewers"][0]
+    await TeamService(session).create_team(
+        "frontend", [{"user_id": reviewer, "username": "Moved", "is_active": True}]
+    )
+
+    open_by_team = {
+        (team, uid): open_delta for team, _, uid, _, _, open_delta in await rollup_rows(session)
+    }
+    assert open_by_team[("backend", reviewer)] == 0
+    assert open_by_team[("frontend", reviewer)] == 1
+
+    await pr_service.merge_pr("pr-1")
+
+    result = await session.execute(
+        select(ReviewDailyRollup.team_name, func.sum(ReviewDailyRollup.open_delta)).group_by(
+            ReviewDailyRollup.team_name
+        )
+    )
+    assert dict(result.tuples().all()) == {"backend": 0, "frontend": 0}
+
+
+@pytest.mark.asyncio
+async def test_team_stats_window(stats_data, client, session):
+    """Тест: открытые ревью на конец дня учитывают агрегаты до начала интервала."""
+    today = datetime.utcnow().date()
+    session.add_all(
+        [
+            ReviewDailyRollup(
+                team_name="backend",
+                day=today - timedelta(days=10),
+                reviewer_id="u3",
+                assigned=5,
+                merged=0,
+                open_delta=5,
+            ),
+            ReviewDailyRollup(
+                team_name="backend",
+                day=today - timedelta(days=1),
+                reviewer_id="u3",
+                assigned=0,
+                merged=2,
+                open_delta=-2,
+            ),
+        ]
+    )
+    await session.commit()
+
+    response = await client.get(
+        "/stats/team",
+        params={
+            "team_name": "backend",
+            "from": (today - timedelta(days=2)).isoformat(),
+            "to": today.isoformat(),
+        },
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["from"] == (today - timedelta(days=2)).isoformat()
+    assert [(d["assigned"], d["merged"], d["open"]) for d in data["days"]] == [
+        (0, 0, 5),
+        (0, 2, 3),
+        (2, 0, 5),
+    ]
+    u3 = next(r for r in data["reviewers"] if r["user_id"] == "u3")
+    # Сегодня u3 мог получить ревью pr-1 из фикстуры
+    assert (u3["merged"], u3["open"]) == (2, 3 + u3["assigned"])
+
+
+@pytest.mark.asyncio
+async def test_team_stats_errors(stats_data, client):
+    """Тест: неизвестная команда — 404, перевёрнутый интервал — 400."""
+    params = {"team_name": "backend", "from": "2025-02-01", "to": "2025-01-01"}
+    response = await client.get("/stats/team", params=params)
+    assert response.status_code == 400
+    assert response.json()["error"]["code"] == "INVALID_RANGE"
+
+    params = {"team_name": "nope", "from": "2025-01-01", "to": "2025-01-02"}
+    response = await client.get("/stats/team", params=params)
+    assert response.status_code == 404
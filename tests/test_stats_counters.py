@@ -0,0 +1,231 @@
+"""Тесты счётчиков статистики."""
+
+from datetime import datetime
+
+import pytest
+from sqlalchemy import Delete, case, delete, func, select, update
+
+from app.core.exceptions import NotAssignedException, NotFoundException
+from app.db.models import PRStatsCounter, PullRequest, Team, User, pr_reviewers
+from app.db.repositories.pr_repository import PRRepository
+from app.db.repositories.stats_repository import PR_COUNTERS, StatsRepository
+from app.domain.pull_requests.service import PullRequestService
+from app.domain.users.service import UserService
+
+
+async def aggregate_user_stats(session) -> list[dict]:
+    """Статистика ревью пользователей полной агрегацией по pr_reviewers."""
+
+    review_stats = (
+        select(
+            pr_reviewers.c.reviewer_id,
+            func.count(pr_reviewers.c.pr_id).label("total_reviews"),
+            func.sum(case((PullRequest.status == "OPEN", 1), else_=0)).label("open_reviews"),
+        )
+        .join(PullRequest, pr_reviewers.c.pr_id == PullRequest.pull_request_id)
+        .group_by(pr_reviewers.c.reviewer_id)
+        .subquery()
+    )
+
+    query = (
+        select(
+            User.user_id,
+            User.username,
+            func.coalesce(review_stats.c.total_reviews, 0).label("total_reviews"),
+            func.coalesce(review_stats.c.open_reviews, 0).label("open_reviews"),
+        )
+        .outerjoin(review_stats, User.user_id == review_stats.c.reviewer_id)
+        .order_by(User.user_id)
+    )
+
+    result = await session.execute(query)
+    return [
+        {
+            "user_id": row.user_id,
+            "username": row.username,
+            "total_reviews": int(row.total_reviews or 0),
+            "open_reviews": int(row.open_reviews or 0),
+            "merged_reviews": int((row.total_reviews or 0) - (row.open_reviews or 0)),
+        }
+        for row in result.all()
+    ]
+
+
+async def assert_counters_match_aggregates(session):
+    """Счётчики совпадают с полным пересчётом по pull_requests и pr_reviewers."""
+    user_stats, pr_stats = await StatsRepository(session).get_stats()
+    assert pr_stats == await PRRepository(session).get_stats()
+    assert user_stats == await aggregate_user_stats(session)
+    result = await session.execute(select(User.user_id, User.open_reviews).order_by(User.user_id))
+    assert {row.user_id: row.open_reviews for row in result.all()} == {
+        row["user_id"]: row["open_reviews"] for row in user_stats
+    }
+
+
+@pytest.fixture
+async def solo_team(session, sample_team):
+    """Команда из автора и единственного ревьювера."""
+    session.add(Team(team_name="solo"))
+    await session.flush()
+    session.add_all(
+        [
+            User(user_id="s1", username="Solo Author", team_name="solo", is_active=True),
+            User(user_id="s2", username="Solo Reviewer", team_name="solo", is_active=True),
+        ]
+    )
+    await session.commit()
+
+
+@pytest.mark.asyncio
+async def test_counters_follow_pr_lifecycle(session, mock_cache, solo_team):
+    """Тест: счётчики обновляются при создании, merge, переназначении и снятии ревьюверов."""
+    pr_service = PullRequestService(session)
+    await pr_service.create_pr("pr-1", "One", "u1")
+    await pr_service.create_pr("pr-2", "Two", "u2")
+    await pr_service.create_pr("pr-3", "Three", "s1")
+    await assert_counters_match_aggregates(session)
+
+    await pr_service.merge_pr("pr-1")
+    await pr_service.merge_pr("pr-1")
+    await assert_counters_match_aggregates(session)
+
+    pr_2 = await pr_service.get_pr("pr-2")
+    await pr_service.reassign_reviewer("pr-2", pr_2["pr"]["assigned_reviewers"][0])
+    # В команде solo замены нет: ревьювер снимается, PR переходит в корзину «1 → 0»
+    result = await pr_service.reassign_reviewer("pr-3", "s2")
+    assert result["replaced_by"] == ""
+    await assert_counters_match_aggregates(session)
+
+    pr_2 = await pr_service.get_pr("pr-2")
+    await UserService(session).bulk_deactivate_users(pr_2["pr"]["assigned_reviewers"])
+    await assert_counters_match_aggregates(session)
+
+    _, stats = await StatsRepository(session).get_stats()
+    assert stats["total_prs"] == 3
+    assert stats["merged_prs"] == 1
+    assert stats["prs_with_0_reviewers"] == 1
+
+
+@pytest.mark.asyncio
+async def test_deactivate_team_unassigns_open_reviews(session, mock_cache, solo_team):
+    """Тест: деактивация команды снимает её участников только с открытых PR."""
+    pr_repo = PRRepository(session)
+    await pr_repo.create_with_reviewers("pr-1", "One", "u1", ["u2", "u3"])
+    await pr_repo.create_with_reviewers("pr-2", "Two", "s1", ["s2", "u4"])
+    await pr_repo.create_with_reviewers("pr-3", "Three", "u1", ["u2"])
+    await pr_repo.merge("pr-3")
+    await session.commit()
+
+    result = await UserService(session).deactivate_team("backend")
+
+    assert result == {
+        "team_name": "backend",
+        "deactivated_count": 4,
+        "unassigned_reviews_count": 3,
+    }
+    pr_service = PullRequestService(session)
+    assert (await pr_service.get_pr("pr-1"))["pr"]["assigned_reviewers"] == []
+    assert (await pr_service.get_pr("pr-2"))["pr"]["assigned_reviewers"] == ["s2"]
+    assert (await pr_service.get_pr("pr-3"))["pr"]["assigned_reviewers"] == ["u2"]
+    await assert_counters_match_aggregates(session)
+
+    with pytest.raises(NotFoundException):
+        await UserService(session).deactivate_team("nope")
+
+
+@pytest.mark.asyncio
+async def test_deactivate_team_counts_only_deleted_reviews(
+    session, mock_cache, solo_team, monkeypatch
+):
+    """
+    Тест: ревью, которое другая транзакция сняла прямо перед удалением по команде,
+    не вычитается из счётчиков второй раз.
+    """
+    pr_repo = PRRepository(session)
+    await pr_repo.create_with_reviewers("pr-1", "One", "s1", ["u2", "u3"])
+    await pr_repo.create_with_reviewers("pr-2", "Two", "s1", ["u2", "s2"])
+    await session.commit()
+    execute = session.execute
+    concurrent = []
+
+    async def racing_execute(statement, *args, **kwargs):
+        if isinstance(statement, Delete) and statement.table is pr_reviewers and not concurrent:
+            # «Другая транзакция» снимает u3 с pr-1 и сама обновляет счётчики
+            concurrent.append(statement)
+            await execute(
+                delete(pr_reviewers).where(
+                    pr_reviewers.c.pr_id == "pr-1", pr_reviewers.c.reviewer_id == "u3"
+                )
+            )
+            await StatsRepository(session).reviewer_removed("u3", 2, True)
+        return await execute(statement, *args, **kwargs)
+
+    monkeypatch.setattr(session, "execute", racing_execute)
+    result = await UserService(session).deactivate_team("backend")
+
+    assert concurrent and result["unassigned_reviews_count"] == 2
+    await assert_counters_match_aggregates(session)
+    _, stats = await StatsRepository(session).get_stats()
+    assert (stats["prs_with_0_reviewers"], stats["prs_with_1_reviewer"]) == (1, 1)
+
+
+@pytest.mark.asyncio
+async def test_changes_already_applied_elsewhere_counted_once(session, mock_cache, sample_team):
+    """
+    Тест: merge и переназначение, которые другая транзакция уже выполнила, пока
+    в сессии лежат устаревшие PR, не меняют счётчики повторно.
+    """
+    pr_service = PullRequestService(session)
+    pr_repo = PRRepository(session)
+    await pr_service.create_pr("pr-1", "One", "u1")
+    await pr_service.create_pr("pr-2", "Two", "u1")
+    pr_1 = await pr_repo.get_by_id("pr-1", load_reviewers=True)
+    pr_2 = await pr_repo.get_by_id("pr-2", load_reviewers=True)
+    removed_id = pr_2.reviewers[0].user_id
+
+    # «Другая транзакция» мимо объектов сессии
+    stats_repo = StatsRepository(session)
+    await session.execute(
+        update(PullRequest)
+        .where(PullRequest.pull_request_id == "pr-1")
+        .values(status="MERGED", merged_at=datetime.utcnow())
+        .execution_options(synchronize_session=False)
+    )
+    await stats_repo.pr_merged([r.user_id for r in pr_1.reviewers])
+    await session.execute(
+        delete(pr_reviewers).where(
+            pr_reviewers.c.pr_id == "pr-2", pr_reviewers.c.reviewer_id == removed_id
+        )
+    )
+    await stats_repo.reviewer_removed(removed_id, 2, True)
+    assert pr_1.status == "OPEN" and len(pr_2.reviewers) == 2
+
+    result = await pr_service.merge_pr("pr-1")
+    assert result["pr"]["status"] == "MERGED"
+    with pytest.raises(NotAssignedException):
+        await pr_service.reassign_reviewer("pr-2", removed_id)
+    assert await pr_repo.remove_reviewer("pr-2", removed_id) is not None
+
+    await assert_counters_match_aggregates(session)
+
+
+@pytest.mark.asyncio
+async def test_rebuild_repairs_counters(session, mock_cache, sample_team):
+    """Тест: rebuild восстанавливает испорченные счётчики."""
+    await PullRequestService(session).create_pr("pr-1", "One", "u1")
+    await PullRequestService(session).create_pr("pr-2", "Two", "u2")
+    await session.execute(update(PRStatsCounter).values(value=42))
+    await session.execute(update(User).values(open_reviews=7))
+
+    await StatsRepository(session).rebuild()
+
+    await assert_counters_match_aggregates(session)
+
+
+@pytest.mark.asyncio
+async def test_stats_without_users(session):
+    """Тест: сводка PR возвращается и при пустой таблице пользователей."""
+    user_stats, pr_stats = await StatsRepository(session).get_stats()
+
+    assert user_stats == []
+    assert pr_stats == dict.fromkeys(PR_COUNTERS, 0)
@@ -1,8 +1,17 @@
 """Тесты для сервиса пользователей."""
 
+from collections import Counter
+
 import pytest
+from sqlalchemy import event
+from sqlalchemy.dialects import postgresql
 
+from app.core.config import settings
 from app.core.exceptions import NotFoundException
+from app.db.models import User
+from app.db.repositories.pr_repository import PRRepository
+from app.db.repositories.user_repository import UserRepository
+from app.domain.pull_requests.service import PullRequestService
 from app.domain.users.service import UserService
 
 
@@ -35,3 +44,133 @@ async def test_get_reviews(session, mock_cache, sample_team):
     assert "pull_requests" in result
 
     assert isinstance(result["pull_requests"], list)
+
+
+@pytest.mark.asyncio
+async def test_bulk_deactivate_reassigns_in_batch(session, mock_cache, sample_team, monkeypatch):
+    """Тест: замены считаются пачкой, число запросов не зависит от числа PR."""
+    monkeypatch.setattr(settings, "REVIEWER_ASSIGNMENT_STRATEGY", "least_loaded")
+    session.add_all(
+        User(user_id=f"x{i}", username=f"Extra {i}", team_name="backend", is_active=True)
+        for i in range(4)
+    )
+    pr_repo = PRRepository(session)
+    for i in range(12):
+        await pr_repo.create_with_reviewers(f"pr-{i}", "PR", "u1", ["u2", "u3"])
+    await session.commit()
+
+    statements = []
+    engine = session.bind.sync_engine
+
+    def listener(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        result = await UserService(session).bulk_deactivate_users(["u2", "u3"])
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+
+    assert result == {"deactivated_count": 2, "reassigned_prs_count": 24}
+    assert len(statements) <= 12
+
+    load = Counter()
+    for i in range(12):
+        reviewers = (await PullRequestService(session).get_pr(f"pr-{i}"))["pr"]
+        assert len(set(reviewers["assigned_reviewers"])) == 2
+        load.update(reviewers["assigned_reviewers"])
+    assert set(load) == {"u4", "x0", "x1", "x2", "x3"}
+    assert max(load.values()) - min(load.values()) <= 1
+
+
+@pytest.mark.asyncio
+async def test_batch_plan_takes_each_replacement_once_per_pr(session, mock_cache, sample_team):
+    """
+    Тест: план замен исключает уже выбранные в этом PR замены — когда оба
+    ревьювера каждого PR деактивируются, а кандидат один, он заменяет одного
+    из них, второй снимается без замены.
+    """
+    pr_repo = PRRepository(session)
+    for i in range(5):
+        await pr_repo.create_with_reviewers(f"pr-{i}", "PR", "u1", ["u2", "u3"])
+    await session.commit()
+
+    result = await UserService(session).bulk_deactivate_users(["u2", "u3"])
+
+    assert result == {"deactivated_count": 2, "reassigned_prs_count": 5}
+    for i in range(5):
+        pr = (await PullRequestService(session).get_pr(f"pr-{i}"))["pr"]
+        assert pr["assigned_reviewers"] == ["u4"]
+
+
+@pytest.mark.asyncio
+async def test_bulk_deactivate_locks_prs_before_changes(session, mock_cache, sample_team):
+    """
+    Тест: открытые PR блокируются (FOR UPDATE) до удаления и вставки ревьюверов,
+    как в merge и ручной замене ревьювера.
+    """
+    await PRRepository(session).create_with_reviewers("pr-1", "PR", "u1", ["u2"])
+    await session.commit()
+    statements = []
+
+    @event.listens_for(session.sync_session, "do_orm_execute")
+    def capture(state):
+        if state.is_select or state.is_delete:
+            statements.append(str(state.statement.compile(dialect=postgresql.dialect())))
+
+    await UserService(session).bulk_deactivate_users(["u2"])
+    event.remove(session.sync_session, "do_orm_execute", capture)
+
+    locks = [i for i, sql in enumerate(statements) if "FOR UPDATE OF pull_requests" in sql]
+    changes = [i for i, sql in enumerate(statements) if sql.startswith("DELETE FROM pr_reviewers")]
+    assert locks and changes
+    assert locks[0] < changes[0]
+
+
+@pytest.mark.asyncio
+async def test_id_lists_split_into_chunks(session, mock_cache, sample_team, monkeypatch):
+    """Тест: на SQLite списки ID делятся на куски, результаты кусков объединяются."""
+    monkeypatch.setattr("app.db.repositories.base.ID_CHUNK_SIZE", 2)
+    pr_repo = PRRepository(session)
+    await pr_repo.create_with_reviewers("pr-1", "One", "u1", ["u2", "u3"])
+    await pr_repo.create_with_reviewers("pr-2", "Two", "u2", ["u4"])
+
+    users = await UserRepository(session).get_users_by_ids(["u1", "u2", "u3", "nope", "u4"])
+    assert sorted(u.user_id for u in users) == ["u1", "u2", "u3", "u4"]
+
+    assignments = await pr_repo.get_open_review_assignments(["u2", "nope", "u3", "u4"])
+    assert assignments == {"pr-1": ("u1", ["u2", "u3"]), "pr-2": ("u2", ["u4"])}
+
+    result = await UserService(session).bulk_deactivate_users(["u2", "u3", "u4", "nope"])
+    assert result["deactivated_count"] == 3
+
+
+@pytest.mark.asyncio
+async def test_deactivate_team_endpoint(client, session):
+    """Тест: /users/deactivateTeam деактивирует команду и снимает её ревьюверов с открытых PR."""
+    await PRRepository(session).create_with_reviewers("pr-1", "One", "u1", ["u2", "u3"])
+    await session.commit()
+
+    response = await client.post("/users/deactivateTeam", json={"team_name": "backend"})
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "team_name": "backend",
+        "deactivated_count": 4,
+        "unassigned_reviews_count": 2,
+    }
+    team = (await client.get("/team/get", params={"team_name": "backend"})).json()["team"]
+    assert not any(member["is_active"] for member in team["members"])
+    pr = (await client.get("/pullRequest", params={"pr_id": "pr-1"})).json()["pr"]
+    assert pr["assigned_reviewers"] == []
+
+
+@pytest.mark.asyncio
+async def test_deactivate_team_endpoint_errors(client):
+    """Тест: неизвестная команда — 404 NOT_FOUND, запрос без team_name — 422."""
+    response = await client.post("/users/deactivateTeam", json={"team_name": "nope"})
+    assert response.status_code == 404
+    assert response.json()["error"]["code"] == "NOT_FOUND"
+
+    response = await client.post("/users/deactivateTeam", json={})
+    assert response.status_code == 422
@@ -0,0 +1,148 @@
+"""Тесты прогрева кеша."""
+
+import asyncio
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import event, update
+
+from app.core.cache import CacheService
+from app.core.config import settings
+from app.db.models import User
+from app.db.repositories.user_repository import UserRepository
+from app.domain import warmup
+from app.domain.pull_requests.service import PullRequestService
+from app.domain.stats.service import StatsService
+from app.domain.teams.service import TeamService
+from app.domain.users.service import UserService
+from app.main import app
+
+
+@pytest.fixture(autouse=True)
+def reset_warmup_status(monkeypatch):
+    """Свежее состояние прогрева для каждого теста."""
+    monkeypatch.setattr(warmup, "warmup_status", warmup.WarmupStatus())
+    monkeypatch.setattr("app.api.v1.health.warmup_status", warmup.warmup_status)
+
+
+@pytest.mark.asyncio
+async def test_warmup_fills_hot_keys(test_db, session, mock_cache, sample_team):
+    """Тест: прогрев заполняет статистику, команды и очереди загруженных ревьюверов."""
+    await PullRequestService(session).create_pr("pr-1", "Feature", "u1")
+    await session.commit()
+
+    await warmup.run_warmup(test_db)
+
+    status = warmup.warmup_status
+    assert status.state == "done"
+    assert status.ready
+    assert status.failed == 0
+    # stats + команда backend + два ревьювера pr-1 и тела ответов /stats и /users/getReview
+    assert status.warmed == 7
+    assert await mock_cache.keys("stats:get_stats:g*")
+    assert await mock_cache.keys("teams:get_team:backend:g*")
+    assert len(await mock_cache.keys("users:get_reviews:*")) == 2
+    assert await mock_cache.keys("http:stats:g*")
+    assert len(await mock_cache.keys("http:users:get_reviews:*")) == 2
+
+
+@pytest.mark.asyncio
+async def test_most_loaded_reviewers_read_from_users(session, sample_team):
+    """Тест: самые загруженные ревьюверы берутся из users.open_reviews, без агрегации PR."""
+    for user_id, load in (("u2", 3), ("u3", 5), ("u4", 3)):
+        await session.execute(update(User).where(User.user_id == user_id).values(open_reviews=load))
+
+    statements = []
+    engine = session.bind.sync_engine
+
+    def listener(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        reviewer_ids = await UserRepository(session).get_most_loaded_reviewer_ids(2)
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+
+    assert reviewer_ids == ["u3", "u2"]
+    assert await UserRepository(session).get_most_loaded_reviewer_ids(10) == ["u3", "u2", "u4"]
+    assert len(statements) == 1 and "pr_reviewers" not in statements[0]
+
+
+@pytest.mark.asyncio
+async def test_warmed_responses_served_from_cache(test_db, session, mock_cache, sample_team):
+    """Тест: после прогрева /stats и /users/getReview отдаются из кеша без обращения к сервисам."""
+    await PullRequestService(session).create_pr("pr-1", "Feature", "u1")
+    await session.commit()
+    reviewer = (await PullRequestService(session).get_pr("pr-1"))["pr"]["assigned_reviewers"][0]
+    await warmup.run_warmup(test_db)
+
+    async def no_service(*args, **kwargs):
+        raise AssertionError("warmed response must come from the cache")
+
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr(StatsService, "get_stats", no_service)
+        patch.setattr(UserService, "get_reviews", no_service)
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            stats = await client.get("/stats")
+            reviews = await client.get("/users/getReview", params={"user_id": reviewer})
+
+    assert stats.status_code == 200
+    assert stats.json()["pull_requests"]["open_prs"] == 1
+    assert reviews.status_code == 200
+    assert [pr["pull_request_id"] for pr in reviews.json()["pull_requests"]] == ["pr-1"]
+
+
+@pytest.mark.asyncio
+async def test_warmup_skips_cached_keys(test_db, session, mock_cache, sample_team, monkeypatch):
+    """Тест: ключи, уже лежащие в кеше, читаются одним MGET, без GET и вычисления по ключу."""
+    await PullRequestService(session).create_pr("pr-1", "Feature", "u1")
+    await session.commit()
+    await warmup.run_warmup(test_db)
+
+    async def no_compute(*args, **kwargs):
+        raise AssertionError("cached keys must not be recomputed")
+
+    for service, method in (
+        (CacheService, "_get_entry"),
+        (StatsService, "_compute_stats"),
+        (TeamService, "_compute_team"),
+        (UserService, "_compute_reviews"),
+    ):
+        monkeypatch.setattr(service, method, no_compute)
+    monkeypatch.setattr(warmup, "warmup_status", warmup.WarmupStatus())
+
+    await warmup.run_warmup(test_db)
+
+    assert (warmup.warmup_status.warmed, warmup.warmup_status.failed) == (7, 0)
+
+
+@pytest.mark.asyncio
+async def test_warmup_timeout_marks_ready(test_db, mock_cache, sample_team, monkeypatch):
+    """Тест: по таймауту прогрев прерывается, а инстанс всё равно становится готовым."""
+
+    async def slow_stats(self):
+        await asyncio.sleep(10)
+
+    monkeypatch.setattr(StatsService, "_compute_stats", slow_stats)
+    monkeypatch.setattr(settings, "CACHE_WARMUP_TIMEOUT", 0.05)
+
+    await warmup.run_warmup(test_db)
+
+    assert warmup.warmup_status.state == "timeout"
+    assert warmup.warmup_status.ready
+
+
+@pytest.mark.asyncio
+async def test_readiness_endpoint(test_db, mock_cache, sample_team):
+    """Тест: /health/ready отвечает 503 до прогрева и 200 после."""
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.get("/health/ready")
+        assert response.status_code == 503
+        assert response.json()["status"] == "warming_up"
+
+        await warmup.run_warmup(test_db)
+
+        response = await client.get("/health/ready")
+        assert response.status_code == 200
+        assert response.json()["warmup"]["state"] == "done"